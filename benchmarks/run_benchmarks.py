@@ -0,0 +1,333 @@
+"""
+Benchmarks for the ImageProcessor / FaceManager hot paths (no GUI needed).
+
+    python benchmarks/run_benchmarks.py [--repeats 20] [--warmup 3] [--filter process_image] [--output results.json]
+
+Every case runs `warmup` untimed iterations and then `repeats` timed ones; the per-case
+setup (e.g. clearing caches for a cold run) is not timed. Results (ms: min/mean/p50/p90/
+p99/max) are printed and written as JSON.
+
+Regression check: keep a results file as the baseline and compare later runs against it.
+
+    python benchmarks/run_benchmarks.py --output baseline.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json [--tolerance 0.15] [--tolerance-for export=0.3]
+    python benchmarks/run_benchmarks.py --input new.json --baseline baseline.json   (compare only, no run)
+
+A case regresses when its metric (p50 by default) is slower than the baseline by more than
+the tolerance (relative) AND by more than --min-delta ms (noise floor for very fast cases).
+The exit status is 1 if anything regressed.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import datetime
+import statistics
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import PIL
+from core.logger import Logger
+from core.image_processor import ImageProcessor
+from core.face_manager import FaceManager
+from core.exporter import FaceExporter
+from synthetic_library import StubRembgProcessor, make_source, make_portrait_source, generate_library
+
+
+# --- Measurement ---
+
+def percentile(sorted_samples, q):
+    if not sorted_samples:
+        return 0.0
+    pos = (len(sorted_samples) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_samples) - 1)
+    return sorted_samples[lo] + (sorted_samples[hi] - sorted_samples[lo]) * (pos - lo)
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "unit": "ms",
+        "n": len(ordered),
+        "min": ordered[0],
+        "mean": statistics.fmean(ordered),
+        "p50": percentile(ordered, 0.50),
+        "p90": percentile(ordered, 0.90),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1],
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+
+
+def measure(fn, setup=None, warmup=3, repeats=20):
+    """Times fn() (ms). setup() runs before every iteration and is not timed."""
+    samples = []
+    for i in range(warmup + repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000.0
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+# --- Cases ---
+
+def bench_process_image(ctx, run):
+    ip = ImageProcessor()
+    for src_size in (512, 1024, 2048):
+        src = ctx["sources"][src_size]
+        pre = ip.preprocess_image(src, {})
+        for scale in (0.5, 1.0, 1.5):
+            params = {"scale": scale, "offset_x": 40, "offset_y": -20}
+
+            def render(pre=pre, src=src, params=params):
+                canvas = ip.process_image(src, params, preprocessed_image=pre, cache_result=False)
+                ip.release_canvas(canvas)
+            run(f"process_image[src={src_size},scale={scale}]", render, setup=ip.clear_caches)
+
+
+def bench_render_cache(ctx, run):
+    ip = ImageProcessor()
+    src = ctx["sources"][1024]
+    params = {"scale": 1.0, "offset_x": 0, "offset_y": 0}
+    run("render_cache[cold]", lambda: ip.process_image(src, params), setup=ip.clear_caches)
+    ip.process_image(src, params)
+    run("render_cache[warm]", lambda: ip.process_image(src, params))
+
+    # Compressed tier: a render pushed out of a one-entry LRU, restored on the next lookup
+    tiered = StubRembgProcessor()
+    tiered._render_cache_capacity = 1
+    rembg_params = dict(params, use_rembg=True)
+    other_params = dict(rembg_params, offset_x=50)
+
+    def demote(src=src):
+        tiered.clear_caches()
+        tiered.process_image(src, rembg_params)
+        tiered.process_image(src, other_params)
+        tiered._compress_executor.submit(lambda: None).result() # Wait for the compression
+    run("render_cache[compressed hit]", lambda: tiered.get_cached_render(src, rembg_params), setup=demote)
+
+    # The source above is opaque noise; real renders are mostly transparent (background removed)
+    portrait = ctx["portrait"]
+    tiered.process_image(portrait, rembg_params) # Fill the rembg disk cache
+    run("render_cache[cold, portrait]", lambda: tiered.process_image(portrait, rembg_params), setup=tiered.clear_caches)
+    run("render_cache[compressed hit, portrait]", lambda: tiered.get_cached_render(portrait, rembg_params),
+        setup=lambda: demote(portrait))
+
+
+def bench_face_icon(ctx, run):
+    ip = ImageProcessor()
+    render = ip.process_image(ctx["sources"][1024], {"scale": 1.0})
+    center = {"x": 960, "y": 540}
+    for size in ((96, 96), (270, 96)):
+        run(f"create_face_icon[{size[0]}x{size[1]}]", lambda size=size: ip.create_face_icon(render, size, center))
+
+
+def bench_preprocess(ctx, run):
+    ip = StubRembgProcessor()
+    src_dir = os.path.join(ctx["tmp"], "preprocess")
+    os.makedirs(src_dir, exist_ok=True)
+    src = shutil.copy2(ctx["sources"][1024], os.path.join(src_dir, "source.png"))
+    params = {"use_rembg": True}
+
+    def drop_disk_cache():
+        shutil.rmtree(os.path.join(src_dir, "_cache"), ignore_errors=True)
+
+    run("preprocess_image[no rembg]", lambda: ip.preprocess_image(src, {}))
+    run("preprocess_image[rembg stub, cache miss]", lambda: ip.preprocess_image(src, params), setup=drop_disk_cache)
+    ip.preprocess_image(src, params)
+    run("preprocess_image[rembg stub, cache hit]", lambda: ip.preprocess_image(src, params))
+
+
+def bench_export(ctx, run):
+    base = generate_library(os.path.join(ctx["tmp"], "export_library"), slots=1, states=len(FaceExporter.SUFFIX_MAP), variants=2)
+    fm = FaceManager(base)
+    try:
+        ip = ImageProcessor()
+        exporter = FaceExporter(fm, ip)
+        face = fm.faces[0]
+        run("export[1 character, 11 states]", lambda: exporter.export(face), setup=ip.clear_caches, max_repeats=3)
+    finally:
+        fm.shutdown()
+
+
+def bench_scan(ctx, run):
+    for slots in (100, 1000):
+        # Sources are never read by a scan, so keep them tiny; exported files drive unmanaged/thumb detection
+        base = generate_library(os.path.join(ctx["tmp"], f"scan_library_{slots}"), slots=slots, states=3,
+                                resolutions=(64,), export="placeholder", unmanaged=slots // 10, variants=1)
+        manager_class = type("SyntheticFaceManager", (FaceManager,), {"SLOT_COUNT": slots})
+        fm = manager_class(base)
+        try:
+            run(f"scan_faces[{slots} slots, cold catalog]", fm.scan_faces, setup=fm.catalog.clear)
+            fm.scan_faces()
+            run(f"scan_faces[{slots} slots, warm catalog]", fm.scan_faces)
+        finally:
+            fm.shutdown()
+
+
+CASES = [bench_process_image, bench_render_cache, bench_face_icon, bench_preprocess, bench_export, bench_scan]
+
+
+def run_all(repeats=20, warmup=3, name_filter=None):
+    results = {}
+    tmp = tempfile.mkdtemp(prefix="face_bench_")
+    try:
+        sources = {}
+        for size in (512, 1024, 2048):
+            sources[size] = make_source(os.path.join(tmp, f"source_{size}.png"), (size, size))
+        portrait = make_portrait_source(os.path.join(tmp, "portrait_1024.png"), (1024, 1024))
+        ctx = {"tmp": tmp, "sources": sources, "portrait": portrait}
+
+        def run(name, fn, setup=None, max_repeats=None):
+            if name_filter and name_filter not in name:
+                return
+            # Slow end-to-end cases cap their repeats (and get a single warmup)
+            n = min(repeats, max_repeats) if max_repeats else repeats
+            w = min(warmup, 1) if max_repeats else warmup
+            results[name] = summarize(measure(fn, setup=setup, warmup=w, repeats=n))
+            r = results[name]
+            print(f"{name:<48} p50 {r['p50']:9.2f} ms   p90 {r['p90']:9.2f} ms   min {r['min']:9.2f} ms")
+
+        for case in CASES:
+            case(ctx, run)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+
+# --- Baseline comparison ---
+
+def load_report(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def tolerance_for(name, tolerance, overrides):
+    """Per-case tolerance: the longest override whose key is part of the case name wins."""
+    matches = [key for key in overrides if key in name]
+    return overrides[max(matches, key=len)] if matches else tolerance
+
+
+def compare_results(baseline, current, metric="p50", tolerance=0.15, min_delta=0.5, overrides=None):
+    """
+    Compares two "results" dicts. Returns rows (name, base_ms, new_ms, delta_ratio, status) with
+    status one of "regressed", "improved", "ok", "new" (not in the baseline) or "missing".
+    """
+    overrides = overrides or {}
+    rows = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, None, result[metric], None, "new"))
+            continue
+        base_ms, new_ms = base[metric], result[metric]
+        delta = (new_ms - base_ms) / base_ms if base_ms > 0 else 0.0
+        allowed = tolerance_for(name, tolerance, overrides)
+        if delta > allowed and new_ms - base_ms > min_delta:
+            status = "regressed"
+        elif delta < -allowed and base_ms - new_ms > min_delta:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append((name, base_ms, new_ms, delta, status))
+    for name in baseline:
+        if name not in current:
+            rows.append((name, baseline[name][metric], None, None, "missing"))
+    return rows
+
+
+def print_comparison(rows, metric):
+    print(f"\n{'case':<48} {'base ' + metric:>12} {'new ' + metric:>12} {'delta':>9}")
+    for name, base_ms, new_ms, delta, status in rows:
+        base_text = f"{base_ms:10.2f}ms" if base_ms is not None else f"{'-':>12}"
+        new_text = f"{new_ms:10.2f}ms" if new_ms is not None else f"{'-':>12}"
+        delta_text = f"{delta * 100:+8.1f}%" if delta is not None else f"{'':>9}"
+        marker = "" if status == "ok" else f"  {status.upper()}"
+        print(f"{name:<48} {base_text} {new_text} {delta_text}{marker}")
+    regressed = sum(1 for row in rows if row[4] == "regressed")
+    print(f"{regressed} regression(s), {sum(1 for row in rows if row[4] == 'improved')} improvement(s)")
+    return regressed
+
+
+def parse_overrides(values):
+    overrides = {}
+    for value in values or []:
+        key, sep, fraction = value.rpartition("=")
+        if not sep or not key:
+            raise argparse.ArgumentTypeError(f"Expected NAME=FRACTION, got {value!r}")
+        overrides[key] = float(fraction)
+    return overrides
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the image pipeline and library scan.")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--filter", default=None, help="Only run cases whose name contains this text")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=None, help="Results file to compare against (exit 1 on regressions)")
+    parser.add_argument("--input", default=None, help="Compare this results file instead of running the benchmarks")
+    parser.add_argument("--metric", default="p50", choices=["min", "mean", "p50", "p90", "p99", "max"])
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative slowdown (0.15 = 15%%)")
+    parser.add_argument("--tolerance-for", action="append", metavar="NAME=FRACTION",
+                        help="Tolerance for cases whose name contains NAME (repeatable)")
+    parser.add_argument("--min-delta", type=float, default=0.5, help="Ignore slowdowns smaller than this many ms")
+    args = parser.parse_args(argv)
+    try:
+        overrides = parse_overrides(args.tolerance_for)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+
+    if args.input:
+        if not args.baseline:
+            parser.error("--input needs --baseline")
+        report = load_report(args.input)
+    else:
+        report = run_benchmarks(args)
+
+    if args.baseline:
+        baseline = load_report(args.baseline)["results"]
+        if args.filter:
+            baseline = {name: r for name, r in baseline.items() if args.filter in name}
+        rows = compare_results(baseline, report["results"], metric=args.metric,
+                               tolerance=args.tolerance, min_delta=args.min_delta, overrides=overrides)
+        if print_comparison(rows, args.metric):
+            return 1
+    return 0
+
+
+def run_benchmarks(args):
+    # Keep log output out of the timings
+    Logger.console = False
+    Logger.level = Logger.WARNING
+
+    results = run_all(repeats=args.repeats, warmup=args.warmup, name_filter=args.filter)
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pillow": PIL.__version__,
+            "platform": platform.platform(),
+            "repeats": args.repeats,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Synthetic face library for scale testing (our real libraries are private).
+
+    python benchmarks/synthetic_library.py OUT_DIR [--slots 100] [--states 3] [--resolutions 1024,2048]
+        [--formats png,jpg] [--export placeholder|full] [--rembg-cache] [--unmanaged 5] [--seed 0]
+
+Creates OUT_DIR/Data/User/face/face1 .. faceN. Every managed slot gets a project_data.json
+in the same shape FaceManager.initialize_face and the editor write (defaults + per-state
+settings), plus its source images under sources/<uuid>.<ext>. Optionally:
+- exported game files (face_a.png, face_b/c/d/e<suffix>.png): "full" renders them with
+  FaceExporter, "placeholder" copies one pre-made set (right names and sizes, much faster),
+- the rembg disk cache (sources/_cache), written through ImageProcessor.preprocess_image
+  with a stub background remover, so file names and hashes match the real ones,
+- unmanaged slots (game files only, no project_data.json), like hand-installed faces.
+
+Slots beyond 100 are ignored by the game; benchmarks raise FaceManager.SLOT_COUNT for them.
+"""
+import os
+import sys
+import json
+import uuid
+import random
+import shutil
+import argparse
+import datetime
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from PIL import Image, ImageDraw
+from core.logger import Logger
+from core.image_processor import ImageProcessor
+from core.exporter import FaceExporter
+
+FORMATS = {"png": "PNG", "jpg": "JPEG", "webp": "WEBP"}
+EXPORT_MODES = (None, "placeholder", "full")
+
+
+class StubRembgProcessor(ImageProcessor):
+    """ImageProcessor with a cheap stand-in for rembg (keeps the cache / file I/O path real)."""
+    def remove_background(self, image, params=None):
+        result = image.copy()
+        result.putalpha(image.convert("L").point(lambda v: 0 if v > 240 else 255))
+        return result
+
+
+def make_source(path, size, fmt="png", seed=0):
+    """Noisy RGB image with a bright background (realistic file size, something for rembg to remove)."""
+    w, h = size
+    rng = random.Random(seed)
+    # Low-frequency noise: photo-like compression, so encode/decode times stay realistic
+    noise = Image.effect_noise((max(1, w // 8), max(1, h // 8)), 40).convert("L").resize((w, h), Image.Resampling.BILINEAR)
+    gradient = Image.radial_gradient("L").resize((w, h))
+    if seed:
+        gradient = gradient.rotate(rng.uniform(0, 360))
+    img = Image.merge("RGB", (noise, gradient, Image.new("L", (w, h), 250 - rng.randint(0, 30))))
+    img.save(path, FORMATS.get(fmt, "PNG"))
+    return path
+
+
+def make_portrait_source(path, size, seed=0):
+    """A figure on a plain white background: after (stub) background removal most of the canvas is transparent."""
+    w, h = size
+    noise = Image.effect_noise((max(1, w // 8), max(1, h // 8)), 40).convert("L").resize((w, h), Image.Resampling.BILINEAR)
+    img = Image.new("RGB", (w, h), (255, 255, 255))
+    mask = Image.new("L", (w, h), 0)
+    ImageDraw.Draw(mask).ellipse((w * 3 // 10, h // 10, w * 7 // 10, h), fill=255)
+    img.paste(Image.merge("RGB", (noise, noise.point(lambda v: v * 3 // 4), noise.point(lambda v: v // 2))), mask=mask)
+    img.save(path)
+    return path
+
+
+def state_settings(rng: random.Random, size) -> Dict:
+    """Per-state settings as the editor stores them (auto-fit scale plus some user adjustment)."""
+    w, h = size
+    fit = min(1.0, 1080 / h, 1920 / w)
+    return {
+        "scale": round(fit * rng.uniform(0.8, 1.2), 2),
+        "offset_x": rng.randint(-200, 200),
+        "offset_y": rng.randint(-100, 100),
+        "icon_scale_a": round(rng.uniform(0.8, 1.5), 2),
+        "icon_scale_b": round(rng.uniform(0.8, 1.5), 2),
+        "use_rembg": False,
+        "alpha_matting": False,
+        "alpha_matting_foreground_threshold": 240,
+        "alpha_matting_background_threshold": 10,
+        "alpha_matting_erode_size": 10,
+    }
+
+
+def project_data(index: int, states: Dict, defaults: Dict, face_center: Dict) -> Dict:
+    now = datetime.datetime.now().isoformat()
+    return {
+        "version": "1.1",
+        "display_name": f"Synthetic {index}",
+        "uuid": str(uuid.uuid4()),
+        "created_at": now,
+        "face_center": face_center,
+        "defaults": defaults,
+        "states": states,
+        "preview_settings": {"view_zoom": 1.0, "view_pan_x": 0, "view_pan_y": 0, "show_game_ui": False, "view_mode": "Single"},
+    }
+
+
+def _make_placeholder_set(template_dir: str, state_keys: Sequence[str]) -> List[str]:
+    """One set of exported files with the real names and sizes (for the 'placeholder' export mode)."""
+    os.makedirs(template_dir, exist_ok=True)
+    full = Image.new("RGBA", (1920, 1080), (0, 0, 0, 0))
+    full.paste((180, 140, 120, 255), (760, 240, 1160, 1080))
+    names = []
+    for key in state_keys:
+        suffix = FaceExporter.SUFFIX_MAP[key]
+        for prefix in ("face_c", "face_d", "face_e"):
+            names.append(f"{prefix}{suffix}.png")
+            full.save(os.path.join(template_dir, names[-1]))
+        names.append(f"face_b{suffix}.png")
+        full.resize((270, 96)).save(os.path.join(template_dir, names[-1]))
+        if key == "normal":
+            names.append("face_a.png")
+            full.resize((96, 96)).save(os.path.join(template_dir, names[-1]))
+    return names
+
+
+def generate_library(
+    root: str,
+    slots: int = 100,
+    states: int = 1,
+    resolutions: Sequence[int] = (1024,),
+    formats: Sequence[str] = ("png",),
+    export: Optional[str] = None,
+    rembg_cache: bool = False,
+    unmanaged: int = 0,
+    variants: int = 4,
+    seed: int = 0,
+    workers: Optional[int] = None,
+) -> str:
+    """
+    Builds root/Data/User/face and returns its path. The first `slots - unmanaged` slots are
+    managed; the rest only hold game files. Sources come from a pool of `variants` images per
+    (resolution, format), so large libraries don't cost one encode per file.
+    """
+    if export not in EXPORT_MODES:
+        raise ValueError(f"export must be one of {EXPORT_MODES}")
+    rng = random.Random(seed)
+    base_path = os.path.join(root, "Data", "User", "face")
+    os.makedirs(base_path, exist_ok=True)
+    state_keys = list(FaceExporter.SUFFIX_MAP.keys())[:max(1, min(states, len(FaceExporter.SUFFIX_MAP)))]
+
+    scratch = tempfile.mkdtemp(prefix="face_synth_")
+    try:
+        # Source pool
+        pool = []
+        for res in resolutions:
+            for fmt in formats:
+                for v in range(variants):
+                    path = os.path.join(scratch, f"source_{res}_{v}.{fmt}")
+                    pool.append((make_source(path, (res, res), fmt, seed=seed * 1000 + len(pool) + 1), (res, res)))
+
+        placeholder_files = []
+        if export == "placeholder" or unmanaged:
+            placeholder_dir = os.path.join(scratch, "exported")
+            placeholder_files = _make_placeholder_set(placeholder_dir, state_keys)
+
+        managed_count = max(0, slots - unmanaged)
+        managed_dirs = []
+        for i in range(1, slots + 1):
+            face_dir = os.path.join(base_path, f"face{i}")
+            os.makedirs(face_dir, exist_ok=True)
+            if i > managed_count:
+                for name in placeholder_files:
+                    shutil.copy2(os.path.join(placeholder_dir, name), os.path.join(face_dir, name))
+                continue
+
+            sources_dir = os.path.join(face_dir, "sources")
+            os.makedirs(sources_dir, exist_ok=True)
+            face_center = {"x": 960 + rng.randint(-80, 80), "y": 400 + rng.randint(-80, 80)}
+            defaults = None
+            face_states = {}
+            for key in state_keys:
+                src, size = rng.choice(pool)
+                source_uuid = str(uuid.uuid4())
+                shutil.copy2(src, os.path.join(sources_dir, source_uuid + os.path.splitext(src)[1]))
+                settings = state_settings(rng, size)
+                settings["use_rembg"] = rembg_cache
+                if defaults is None:
+                    defaults = dict(settings, face_center=face_center)
+                face_states[key] = dict(settings, suffix=FaceExporter.SUFFIX_MAP[key], source_uuid=source_uuid, face_center=face_center, is_individual=False)
+
+            with open(os.path.join(face_dir, "project_data.json"), "w", encoding="utf-8") as f:
+                json.dump(project_data(i, face_states, defaults, face_center), f, indent=4, ensure_ascii=False)
+            if export == "placeholder":
+                for name in placeholder_files:
+                    shutil.copy2(os.path.join(placeholder_dir, name), os.path.join(face_dir, name))
+            managed_dirs.append(face_dir)
+
+        if rembg_cache or export == "full":
+            _render_slots(managed_dirs, rembg_cache, export == "full", workers)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return base_path
+
+
+def _render_slots(face_dirs: List[str], rembg_cache: bool, export: bool, workers: Optional[int]):
+    """Fills the rembg disk cache and/or writes real exports through the app's own code paths."""
+    class _SlotSource:
+        # Just enough of FaceManager for FaceExporter, without touching the library's
+        # catalog, trash or history files
+        def get_source_path(self, face_data, source_uuid):
+            sources_dir = os.path.join(face_data["_path"], "sources")
+            for name in os.listdir(sources_dir):
+                if os.path.splitext(name)[0] == source_uuid:
+                    return os.path.join(sources_dir, name)
+            return None
+
+        def get_frame_path(self, frame_id):
+            return None # Synthetic characters have no frame
+
+    slots = _SlotSource()
+
+    def render(face_dir):
+        ip = StubRembgProcessor()
+        with open(os.path.join(face_dir, "project_data.json"), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["_path"] = face_dir
+        if rembg_cache:
+            for state_data in data["states"].values():
+                ip.preprocess_image(slots.get_source_path(data, state_data["source_uuid"]), state_data)
+        if export:
+            FaceExporter(slots, ip).export(data)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 4) as executor:
+        list(executor.map(render, face_dirs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic Data/User/face library.")
+    parser.add_argument("output", help="Root folder (Data/User/face is created inside)")
+    parser.add_argument("--slots", type=int, default=100)
+    parser.add_argument("--states", type=int, default=1, help="States per character (1-11)")
+    parser.add_argument("--resolutions", default="1024", help="Comma-separated source sizes (square)")
+    parser.add_argument("--formats", default="png", help="Comma-separated: " + ",".join(FORMATS))
+    parser.add_argument("--export", choices=["placeholder", "full"], default=None)
+    parser.add_argument("--rembg-cache", action="store_true", help="Enable rembg and pre-fill sources/_cache")
+    parser.add_argument("--unmanaged", type=int, default=0, help="Trailing slots with game files only")
+    parser.add_argument("--variants", type=int, default=4, help="Distinct source images per resolution and format")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    Logger.console = False
+    base_path = generate_library(
+        args.output, slots=args.slots, states=args.states,
+        resolutions=[int(r) for r in args.resolutions.split(",")],
+        formats=[f.strip().lower() for f in args.formats.split(",")],
+        export=args.export, rembg_cache=args.rembg_cache, unmanaged=args.unmanaged,
+        variants=args.variants, seed=args.seed,
+    )
+    print(f"Generated {args.slots} slots in {base_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
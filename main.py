@@ -48,6 +48,12 @@ def load_config():
 def main():
     config = load_config()
     
+    from core.logger import Logger
+    Logger.configure(log_file=os.path.join("logs", "app.log"), level=config.get("log_level", "INFO"))
+    
+    from core.memory_governor import MemoryGovernor
+    MemoryGovernor.configure(budget_mb=config.get("memory_budget_mb", 1024))
+    
     ctk.set_appearance_mode("Dark")
     ctk.set_default_color_theme("blue")
     
@@ -0,0 +1,122 @@
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+from PIL import Image
+from core.tracing import Tracer
+
+
+class CompressedImageCache:
+    """
+    Second cache tier for large, mostly transparent RGBA canvases.
+
+    put() crops an image to its alpha bounding box and stores the pixels zlib-compressed
+    (level 1: fast, and transparent margins compress to almost nothing). pop() rebuilds
+    the full canvas by copying the crop rows straight into a zeroed buffer (no full-size
+    paste). A 1920x1080 portrait render takes a few hundred KB instead of 8 MB, and
+    restoring it is much cheaper than rendering it again. Crops that zlib can't shrink
+    to `max_ratio` (opaque, photo-like pixels) are kept raw: inflating them would cost
+    about as much as the render. LRU with a byte limit; safe to use from worker threads.
+
+    Writers that compress off-thread take a token() when the image leaves tier 1 and pass
+    it to put(); invalidate_source()/clear() in between make that put() a no-op.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, level: int = 1, max_ratio: float = 1 / 3):
+        self.max_bytes = max_bytes
+        self.level = level
+        self.max_ratio = max_ratio
+        self._entries: "OrderedDict[Hashable, Tuple]" = OrderedDict() # key -> (size, bbox, data, compressed, source_path)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._epoch = 0 # Bumped by clear()
+        self._generations: Dict[str, int] = {} # source_path -> bumped by invalidate_source()
+
+    def token(self, source_path: Optional[str]) -> Tuple[int, int]:
+        with self._lock:
+            return self._token(source_path)
+
+    def _token(self, source_path):
+        return self._epoch, self._generations.get(source_path, 0)
+
+    def put(self, key: Hashable, img: Image.Image, source_path: Optional[str] = None, token: Optional[Tuple[int, int]] = None):
+        if img.mode != "RGBA":
+            return
+        if token is not None and token != self.token(source_path):
+            return # Invalidated before we even started
+        with Tracer.span("render_compress"):
+            bbox = img.getchannel("A").getbbox()
+            compressed = False
+            if bbox is None:
+                data = b"" # Fully transparent
+            else:
+                data = img.crop(bbox).tobytes()
+                packed = zlib.compress(data, self.level)
+                if len(packed) <= len(data) * self.max_ratio:
+                    data, compressed = packed, True
+        with self._lock:
+            if token is not None and token != self._token(source_path):
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[2])
+            self._entries[key] = (img.size, bbox, data, compressed, source_path)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._bytes -= len(self._entries.popitem(last=False)[1][2])
+
+    def pop(self, key: Hashable) -> Optional[Image.Image]:
+        """Removes the entry and returns the restored canvas (the caller promotes it to tier 1)."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._bytes -= len(entry[2])
+        size, bbox, data, compressed, _ = entry
+        with Tracer.span("render_decompress"):
+            # bytearray() is zero-filled lazily, so the transparent margins cost nothing
+            buf = bytearray(size[0] * size[1] * 4)
+            if bbox is not None:
+                crop = memoryview(zlib.decompress(data) if compressed else data)
+                stride = (bbox[2] - bbox[0]) * 4
+                row = size[0] * 4
+                offset = (bbox[1] * size[0] + bbox[0]) * 4
+                for y in range(bbox[3] - bbox[1]):
+                    buf[offset:offset + stride] = crop[y * stride:(y + 1) * stride]
+                    offset += row
+            # Read-only image over buf (cache entries are shared read-only anyway)
+            return Image.frombuffer("RGBA", size, buf, "raw", "RGBA", 0, 1)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def invalidate_source(self, source_path: str):
+        with self._lock:
+            self._generations[source_path] = self._generations.get(source_path, 0) + 1
+            for key in [k for k, entry in self._entries.items() if entry[4] == source_path]:
+                self._bytes -= len(self._entries.pop(key)[2])
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def nbytes(self) -> int:
+        with self._lock:
+            return self._bytes
+
+    def memory_usage(self) -> Dict[str, Tuple[int, int]]:
+        with self._lock:
+            return {"compressed_renders": (len(self._entries), self._bytes)}
+
+    def evict(self, nbytes: int) -> int:
+        """Drops least-recently-stored entries until about nbytes were freed."""
+        freed = 0
+        with self._lock:
+            while self._entries and freed < nbytes:
+                size = len(self._entries.popitem(last=False)[1][2])
+                self._bytes -= size
+                freed += size
+        return freed
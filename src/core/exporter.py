@@ -0,0 +1,107 @@
+import os
+from typing import Dict
+from core.logger import Logger
+from core.tracing import Tracer, traced
+
+
+class FaceExporter:
+    """
+    Writes the game image files of a character (face_a/b/c/d/e per state) into its slot.
+    Runs without any UI, so it can be used from the editor's save thread and benchmarks.
+    """
+    # State key -> file suffix used by the game
+    SUFFIX_MAP = {
+        "normal": "",
+        "poison": "_PO", "hp_75": "_75", "hp_50": "_50", "hp_25": "_25", "dead": "_DE",
+        "afraid": "_AF", "sleep": "_SL", "paralyzed": "_PA", "stoned": "_ST", "ashed": "_AS"
+    }
+
+    def __init__(self, face_manager, image_processor):
+        self.face_manager = face_manager
+        self.image_processor = image_processor
+
+    @traced("export_images")
+    def export(self, face_data: Dict) -> int:
+        """Renders and saves every state with a source. Returns the number of states exported."""
+        face_dir = face_data.get('_path')
+        if not face_dir:
+            Logger.error("Face directory is missing!")
+            return 0
+
+        states = face_data.get('states', {})
+        Logger.debug(f"States found: {list(states.keys())}")
+        
+        count_saved = 0
+        
+        for key, suffix in self.SUFFIX_MAP.items():
+            state_data = states.get(key)
+            if not state_data: 
+                # Logger.debug(f"Skipping {key}: No state data")
+                continue
+            
+            source_uuid = state_data.get('source_uuid')
+            if not source_uuid: 
+                Logger.debug(f"Skipping {key}: No source UUID")
+                continue
+            
+            source_path = self.face_manager.get_source_path(face_data, source_uuid)
+            if not source_path: 
+                Logger.warning(f"Skipping {key}: Source path not found for UUID {source_uuid}")
+                continue
+            
+            frame_id = face_data.get('frame_id')
+            frame_path = self.face_manager.get_frame_path(frame_id)
+            
+            # Resolve Face Center for this state
+            face_center = state_data.get('face_center')
+            if not face_center:
+                # Fallback to defaults/global
+                face_center = face_data.get('defaults', {}).get('face_center')
+                if not face_center:
+                    face_center = face_data.get('face_center')
+            
+            Logger.debug(f"Processing {key}...")
+            
+            # Render 1920x1080 (face_c)
+            # Reuse a cached preview render if present; otherwise borrow a pooled canvas
+            img_full = self.image_processor.get_cached_render(source_path, state_data, (1920, 1080))
+            pooled = img_full is None
+            if pooled:
+                img_full = self.image_processor.process_image(source_path, state_data, (1920, 1080), frame_path=frame_path, cache_result=False)
+            if img_full:
+                # Save face_c
+                filename = f"face_c{suffix}.png"
+                save_path = os.path.join(face_dir, filename)
+                with Tracer.span("png_write", file=filename):
+                    img_full.save(save_path)
+                Logger.debug(f"Saved {filename}")
+                
+                # Save face_d (Copy of c)
+                with Tracer.span("png_write", file=f"face_d{suffix}.png"):
+                    img_full.save(os.path.join(face_dir, f"face_d{suffix}.png"))
+                
+                # Save face_e (Copy of c)
+                with Tracer.span("png_write", file=f"face_e{suffix}.png"):
+                    img_full.save(os.path.join(face_dir, f"face_e{suffix}.png"))
+                
+                # Save face_b (270x96) - For ALL states
+                img_b = self.image_processor.create_face_icon(img_full, (270, 96), face_center)
+                with Tracer.span("png_write", file=f"face_b{suffix}.png"):
+                    img_b.save(os.path.join(face_dir, f"face_b{suffix}.png"))
+                
+                # If normal state, generate face_a
+                if key == "normal":
+                    # face_a (96x96)
+                    img_a = self.image_processor.create_face_icon(img_full, (96, 96), face_center)
+                    with Tracer.span("png_write", file="face_a.png"):
+                        img_a.save(os.path.join(face_dir, "face_a.png"))
+                    Logger.debug("Saved face_a.png")
+                
+                if pooled:
+                    self.image_processor.release_canvas(img_full)
+                    
+                count_saved += 1
+            else:
+                Logger.error(f"Failed to process image for {key}")
+        
+        return count_saved
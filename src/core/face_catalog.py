@@ -0,0 +1,86 @@
+import os
+import json
+import copy
+import threading
+from typing import Dict, List, Optional
+from core.logger import Logger
+
+
+class FaceCatalog:
+    """
+    Persisted index of the face slots (base_path/_catalog.json).
+
+    For each slot it remembers the directory mtime, the (mtime, size) of project_data.json,
+    status, display name, thumbnail path and (for managed slots) the parsed project data.
+    A slot whose directory and project_data.json are both unchanged can be rebuilt from the
+    index without parsing JSON or listing the folder. The JSON stat catches in-place edits
+    (other tools, editors that don't write via temp file + rename), which leave the
+    directory mtime alone. FaceManager also invalidates a slot whenever it saves or deletes it.
+    """
+    FILENAME = "_catalog.json"
+    VERSION = 2
+
+    def __init__(self, base_path: str):
+        self.path = os.path.join(base_path, self.FILENAME)
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self._entries = data.get("slots", {})
+        except Exception as e:
+            Logger.warning(f"Ignoring unreadable face catalog {self.path}: {e}")
+            self._entries = {}
+
+    def save(self):
+        """Writes the index if anything changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            text = json.dumps({"version": self.VERSION, "slots": self._entries}, ensure_ascii=False)
+            self._dirty = False
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            Logger.error(f"Error saving face catalog {self.path}: {e}")
+
+    @staticmethod
+    def json_state(st: Optional[os.stat_result]) -> Optional[List[int]]:
+        """Validity key of project_data.json from its stat (None = missing)."""
+        return [st.st_mtime_ns, st.st_size] if st is not None else None
+
+    def lookup(self, dirname: str, dir_mtime: Optional[int], json_state: Optional[List[int]]) -> Optional[Dict]:
+        """Returns a copy of the slot entry if it is still valid for dir_mtime and json_state, else None."""
+        with self._lock:
+            entry = self._entries.get(dirname)
+            if entry is None or entry.get("dir_mtime") != dir_mtime or entry.get("json_state") != json_state:
+                return None
+            return copy.deepcopy(entry)
+
+    def update(self, dirname: str, entry: Dict):
+        with self._lock:
+            if self._entries.get(dirname) != entry:
+                self._entries[dirname] = copy.deepcopy(entry)
+                self._dirty = True
+
+    def clear(self):
+        """Forgets every slot (next scan re-reads all of them)."""
+        with self._lock:
+            if self._entries:
+                self._entries = {}
+                self._dirty = True
+
+    def invalidate(self, dirname: str):
+        with self._lock:
+            if self._entries.pop(dirname, None) is not None:
+                self._dirty = True
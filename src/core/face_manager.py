@@ -2,19 +2,41 @@ import os
 import json
 import shutil
 import uuid
-import glob
 import datetime
 import threading
+import time
 from typing import List, Dict, Optional
 from core.logger import Logger
+from core.history import diff_state, apply_patch, estimate_patch_size
+from core.history_journal import HistoryJournal
+from core.persistence import PersistenceService
+from core.face_catalog import FaceCatalog
+from core.thumbnail_cache import ThumbnailCache
+from core.io_pool import IOPool
+from core.tracing import traced
 
 class FaceManager:
+    SLOT_COUNT = 100 # The game reads face1 .. face100
+
     def __init__(self, base_path: str):
         self.base_path = base_path
         self.faces: List[Dict] = []
+        self.persistence = PersistenceService() # Write-behind for project_data.json
+        self._source_index = {} # face_dir -> (sources dir mtime, {source_uuid: path})
+        self._source_index_lock = threading.Lock()
         self.undo_stack = [] # List of (action_type, data)
         self.redo_stack = [] # List of (action_type, data)
         self.on_history_change = None # Callback function
+        
+        # Structural-diff history
+        # Update entries store a reverse patch instead of a full deep copy.
+        # One snapshot per face holds the state as of its last push; entries stay "pending"
+        # until the next history operation diffs the snapshot against the live data.
+        self._history_snapshots = {} # path -> Dict (state at last push)
+        self._pending_updates = {} # path -> pending undo entry
+        self._pending_faces = {} # path -> the dict passed to push_update_state (the one being edited)
+        self.history_max_bytes = 16 * 1024 * 1024 # Memory cap for undo + redo
+        self.history_coalesce_seconds = 1.0 # Same-field edits closer than this merge
         self.trash_path = os.path.join(base_path, "_trash")
         if not os.path.exists(self.trash_path):
             try:
@@ -23,7 +45,15 @@ class FaceManager:
                 Logger.error(f"Error creating trash path {self.trash_path}: {e}")
 
         self.ensure_base_path()
+        self.catalog = FaceCatalog(base_path) # Persisted slot index for cheap scans
+        self.thumbnails = ThumbnailCache(os.path.join(base_path, "_thumbs.cache")) # 48x48 card thumbnails
         self.scan_faces()
+        
+        # Persistent History (survives restarts)
+        # Undo/redo only append to the journal; the faces they touch go through the
+        # debounced persistence service like any other save.
+        self.journal = HistoryJournal(os.path.join(base_path, "_history", "journal.jsonl"))
+        self.undo_stack, self.redo_stack = self.journal.load()
 
     def ensure_base_path(self):
         if not os.path.exists(self.base_path):
@@ -32,69 +62,167 @@ class FaceManager:
             except OSError as e:
                 Logger.error(f"Error creating base path {self.base_path}: {e}")
 
+    @traced("scan_faces")
     def scan_faces(self) -> List[Dict]:
-        """Scans the base path for face folders (face1 to face100). Auto-creates if missing."""
+        """
+        Scans the base path for face slots (face1 to faceSLOT_COUNT).
+        Uses the catalog index: only slots whose directory or project_data.json changed are re-read.
+        Missing slot folders are NOT created here; initialize_face creates them on first edit.
+        """
+        # Keep the dict objects the UI already holds (editor, undo bookkeeping) and refresh them in place
+        previous = {face.get('_path'): face for face in self.faces}
         self.faces = []
         if not os.path.exists(self.base_path):
             return []
 
         # Scan for face1 to face100
-        for i in range(1, 101):
-            dirname = f"face{i}"
-            face_dir = os.path.join(self.base_path, dirname)
+        dirnames = [f"face{i}" for i in range(1, self.SLOT_COUNT + 1)]
+        face_dirs = [os.path.join(self.base_path, d) for d in dirnames]
+        
+        # 1. Batched stat (parallel, in slot order). None = not created yet (lazy)
+        stats = IOPool.stat_many(face_dirs)
+        dir_mtimes = [st.st_mtime_ns if st else None for st in stats]
+        # project_data.json too: in-place edits don't touch the directory mtime
+        json_states = [None] * len(face_dirs)
+        present = [idx for idx, m in enumerate(dir_mtimes) if m is not None]
+        json_stats = IOPool.stat_many(os.path.join(face_dirs[idx], "project_data.json") for idx in present)
+        for idx, st in zip(present, json_stats):
+            json_states[idx] = FaceCatalog.json_state(st)
+        
+        # 2. Catalog lookup; collect the slots that must be re-read
+        entries = []
+        stale = []
+        for idx, (dirname, face_dir, dir_mtime) in enumerate(zip(dirnames, face_dirs, dir_mtimes)):
+            # Queued saves are newer than anything on disk
+            entry = None
+            if self.persistence.pending_data(face_dir) is None:
+                entry = self.catalog.lookup(dirname, dir_mtime, json_states[idx])
+            if entry is None:
+                stale.append(idx)
+            entries.append(entry)
+        
+        # 3. Re-read stale slots in parallel (listdir + JSON parse)
+        fresh = IOPool.map(lambda idx: self._read_slot(face_dirs[idx], dir_mtimes[idx], json_states[idx]), stale)
+        for idx, entry in zip(stale, fresh):
+            if entry is None:
+                entry = self._read_slot(face_dirs[idx], None)
+            entries[idx] = entry
+            self.catalog.update(dirnames[idx], entry)
             
-            # Auto-create if missing
-            if not os.path.exists(face_dir):
-                try:
-                    os.makedirs(face_dir)
-                    # Also create sources dir? Maybe wait until used.
-                except OSError as e:
-                    Logger.error(f"Error creating face directory {face_dir}: {e}")
-                    continue
-                
-            data = self.load_project_data(face_dir)
-            if data:
-                # Managed
-                data['_path'] = face_dir
-                data['_dirname'] = dirname
-                data['_status'] = "managed"
-                self.faces.append(data)
-            else:
-                # Check for existing images (Unmanaged)
-                # We look for standard game files: face_a.png, face_b.png, etc.
-                has_images = False
-                
-                # Case-insensitive check for face_a.png
-                try:
-                    files = os.listdir(face_dir)
-                    for f in files:
-                        if f.lower() == "face_a.png":
-                            has_images = True
-                            break
-                except OSError:
-                    pass
-                
-                # thumb_path = os.path.join(face_dir, "face_a.png")
-                # if os.path.exists(thumb_path):
-                #     has_images = True
-                
-                status = "unmanaged" if has_images else "empty"
-                
-                # Create placeholder object
-                transient_data = {
-                    "display_name": f"Face {i}",
-                    "_path": face_dir,
-                    "_dirname": dirname,
-                    "_status": status,
-                    "face_center": None,
-                    "states": {}
-                }
-                self.faces.append(transient_data)
+        for i, (dirname, face_dir, entry) in enumerate(zip(dirnames, face_dirs, entries), start=1):
+            face = self._face_from_entry(i, dirname, face_dir, entry)
+            existing = previous.get(face_dir)
+            if existing is not None and existing is not face:
+                existing.clear()
+                existing.update(face)
+                face = existing
+            self.faces.append(face)
         
+        self.catalog.save()
         return self.faces
 
+    def _read_slot(self, face_dir: str, dir_mtime: Optional[int], json_state=False) -> Dict:
+        """
+        Reads one slot from disk into a catalog entry. json_state is the project_data.json
+        stat key taken before reading (stat'ed here if not given).
+        """
+        if json_state is False:
+            try:
+                json_state = FaceCatalog.json_state(os.stat(os.path.join(face_dir, "project_data.json")))
+            except OSError:
+                json_state = None
+        entry = {
+            "dir_mtime": dir_mtime,
+            "json_state": json_state,
+            "status": "empty",
+            "display_name": None,
+            "thumb_path": None,
+            "data": None
+        }
+        if dir_mtime is None:
+            return entry
+        
+        # Case-insensitive lookup of face_a.png (thumbnail + unmanaged detection)
+        # We look for standard game files: face_a.png, face_b.png, etc.
+        try:
+            for f in os.listdir(face_dir):
+                if f.lower() == "face_a.png":
+                    entry["thumb_path"] = os.path.join(face_dir, f)
+                    break
+        except OSError:
+            pass
+            
+        data = self.load_project_data(face_dir)
+        if data:
+            # Managed
+            entry["status"] = "managed"
+            entry["display_name"] = data.get("display_name")
+            entry["data"] = data
+        else:
+            entry["status"] = "unmanaged" if entry["thumb_path"] else "empty"
+        return entry
+
+    def _face_from_entry(self, index: int, dirname: str, face_dir: str, entry: Dict) -> Dict:
+        if entry["status"] == "managed" and entry.get("data") is not None:
+            data = entry["data"]
+        else:
+            # Create placeholder object
+            data = {
+                "display_name": f"Face {index}",
+                "face_center": None,
+                "states": {}
+            }
+        data['_path'] = face_dir
+        data['_dirname'] = dirname
+        data['_status'] = entry["status"]
+        data['_thumb_path'] = entry.get("thumb_path")
+        return data
+
+    def reload_slot(self, dirname: str) -> Optional[Dict]:
+        """
+        Re-reads a single slot after an external change (see LibraryWatcher).
+        Updates the face dict in place and returns it, or None if nothing changed.
+        """
+        face_dir = os.path.join(self.base_path, dirname)
+        if self.persistence.pending_data(face_dir) is not None:
+            return None # Our queued save is newer than the file
+        if self.persistence.is_own_write(face_dir) and self._find_face(face_dir) is not None:
+            return None # The change is our own save; memory is already up to date
+            
+        try:
+            index = int(dirname[len("face"):])
+        except ValueError:
+            return None
+            
+        try:
+            dir_mtime = os.stat(face_dir).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        entry = self._read_slot(face_dir, dir_mtime)
+        self.catalog.update(dirname, entry)
+        new_face = self._face_from_entry(index, dirname, face_dir, entry)
+        
+        existing = self._find_face(face_dir)
+        if existing is None:
+            self.faces.append(new_face)
+            self.faces.sort(key=lambda x: int(x['_dirname'][len("face"):]))
+            return new_face
+            
+        # Our own writes also bump mtimes: ignore them when the content is identical
+        if existing == new_face:
+            return None
+        existing.clear()
+        existing.update(new_face)
+        Logger.info(f"Reloaded {dirname} (changed on disk)")
+        return existing
+
     def load_project_data(self, face_dir: str) -> Optional[Dict]:
         """Loads project_data.json from a face directory."""
+        # A queued (not yet written) save is newer than the file
+        pending = self.persistence.pending_data(face_dir)
+        if pending is not None:
+            return pending
+            
         json_path = os.path.join(face_dir, "project_data.json")
         if not os.path.exists(json_path):
             return None
@@ -112,7 +240,7 @@ class FaceManager:
         if not face_dir:
             return None
             
-        # Ensure sources dir exists
+        # Ensure sources dir exists (also creates the slot folder, which is lazy)
         sources_dir = os.path.join(face_dir, "sources")
         if not os.path.exists(sources_dir):
             try:
@@ -142,7 +270,7 @@ class FaceManager:
             }
         }
         
-        if self.save_project_data(face_dir, new_data):
+        if self.save_project_data(face_dir, new_data, wait=True):
             # Merge new data into face_data (which is a reference to the object in self.faces)
             face_data.update(new_data)
             face_data['_status'] = "managed"
@@ -150,28 +278,31 @@ class FaceManager:
             return face_data
         return None
 
-    def save_project_data(self, face_dir: str, data: Dict) -> bool:
-        """Saves project_data.json with backup."""
+    def save_project_data(self, face_dir: str, data: Dict, wait: bool = False) -> bool:
+        """
+        Saves project_data.json (write-behind: queued, debounced and written atomically).
+        With wait=True the write happens before returning and its result is returned;
+        otherwise a failed write only shows up in the log and persistence.last_error().
+        """
+        if not os.path.exists(face_dir) and self._find_face(face_dir) is not None:
+            # Slot folders are created lazily (first save into a never-used slot)
+            try:
+                os.makedirs(face_dir)
+            except OSError as e:
+                Logger.error(f"Error creating face directory {face_dir}: {e}")
+                
         if not os.path.exists(face_dir):
             Logger.warning(f"Save skipped: Directory not found: {face_dir}")
             return False
 
-        json_path = os.path.join(face_dir, "project_data.json")
-        bak_path = os.path.join(face_dir, "project_data.json.bak")
-        
-        # Remove internal keys before saving
-        save_data = {k: v for k, v in data.items() if not k.startswith('_')}
-
         try:
-            # Create backup if exists
-            if os.path.exists(json_path):
-                shutil.copy2(json_path, bak_path)
-            
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(save_data, f, indent=4, ensure_ascii=False)
+            self.persistence.save(face_dir, data)
+            self.catalog.invalidate(os.path.basename(face_dir))
+            if wait:
+                return self.persistence.flush(face_dir)
             return True
         except Exception as e:
-            Logger.error(f"Error saving {json_path}: {e}")
+            Logger.error(f"Error saving {os.path.join(face_dir, 'project_data.json')}: {e}")
             return False
 
     def delete_face(self, face_data: Dict) -> bool:
@@ -184,18 +315,23 @@ class FaceManager:
             # Move to trash
             dirname = os.path.basename(face_dir)
             trash_dest = os.path.join(self.trash_path, f"{dirname}_{uuid.uuid4()}")
+            self.persistence.flush() # Pending saves belong in the trashed copy
             shutil.move(face_dir, trash_dest)
+            self.invalidate_source_index(face_dir)
+            self.catalog.invalidate(dirname)
             
             if face_data in self.faces:
                 self.faces.remove(face_data)
             
             # Push undo action
-            self.undo_stack.append({
+            entry = {
                 'type': 'delete',
                 'face_data': face_data,
                 'trash_path': trash_dest,
                 'original_path': face_dir
-            })
+            }
+            self.undo_stack.append(entry)
+            self.journal.record("push", "undo", entry)
             
             Logger.info(f"Deleted character (moved to trash): {face_data.get('display_name')}")
             return True
@@ -205,15 +341,143 @@ class FaceManager:
 
     def push_update_state(self, face_data: Dict):
         """Pushes the current state of a face to the undo stack before modification."""
-        import copy
-        self.undo_stack.append({
+        if not face_data:
+            return
+        path = face_data.get('_path')
+        
+        self._finalize_pending_updates()
+        
+        # Bring the snapshot up to date (first push for a face takes the only full copy)
+        snapshot = self._history_snapshots.get(path)
+        if snapshot is None:
+            import copy
+            self._history_snapshots[path] = copy.deepcopy(face_data)
+        else:
+            forward = diff_state(face_data, snapshot)
+            apply_patch(snapshot, forward)
+        
+        entry = {
             'type': 'update',
-            'face_data': copy.deepcopy(face_data),
-            'path': face_data.get('_path')
-        })
-        self.redo_stack.clear() # Clear redo stack on new action
+            'path': path,
+            'patch': None, # Filled in by _finalize_pending_updates
+            'time': time.monotonic()
+        }
+        self.undo_stack.append(entry)
+        self._pending_updates[path] = entry
+        self._pending_faces[path] = face_data
+        
+        if self.redo_stack:
+            self.redo_stack.clear() # Clear redo stack on new action
+            self.journal.record("clear", "redo")
         if self.on_history_change: self.on_history_change()
 
+    def find_face(self, path: str) -> Optional[Dict]:
+        """The live face dict for a slot path (None if unknown)."""
+        return self._find_face(path)
+
+    def _find_face(self, path: str) -> Optional[Dict]:
+        for face in self.faces:
+            if face.get('_path') == path:
+                return face
+        return None
+
+    def _finalize_pending_updates(self):
+        """Turns pending update entries into reverse patches against the live face data."""
+        if not self._pending_updates:
+            return
+            
+        for path, entry in list(self._pending_updates.items()):
+            snapshot = self._history_snapshots.get(path)
+            # Diff the dict that was actually edited, even if self.faces was rebuilt since
+            current_face = self._pending_faces.get(path) or self._find_face(path)
+            
+            patch = {}
+            if snapshot is not None and current_face is not None:
+                # Reverse patch: current -> state at push time
+                patch = diff_state(snapshot, current_face)
+                # Snapshot follows the live data
+                apply_patch(snapshot, diff_state(current_face, snapshot))
+            
+            entry['patch'] = patch
+            entry['size'] = estimate_patch_size(patch)
+            
+            if not patch:
+                # No-op (e.g. click without drag)
+                self._remove_entry(entry)
+            elif not self._coalesce(entry):
+                self._journal_insert(entry)
+                
+        self._pending_updates.clear()
+        self._pending_faces.clear()
+        self._enforce_history_cap()
+        
+        if self.journal.needs_compaction():
+            self.journal.compact(self.undo_stack, self.redo_stack)
+
+    def _journal_insert(self, entry: Dict):
+        # Index among journaled entries (pending ones below it are not in the journal yet)
+        index = 0
+        for e in self.undo_stack:
+            if e is entry:
+                break
+            if e.get('type') != 'update' or e.get('patch') is not None:
+                index += 1
+        self.journal.record("insert", "undo", entry, index=index)
+
+    def _remove_entry(self, entry: Dict):
+        for i in range(len(self.undo_stack) - 1, -1, -1):
+            if self.undo_stack[i] is entry:
+                del self.undo_stack[i]
+                return
+
+    def _coalesce(self, entry: Dict) -> bool:
+        """Merges an entry into the one directly below it if it edits the same fields in quick succession."""
+        idx = None
+        for i in range(len(self.undo_stack) - 1, -1, -1):
+            if self.undo_stack[i] is entry:
+                idx = i
+                break
+        if not idx:
+            return False
+            
+        prev = self.undo_stack[idx - 1]
+        if prev.get('type') != 'update' or prev.get('path') != entry['path'] or prev.get('patch') is None:
+            return False
+        if entry['time'] - prev.get('time', 0) > self.history_coalesce_seconds:
+            return False
+        if prev['patch'].keys() != entry['patch'].keys():
+            return False
+            
+        # prev already restores the oldest values of the same fields
+        prev['time'] = entry['time']
+        del self.undo_stack[idx]
+        return True
+
+    def _enforce_history_cap(self):
+        """Drops the oldest history entries until undo + redo fit into history_max_bytes."""
+        def total():
+            return sum(e.get('size', 0) for e in self.undo_stack) + sum(e.get('size', 0) for e in self.redo_stack)
+            
+        while total() > self.history_max_bytes and len(self.undo_stack) > 1:
+            self.undo_stack.pop(0)
+            self.journal.record("remove", "undo", index=0)
+
+    def memory_usage(self) -> Dict[str, tuple]:
+        """(entries, approximate bytes) of history and indexes, for MemoryReport."""
+        history_bytes = sum(e.get('size', 0) for e in self.undo_stack) + sum(e.get('size', 0) for e in self.redo_stack)
+        # Snapshots are full copies of face data; repr length is a fair stand-in for their size
+        snapshot_bytes = sum(len(repr(s)) for s in list(self._history_snapshots.values()))
+        with self._source_index_lock:
+            index_entries = sum(len(index) for _, index in self._source_index.values())
+        usage = {
+            "history": (len(self.undo_stack) + len(self.redo_stack), history_bytes),
+            "history_snapshots": (len(self._history_snapshots), snapshot_bytes),
+            "faces": (len(self.faces), sum(len(repr(f)) for f in list(self.faces))),
+            "source_index": (index_entries, index_entries * 200),
+        }
+        usage.update(self.thumbnails.memory_usage())
+        return usage
+
     @property
     def can_undo(self) -> bool:
         return len(self.undo_stack) > 0
@@ -222,44 +486,60 @@ class FaceManager:
     def can_redo(self) -> bool:
         return len(self.redo_stack) > 0
 
+    def _apply_update_entry(self, action: Dict, target: str) -> Optional[Dict]:
+        """Applies an update entry to the live face and pushes the inverse entry onto the target stack ("undo"/"redo")."""
+        path = action.get('path')
+        current_face = self._find_face(path)
+        if not current_face:
+            return None
+            
+        reverse = apply_patch(current_face, action.get('patch', {}))
+        inverse = {
+            'type': 'update',
+            'path': path,
+            'patch': reverse,
+            'size': estimate_patch_size(reverse),
+            'time': 0 # Never coalesce across undo/redo
+        }
+        target_stack = self.undo_stack if target == "undo" else self.redo_stack
+        target_stack.append(inverse)
+        self.journal.record("push", target, inverse)
+        
+        # Keep snapshot in sync
+        snapshot = self._history_snapshots.get(path)
+        if snapshot is not None:
+            apply_patch(snapshot, diff_state(current_face, snapshot))
+        
+        # Deferred Save (the journal already has the change)
+        if path and os.path.exists(path):
+            self.save_project_data(path, current_face)
+        return current_face
+
+    def shutdown(self):
+        """Flushes pending history and saves. Call on application exit."""
+        self._finalize_pending_updates()
+        self.journal.close()
+        self.persistence.stop()
+        self.thumbnails.save()
+
     def undo(self) -> Optional[Dict]:
         """Undoes the last action. Returns the restored face data if applicable."""
+        self._finalize_pending_updates()
+        
         if not self.undo_stack:
             Logger.info("Nothing to undo.")
             return None
             
         action = self.undo_stack.pop()
+        self.journal.record("pop", "undo")
         action_type = action.get('type')
         
         if action_type == 'update':
-            # Restore previous state
-            prev_data = action.get('face_data')
-            path = action.get('path')
-            
-            # Push CURRENT state to Redo Stack before restoring
-            # We need to find the current state of this face in memory
-            current_face = None
-            for face in self.faces:
-                if face.get('_path') == path:
-                    current_face = face
-                    break
-            
+            # Restore previous state (Push CURRENT values to Redo Stack)
+            current_face = self._apply_update_entry(action, "redo")
             if current_face:
-                import copy
-                self.redo_stack.append({
-                    'type': 'update',
-                    'face_data': copy.deepcopy(current_face),
-                    'path': path
-                })
-
-            if path and os.path.exists(path):
-                # Async Save
-                threading.Thread(target=self.save_project_data, args=(path, prev_data), daemon=True).start()
-                # Update in-memory reference
-                if current_face:
-                    current_face.update(prev_data)
-                    if self.on_history_change: self.on_history_change()
-                    return current_face
+                if self.on_history_change: self.on_history_change()
+                return current_face
                         
         elif action_type == 'delete':
             # Restore from trash
@@ -270,13 +550,15 @@ class FaceManager:
             if os.path.exists(trash_path) and not os.path.exists(original_path):
                 try:
                     shutil.move(trash_path, original_path)
+                    self.invalidate_source_index(original_path)
+                    self.catalog.invalidate(os.path.basename(original_path))
                     self.faces.append(face_data)
                     # Sort faces?
                     self.faces.sort(key=lambda x: x.get('_dirname', ''))
                     Logger.info(f"Restored character: {face_data.get('display_name')}")
                     
                     # Push to Redo (Delete again)
-                    self.redo_stack.append({
+                    redo_entry = {
                         'type': 'delete',
                         'face_data': face_data,
                         'trash_path': trash_path, # Reuse same trash path? No, it's gone.
@@ -284,7 +566,9 @@ class FaceManager:
                         # But the old trash folder is empty/gone now because we moved it back.
                         # So we need to generate a new trash path or just use logic.
                         'original_path': original_path
-                    })
+                    }
+                    self.redo_stack.append(redo_entry)
+                    self.journal.record("push", "redo", redo_entry)
                     
                     return face_data # Return dict to refresh list
                 except Exception as e:
@@ -295,40 +579,22 @@ class FaceManager:
 
     def redo(self) -> Optional[Dict]:
         """Redoes the last undone action."""
+        self._finalize_pending_updates()
+        
         if not self.redo_stack:
             Logger.info("Nothing to redo.")
             return None
             
         action = self.redo_stack.pop()
+        self.journal.record("pop", "redo")
         action_type = action.get('type')
         
         if action_type == 'update':
-            # Restore "Future" state
-            next_data = action.get('face_data')
-            path = action.get('path')
-            
-            # Push CURRENT (Old) state to Undo Stack
-            current_face = None
-            for face in self.faces:
-                if face.get('_path') == path:
-                    current_face = face
-                    break
-            
+            # Restore "Future" state (Push CURRENT values to Undo Stack)
+            current_face = self._apply_update_entry(action, "undo")
             if current_face:
-                import copy
-                self.undo_stack.append({
-                    'type': 'update',
-                    'face_data': copy.deepcopy(current_face),
-                    'path': path
-                })
-            
-            if path and os.path.exists(path):
-                # Async Save
-                threading.Thread(target=self.save_project_data, args=(path, next_data), daemon=True).start()
-                if current_face:
-                    current_face.update(next_data)
-                    if self.on_history_change: self.on_history_change()
-                    return current_face
+                if self.on_history_change: self.on_history_change()
+                return current_face
 
         elif action_type == 'delete':
             # Redo Delete
@@ -357,6 +623,9 @@ class FaceManager:
             # 1. Push Undo for Target
             self.push_update_state(target_face)
             
+            # Target slot may not exist yet (slots are created lazily)
+            os.makedirs(target_path, exist_ok=True)
+            
             # 2. Copy Files (Images & Sources)
             # We need to clear target directory of images/sources first?
             # Or just overwrite? Overwrite is safer/easier.
@@ -370,12 +639,21 @@ class FaceManager:
             if os.path.exists(src_sources):
                 if os.path.exists(dst_sources):
                     shutil.rmtree(dst_sources)
-                shutil.copytree(src_sources, dst_sources)
+                copied = IOPool.copy_tree(src_sources, dst_sources) # Parallel copy
+                self.invalidate_source_index(target_path)
+                if not copied:
+                    Logger.error(f"Error copying sources {src_sources} -> {dst_sources}")
+                    return False
             
             # Copy generated images (face_*.png)
+            pairs = []
             for file in os.listdir(source_path):
                 if file.lower().endswith('.png') and file.startswith('face_'):
-                    shutil.copy2(os.path.join(source_path, file), os.path.join(target_path, file))
+                    pairs.append((os.path.join(source_path, file), os.path.join(target_path, file)))
+            failed = [dst for (src, dst), ok in zip(pairs, IOPool.copy_files(pairs)) if not ok]
+            if failed:
+                Logger.error(f"Error copying {len(failed)} image(s) to {target_path}: {', '.join(os.path.basename(f) for f in failed)}")
+                return False
             
             # 3. Update Data
             # We want to copy everything EXCEPT _path, _dirname, _status
@@ -392,7 +670,7 @@ class FaceManager:
             new_data['uuid'] = str(uuid.uuid4()) # New UUID
             
             # Save to target
-            if self.save_project_data(target_path, new_data):
+            if self.save_project_data(target_path, new_data, wait=True):
                 # Update in-memory target object
                 target_face.clear()
                 target_face.update(new_data)
@@ -407,42 +685,83 @@ class FaceManager:
 
     def import_source_image(self, face_data: Dict, source_path: str) -> Optional[str]:
         """Imports an image into the sources folder and returns its new UUID."""
-        if not os.path.exists(source_path):
-            return None
-            
+        return self.import_source_images(face_data, [source_path])[0]
+
+    def import_source_images(self, face_data: Dict, source_paths: List[str]) -> List[Optional[str]]:
+        """Imports several images at once (copied in parallel). Returns the new UUIDs in input order (None on failure)."""
         face_dir = face_data.get('_path')
         if not face_dir:
-            return None
+            return [None] * len(source_paths)
             
         sources_dir = os.path.join(face_dir, "sources")
         if not os.path.exists(sources_dir):
             os.makedirs(sources_dir)
-            
-        new_uuid = str(uuid.uuid4())
-        ext = os.path.splitext(source_path)[1]
-        dest_path = os.path.join(sources_dir, new_uuid + ext)
         
-        try:
-            shutil.copy2(source_path, dest_path)
-            Logger.info(f"Imported image: {os.path.basename(source_path)}")
-            return new_uuid
-        except Exception as e:
-            Logger.error(f"Error importing image: {e}")
-            return None
+        uuids = []
+        pairs = []
+        for source_path in source_paths:
+            new_uuid = str(uuid.uuid4())
+            ext = os.path.splitext(source_path)[1]
+            uuids.append(new_uuid)
+            pairs.append((source_path, os.path.join(sources_dir, new_uuid + ext)))
+        
+        results = IOPool.copy_files(pairs)
+        for i, ok in enumerate(results):
+            name = os.path.basename(source_paths[i])
+            if ok:
+                with self._source_index_lock:
+                    entry = self._source_index.get(face_dir)
+                    if entry is not None:
+                        entry[1][uuids[i]] = pairs[i][1]
+                Logger.info(f"Imported image: {name}")
+            else:
+                Logger.error(f"Error importing image: {name}")
+                uuids[i] = None
+        return uuids
 
     def get_source_path(self, face_data: Dict, source_uuid: str) -> Optional[str]:
-        """Resolves the absolute path of a source image by UUID."""
+        """Resolves the absolute path of a source image by UUID (indexed, no directory scan per call)."""
         face_dir = face_data.get('_path')
-        if not face_dir:
+        if not face_dir or not source_uuid:
             return None
             
+        with self._source_index_lock:
+            entry = self._source_index.get(face_dir)
+        if entry is not None:
+            path = entry[1].get(source_uuid)
+            if path is not None and os.path.exists(path):
+                return path
+            
+        # Unknown UUID or the file is gone: re-list the folder (the extension is unknown),
+        # but only if it changed since the index was built, so a missing source costs one
+        # stat per call instead of a listdir.
+        try:
+            dir_mtime = os.stat(os.path.join(face_dir, "sources")).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        if entry is None or entry[0] != dir_mtime:
+            entry = (dir_mtime, self._build_source_index(face_dir, dir_mtime))
+        path = entry[1].get(source_uuid)
+        return path if path is not None and os.path.exists(path) else None
+
+    def _build_source_index(self, face_dir: str, dir_mtime: Optional[int]) -> Dict[str, str]:
         sources_dir = os.path.join(face_dir, "sources")
-        # We don't know the extension, so we search
-        pattern = os.path.join(sources_dir, f"{source_uuid}.*")
-        matches = glob.glob(pattern)
-        if matches:
-            return matches[0]
-        return None
+        index = {}
+        try:
+            for name in os.listdir(sources_dir):
+                stem = os.path.splitext(name)[0]
+                # Keep the first match (same as glob order would give for duplicates)
+                index.setdefault(stem, os.path.join(sources_dir, name))
+        except OSError:
+            pass
+        with self._source_index_lock:
+            self._source_index[face_dir] = (dir_mtime, index)
+        return index
+
+    def invalidate_source_index(self, face_dir: str):
+        """Forgets the source index of a face (rebuilt lazily on the next lookup)."""
+        with self._source_index_lock:
+            self._source_index.pop(face_dir, None)
 
 
     def get_frame_path(self, frame_id: str) -> Optional[str]:
@@ -0,0 +1,135 @@
+import os
+import threading
+from typing import Callable, Dict, Optional, Set, Tuple
+from core.logger import Logger
+
+
+class LibraryWatcher:
+    """
+    Polling watcher for the face library (works on every filesystem, including network shares).
+
+    Every `interval` seconds it stats each slot folder and its project_data.json, and the
+    sources/ folder of each slot. When a sources/ folder changed it is listed and each
+    source file is compared, so events are per source. Sources of "focused" faces (the
+    one open in the editor) are stat'ed every poll to catch in-place overwrites.
+
+    Callbacks run on the watcher thread; GUI code must marshal them (e.g. with after()).
+        on_slot_changed(dirname)
+        on_source_changed(face_dir, source_path)   # added, modified or removed
+
+    Only image files directly in sources/ count; the rembg cache (sources/_cache) is the
+    app's own output and must not trigger re-renders.
+    """
+    SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+
+    def __init__(self, base_path: str, slot_count: int = 100, interval: float = 2.0):
+        self.base_path = base_path
+        self.slot_count = slot_count
+        self.interval = interval
+        self.on_slot_changed: Optional[Callable[[str], None]] = None
+        self.on_source_changed: Optional[Callable[[str, str], None]] = None
+
+        self._slot_state: Dict[str, Tuple] = {} # dirname -> (dir mtime, json mtime)
+        self._sources_dir_state: Dict[str, Optional[int]] = {} # face_dir -> sources/ mtime
+        self._source_files: Dict[str, Dict[str, Tuple]] = {} # face_dir -> {path: (mtime, size)}
+        self._focused: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # --- Control ---
+
+    def start(self):
+        if self._thread is not None:
+            return
+        # Baseline without events
+        self.poll(emit=False)
+        self._thread = threading.Thread(target=self._run, name="LibraryWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def focus(self, face_dir: Optional[str]):
+        """Tracks every source of this face individually (replaces the previous focus)."""
+        with self._lock:
+            self._focused = {face_dir} if face_dir else set()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                Logger.error(f"Library watcher poll failed: {e}")
+
+    # --- Polling ---
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def poll(self, emit: bool = True):
+        """One polling pass. Public so tests/tools can drive it synchronously."""
+        with self._lock:
+            focused = set(self._focused)
+
+        for i in range(1, self.slot_count + 1):
+            dirname = f"face{i}"
+            face_dir = os.path.join(self.base_path, dirname)
+
+            state = (self._mtime(face_dir), self._mtime(os.path.join(face_dir, "project_data.json")))
+            previous = self._slot_state.get(dirname)
+            self._slot_state[dirname] = state
+            if emit and previous is not None and previous != state and self.on_slot_changed:
+                self.on_slot_changed(dirname)
+
+            if state[0] is None:
+                continue
+            self._poll_sources(face_dir, face_dir in focused, emit)
+
+    def _poll_sources(self, face_dir: str, focused: bool, emit: bool):
+        sources_dir = os.path.join(face_dir, "sources")
+        dir_mtime = self._mtime(sources_dir)
+        dir_changed = self._sources_dir_state.get(face_dir, -1) != dir_mtime
+        self._sources_dir_state[face_dir] = dir_mtime
+
+        if not dir_changed and not focused:
+            return
+
+        known = self._source_files.get(face_dir)
+        current = {}
+        if dir_changed or known is None:
+            # scandir: file type and stat come with the listing (no extra stat on Windows)
+            try:
+                entries = list(os.scandir(sources_dir)) if dir_mtime is not None else []
+            except OSError:
+                entries = []
+            for entry in entries:
+                if not entry.name.lower().endswith(self.SOURCE_EXTENSIONS):
+                    continue
+                try:
+                    if entry.is_file():
+                        st = entry.stat()
+                        current[entry.path] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    pass
+        else:
+            for path in known.keys():
+                try:
+                    st = os.stat(path)
+                    current[path] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    pass
+        self._source_files[face_dir] = current
+
+        if not emit or known is None or not self.on_source_changed:
+            return
+        for path in known.keys() | current.keys():
+            if known.get(path) != current.get(path):
+                self.on_source_changed(face_dir, path)
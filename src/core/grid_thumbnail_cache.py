@@ -0,0 +1,184 @@
+import os
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from PIL import Image
+from core.io_pool import IOPool
+from core.logger import Logger
+from core.memory_report import image_nbytes, images_nbytes
+from core.memory_governor import MemoryGovernor
+
+
+class GridThumbnailCache:
+    """
+    Thumbnails for the state grid, decoded on the I/O pool and cached at snapped sizes.
+
+    Sources are only ever decoded at one of SNAP_SIZES (the smallest one that covers the
+    requested size). get() answers any size right away by scaling the closest cached
+    snap, and reports whether that was exact; request() decodes the exact snap in the
+    background and calls back (on the worker thread) when it is ready.
+    Entries are keyed by (path, mtime), so an edited source is decoded again.
+
+    With a renderer, passing params makes the tile a low-resolution render of the state
+    (renderer(path, params, snap)) instead of the raw source. Rendered tiles are also keyed
+    by the render parameters, so changing the defaults only misses for the states that
+    actually changed; until their new render arrives, get() serves the previous one.
+    Renders run on their own single thread so they never block source decodes.
+    """
+    SNAP_SIZES = (64, 128, 256, 512)
+
+    def __init__(self, capacity: int = 96, renderer: Optional[Callable] = None, render_params: Sequence[str] = ()):
+        self.capacity = capacity
+        self.renderer = renderer
+        self.render_params = tuple(render_params)
+        self._entries: "OrderedDict[Tuple, Image.Image]" = OrderedDict() # (path, mtime_ns, snap, params_key) -> thumb
+        self._pending: Dict[Tuple, List[Callable]] = {} # key -> callbacks waiting for it
+        self._lock = threading.Lock()
+        self._render_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="GridTiles")
+        self._governed = None # Governor registration name (attach_governor)
+
+    def params_key(self, params: Optional[Dict]) -> Optional[Tuple]:
+        """Hashable key of the parameters that affect a rendered tile (None = raw source)."""
+        if params is None or self.renderer is None:
+            return None
+        return tuple(str(params.get(k)) for k in self.render_params)
+
+    @classmethod
+    def snap(cls, size: int) -> int:
+        for s in cls.SNAP_SIZES:
+            if s >= size:
+                return s
+        return cls.SNAP_SIZES[-1]
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def fit(img: Image.Image, size: int) -> Image.Image:
+        """Scales img to fit in size x size (keeps aspect)."""
+        w, h = img.size
+        ratio = size / max(w, h)
+        if abs(ratio - 1.0) < 0.01:
+            return img
+        new_size = (max(1, round(w * ratio)), max(1, round(h * ratio)))
+        return img.resize(new_size, Image.Resampling.BILINEAR)
+
+    def get(self, path: str, size: int, params: Optional[Dict] = None) -> Tuple[Optional[Image.Image], bool]:
+        """
+        Returns (thumbnail fitted to size, exact) from memory, or (None, False).
+        exact is False when the image was scaled from a different snap size (or, for
+        rendered tiles, is a stale render with other parameters).
+        """
+        mtime = self._mtime(path)
+        if mtime is None:
+            return None, False
+        wanted = self.snap(size)
+        pkey = self.params_key(params)
+        key = (path, mtime, wanted, pkey)
+        with self._lock:
+            img = self._entries.get(key)
+            if img is not None:
+                self._entries.move_to_end(key)
+                exact = True
+            else:
+                # Same render params first, then the closest snap, preferring larger ones (downscaling looks better)
+                candidates = [k for k in self._entries if k[0] == path and k[1] == mtime and (k[3] is None) == (pkey is None)]
+                if not candidates:
+                    return None, False
+                best = min(candidates, key=lambda k: (k[3] != pkey, k[2] < wanted, abs(k[2] - wanted)))
+                img = self._entries[best]
+                exact = False
+        return self.fit(img, size), exact
+
+    def request(self, path: str, size: int, callback: Optional[Callable[[str], None]] = None, params: Optional[Dict] = None):
+        """
+        Decodes (or renders, with params) path at the snap for size in the background.
+        callback(path) runs on the worker thread.
+        """
+        mtime = self._mtime(path)
+        if mtime is None:
+            return
+        pkey = self.params_key(params)
+        key = (path, mtime, self.snap(size), pkey)
+        with self._lock:
+            if key in self._entries:
+                return
+            if key in self._pending:
+                if callback:
+                    self._pending[key].append(callback)
+                return
+            self._pending[key] = [callback] if callback else []
+        if pkey is None:
+            IOPool.executor().submit(self._load, key, None)
+        else:
+            # Worker reads params while the UI keeps editing the state
+            self._render_executor.submit(self._load, key, dict(params))
+
+    def _load(self, key: Tuple, params: Optional[Dict]):
+        path, _, snap, _ = key
+        thumb = None
+        try:
+            if params is not None:
+                thumb = self.renderer(path, params, snap)
+            else:
+                with Image.open(path) as img:
+                    img.draft("RGB", (snap, snap)) # JPEG: decode at reduced scale
+                    img.thumbnail((snap, snap), Image.Resampling.LANCZOS)
+                    thumb = img.copy()
+        except Exception as e:
+            Logger.error(f"Error loading grid thumbnail {path}: {e}")
+
+        with self._lock:
+            callbacks = self._pending.pop(key, [])
+            if thumb is not None:
+                self._entries[key] = thumb
+                while len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+        if thumb is None:
+            return
+        if self._governed:
+            MemoryGovernor.notify()
+        for callback in callbacks:
+            try:
+                callback(path)
+            except Exception as e:
+                Logger.error(f"Grid thumbnail callback failed: {e}")
+
+    def memory_usage(self) -> Dict[str, Tuple[int, int]]:
+        with self._lock:
+            return {"grid_thumbnails": images_nbytes(list(self._entries.values()))}
+
+    def attach_governor(self, name: str = "grid_thumbnails"):
+        MemoryGovernor.register(name, MemoryGovernor.PRIORITY_THUMBNAIL, self._bytes, self._evict)
+        self._governed = name
+
+    def shutdown(self):
+        """Stops the render thread and drops the tiles. Call when the owning view is destroyed."""
+        self._render_executor.shutdown(wait=False, cancel_futures=True)
+        if self._governed:
+            MemoryGovernor.unregister(self._governed)
+            self._governed = None
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+
+    def _bytes(self) -> int:
+        with self._lock:
+            return sum(image_nbytes(img) for img in self._entries.values())
+
+    def _evict(self, nbytes: int) -> int:
+        freed = 0
+        with self._lock:
+            while self._entries and freed < nbytes:
+                freed += image_nbytes(self._entries.popitem(last=False)[1])
+        return freed
+
+    def invalidate(self, path: str):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                del self._entries[key]
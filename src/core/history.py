@@ -0,0 +1,91 @@
+import copy
+from typing import Any, Dict, Tuple
+
+# Marks a key that did not exist (so undo/redo can delete it again)
+MISSING = object()
+
+# A patch maps key paths (tuples of dict keys) to the value found at that path.
+Patch = Dict[Tuple, Any]
+
+
+def diff_state(old: Dict, new: Dict, prefix: Tuple = ()) -> Patch:
+    """
+    Structural diff of two nested dicts.
+    Returns {path: old_value} for every leaf that differs, i.e. the reverse patch that
+    turns `new` back into `old`. Dicts are walked recursively, everything else
+    (lists, scalars) is compared and stored as a whole.
+    Keys starting with "_" are runtime bookkeeping (_path, _status, _thumb_path...) and
+    are not part of the undoable state, so they are skipped.
+    """
+    patch = {}
+    for key in old.keys() | new.keys():
+        if isinstance(key, str) and key.startswith("_"):
+            continue
+        path = prefix + (key,)
+        old_val = old.get(key, MISSING)
+        new_val = new.get(key, MISSING)
+
+        if isinstance(old_val, dict) and isinstance(new_val, dict):
+            patch.update(diff_state(old_val, new_val, path))
+        elif old_val is MISSING or new_val is MISSING or old_val != new_val:
+            patch[path] = old_val if old_val is MISSING else copy.deepcopy(old_val)
+    return patch
+
+
+def get_path(data: Dict, path: Tuple) -> Any:
+    """Returns the value at path, or MISSING."""
+    current = data
+    for key in path:
+        if not isinstance(current, dict) or key not in current:
+            return MISSING
+        current = current[key]
+    return current
+
+
+def apply_patch(data: Dict, patch: Patch) -> Patch:
+    """
+    Applies a patch in place and returns the reverse patch (the values that were replaced).
+    """
+    reverse = {}
+    # Shallow paths first so parents exist (or are replaced) before their children
+    for path in sorted(patch.keys(), key=len):
+        value = patch[path]
+        old_val = get_path(data, path)
+        if path not in reverse:
+            reverse[path] = old_val if old_val is MISSING else copy.deepcopy(old_val)
+
+        parent = data
+        for key in path[:-1]:
+            child = parent.get(key)
+            if not isinstance(child, dict):
+                child = {}
+                parent[key] = child
+            parent = child
+
+        if value is MISSING:
+            parent.pop(path[-1], None)
+        else:
+            parent[path[-1]] = copy.deepcopy(value)
+    return reverse
+
+
+def estimate_patch_size(patch: Patch) -> int:
+    """Rough byte size of a patch (for the history memory cap)."""
+    size = 0
+    for path, value in patch.items():
+        size += len(repr(path)) + (0 if value is MISSING else len(repr(value)))
+    return size
+
+
+def encode_patch(patch: Patch) -> list:
+    """JSON-friendly form of a patch: [[path, value], ...] with MISSING as a marker dict."""
+    return [[list(path), {"__missing__": True} if value is MISSING else value] for path, value in patch.items()]
+
+
+def decode_patch(data: list) -> Patch:
+    patch = {}
+    for path, value in data:
+        if isinstance(value, dict) and value.get("__missing__") is True and len(value) == 1:
+            value = MISSING
+        patch[tuple(path)] = value
+    return patch
@@ -0,0 +1,191 @@
+import os
+import json
+import queue
+import threading
+from typing import Dict, List, Optional, Tuple
+from core.logger import Logger
+from core.history import encode_patch, decode_patch, estimate_patch_size
+
+
+class HistoryJournal:
+    """
+    Append-only journal of undo/redo stack operations (one per face library).
+
+    Every change to the stacks is one small JSON line. On startup the lines are replayed
+    to rebuild the stacks. A single background writer thread does all file I/O, in order;
+    compaction folds the journal into one snapshot line and atomically replaces the file.
+
+    Records:
+        {"op": "snapshot", "undo": [...], "redo": [...]}
+        {"op": "insert", "stack": "undo", "index": 3, "entry": {...}}
+        {"op": "push", "stack": "redo", "entry": {...}}
+        {"op": "pop", "stack": "undo"}
+        {"op": "remove", "stack": "undo", "index": 0}
+        {"op": "clear", "stack": "redo"}
+    """
+    VERSION = 1
+
+    def __init__(self, journal_path: str, compact_threshold: int = 500):
+        self.journal_path = journal_path
+        self.compact_threshold = compact_threshold
+        self.ops_since_compaction = 0
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._closed = False
+
+    # --- Loading ---
+
+    def load(self) -> Tuple[List[Dict], List[Dict]]:
+        """Replays the journal and returns (undo_stack, redo_stack)."""
+        stacks = {"undo": [], "redo": []}
+        if not os.path.exists(self.journal_path):
+            return stacks["undo"], stacks["redo"]
+
+        count = 0
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn write (crash mid-append). Everything before it is still valid.
+                        Logger.warning(f"History journal: skipping corrupt record in {self.journal_path}")
+                        break
+                    self._replay(stacks, record)
+                    count += 1
+        except Exception as e:
+            Logger.error(f"Error loading history journal {self.journal_path}: {e}")
+            return [], []
+
+        self.ops_since_compaction = count
+        return stacks["undo"], stacks["redo"]
+
+    def _replay(self, stacks: Dict[str, List], record: Dict):
+        op = record.get("op")
+        if op == "snapshot":
+            stacks["undo"] = [self.decode_entry(e) for e in record.get("undo", [])]
+            stacks["redo"] = [self.decode_entry(e) for e in record.get("redo", [])]
+            return
+
+        stack = stacks.get(record.get("stack"))
+        if stack is None:
+            return
+        if op == "push":
+            stack.append(self.decode_entry(record["entry"]))
+        elif op == "insert":
+            stack.insert(record.get("index", len(stack)), self.decode_entry(record["entry"]))
+        elif op == "pop":
+            if stack: stack.pop()
+        elif op == "remove":
+            index = record.get("index", 0)
+            if 0 <= index < len(stack): del stack[index]
+        elif op == "clear":
+            stack.clear()
+
+    # --- Entry (de)serialization ---
+
+    @staticmethod
+    def encode_entry(entry: Dict) -> Dict:
+        if entry.get('type') == 'update':
+            return {
+                'type': 'update',
+                'path': entry.get('path'),
+                'patch': encode_patch(entry.get('patch') or {})
+            }
+        # delete (face_data is plain JSON data plus internal keys)
+        return {
+            'type': entry.get('type'),
+            'face_data': entry.get('face_data'),
+            'trash_path': entry.get('trash_path'),
+            'original_path': entry.get('original_path')
+        }
+
+    @staticmethod
+    def decode_entry(data: Dict) -> Dict:
+        entry = dict(data)
+        if entry.get('type') == 'update':
+            entry['patch'] = decode_patch(data.get('patch', []))
+            entry['size'] = estimate_patch_size(entry['patch'])
+            entry['time'] = 0 # Never coalesce with entries from a previous session
+        return entry
+
+    # --- Writing ---
+
+    def record(self, op: str, stack: str, entry: Optional[Dict] = None, index: Optional[int] = None):
+        """Queues one stack operation for appending."""
+        record = {"op": op, "stack": stack}
+        if entry is not None:
+            record["entry"] = self.encode_entry(entry)
+        if index is not None:
+            record["index"] = index
+        self._put(("append", record))
+        self.ops_since_compaction += 1
+
+    def compact(self, undo_stack: List[Dict], redo_stack: List[Dict]):
+        """Queues a compaction. Stacks are copied here; encoding and writing happen on the writer thread."""
+        self._put(("compact", (list(undo_stack), list(redo_stack))))
+        self.ops_since_compaction = 1
+
+    def needs_compaction(self) -> bool:
+        return self.ops_since_compaction >= self.compact_threshold
+
+    def _put(self, item):
+        if self._closed:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer, name="HistoryJournal", daemon=True)
+            self._thread.start()
+        self._queue.put(item)
+
+    def _writer(self):
+        handle = None
+        while True:
+            kind, payload = self._queue.get()
+
+            try:
+                if kind == "stop":
+                    break
+                if kind == "append":
+                    if handle is None:
+                        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+                        handle = open(self.journal_path, "a", encoding="utf-8")
+                    handle.write(json.dumps(payload, ensure_ascii=False) + "\n")
+                    if self._queue.empty():
+                        handle.flush()
+                elif kind == "compact":
+                    if handle is not None:
+                        handle.close()
+                        handle = None
+                    self._write_snapshot(*payload)
+            except Exception as e:
+                Logger.error(f"Error writing history journal {self.journal_path}: {e}")
+            finally:
+                self._queue.task_done()
+
+        if handle is not None:
+            handle.close()
+
+    def _write_snapshot(self, undo_stack: List[Dict], redo_stack: List[Dict]):
+        record = {
+            "op": "snapshot",
+            "version": self.VERSION,
+            "undo": [self.encode_entry(e) for e in undo_stack],
+            "redo": [self.encode_entry(e) for e in redo_stack]
+        }
+        temp_path = self.journal_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(temp_path, self.journal_path)
+
+    def close(self):
+        """Writes everything queued so far and stops the writer thread."""
+        if self._thread is None or self._closed:
+            self._closed = True
+            return
+        self._queue.put(("stop", None))
+        self._thread.join(timeout=5)
+        self._closed = True
@@ -7,8 +7,18 @@ import hashlib
 import os
 
 from core.logger import Logger
+from core.tracing import Tracer, traced
+from core.memory_report import image_nbytes, images_nbytes
+from core.memory_governor import MemoryGovernor
+from core.compressed_image_cache import CompressedImageCache
 
 class ImageProcessor:
+    # State parameters that change the rendered canvas (face_center only affects icons)
+    RENDER_PARAMS = (
+        'scale', 'offset_x', 'offset_y', 'use_rembg', 'alpha_matting',
+        'alpha_matting_foreground_threshold', 'alpha_matting_background_threshold', 'alpha_matting_erode_size'
+    )
+
     def __init__(self):
         self._rembg_session = None
         self._session_lock = threading.Lock()
@@ -18,6 +28,36 @@ class ImageProcessor:
         self._render_cache = {} # Key -> Image
         self._render_cache_capacity = 50
         self._render_cache_lock = threading.Lock()
+        self._render_cache_sources = {} # Key -> source_path (for invalidation)
+        self._prefetched_renders = set() # Keys rendered ahead of time and not requested since
+        # Second tier: renders pushed out of the LRU are kept cropped + zlib-compressed.
+        # Compressing takes tens of ms, so it runs on its own thread, off the render path.
+        self._compressed_renders = CompressedImageCache()
+        # Evictions take a CompressedImageCache token under the render lock, so a queued
+        # compression of a render that was invalidated meanwhile is dropped.
+        self._compress_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="RenderCompress")
+
+        # Layer Cache (LRU)
+        # Holds the scaled (and background-removed) source layer, independent of offset.
+        # Dragging only changes offset_x/offset_y, so a hit here turns a frame into a single blit.
+        self._layer_cache = {} # Key -> Image
+        self._layer_cache_capacity = 8
+        # Entries are full-size scaled sources (a 4k source at scale 1.5 is >100 MB), so the
+        # count alone is no bound. The newest layer is kept even if it is larger than this.
+        self._layer_cache_max_bytes = 256 * 1024 * 1024
+        self._layer_cache_bytes = 0
+        self._layer_cache_lock = threading.Lock()
+        # Layers built for uncached frames (drags) go into a single slot instead: a scale drag
+        # makes a new full-size layer every frame, which would push out all the useful ones.
+        self._interaction_layer = None # (key, Image) or None
+
+        # Canvas Pool
+        # Reusable RGBA render targets per size. Only used for canvases that do NOT
+        # escape into a cache (cache_result=False); the borrower returns them via release_canvas.
+        self._canvas_pool = {} # Size -> [Image]
+        self._canvas_pool_capacity = 4 # Per size
+        self._canvas_pool_lock = threading.Lock()
+        self._governed = False # attach_governor() was called
 
     def _get_session(self):
         """Lazy loads the rembg session."""
@@ -59,6 +99,7 @@ class ImageProcessor:
             callback(result)
         self._executor.submit(task)
 
+    @traced("preprocess_image")
     def preprocess_image(self, source_path: str, params: Dict) -> Optional[Image.Image]:
         """
         Loads and applies background removal (if needed). Returns the base image for further transforms.
@@ -104,69 +145,117 @@ class ImageProcessor:
             if os.path.exists(cache_path):
                 try:
                     # Logger.info(f"Loading from cache: {cache_path}")
-                    return Image.open(cache_path).convert("RGBA")
+                    with Tracer.span("rembg_cache_load"):
+                        return Image.open(cache_path).convert("RGBA")
                 except Exception as e:
                     Logger.error(f"Error loading cache {cache_path}: {e}")
         
         # Normal Loading
         try:
-            img = Image.open(source_path).convert("RGBA")
+            with Tracer.span("decode"):
+                img = Image.open(source_path).convert("RGBA")
         except Exception as e:
             Logger.error(f"Error opening image {source_path}: {e}")
             return None
             
         # Background Removal
         if use_rembg:
-            img = self.remove_background(img, params)
+            with Tracer.span("rembg"):
+                img = self.remove_background(img, params)
             
             # Save to Cache
             try:
                 if not os.path.exists(cache_dir):
                     os.makedirs(cache_dir)
-                img.save(cache_path)
-                Logger.info(f"Saved to cache: {cache_path}")
+                with Tracer.span("rembg_cache_save"):
+                    img.save(cache_path)
+                Logger.debug(f"Saved to cache: {cache_path}")
             except Exception as e:
                 Logger.error(f"Error saving cache {cache_path}: {e}")
             
         return img
 
+    @traced("process_image")
     def process_image(self, 
                       source_path: str, 
                       params: Dict, 
                       target_size: Tuple[int, int] = (1920, 1080),
                       frame_path: Optional[str] = None,
                       preprocessed_image: Optional[Image.Image] = None,
-                      face_center: Optional[Tuple[int, int]] = None) -> Optional[Image.Image]:
+                      face_center: Optional[Tuple[int, int]] = None,
+                      cache_result: bool = True,
+                      prefetch: bool = False) -> Optional[Image.Image]:
         """
         Processes an image with the given parameters and optional frame.
         If preprocessed_image is provided, source_path and rembg params are ignored.
+
+        Images passed in and returned are shared, read-only handles (the result may be
+        a cache entry). Callers that need to draw on the result must copy it first.
+
+        If cache_result is False, the render cache is bypassed and the canvas is borrowed
+        from the pool. The caller owns it and should hand it back with release_canvas().
+
+        prefetch marks the cached result as speculative: under memory pressure it is evicted
+        before renders that were actually requested. A prefetch only takes a free layer slot and,
+        with a full render cache, pushes out older prefetched renders first, so it never
+        displaces what the editor is working with.
         """
         
-        if preprocessed_image:
-            img = preprocessed_image.copy() # Work on copy
-        else:
-            if not source_path:
-                return None
-            img = self.preprocess_image(source_path, params)
-            if not img: return None
-
         # Check Render Cache
         cache_key = self._generate_render_cache_key(source_path, params, target_size, face_center)
-        with self._render_cache_lock:
-            if cache_key in self._render_cache:
-                # Hit! Move to end
-                cached_img = self._render_cache.pop(cache_key)
-                self._render_cache[cache_key] = cached_img
-                return cached_img
-
-        # 2. Scaling
-        scale = params.get('scale', 1.0)
-        if scale != 1.0:
-            new_size = (int(img.width * scale), int(img.height * scale))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
+        if cache_result:
+            with self._render_cache_lock:
+                if cache_key in self._render_cache:
+                    # Hit! Move to end
+                    cached_img = self._render_cache.pop(cache_key)
+                    self._render_cache[cache_key] = cached_img
+                    if not prefetch:
+                        self._prefetched_renders.discard(cache_key)
+                    return cached_img
+            restored = self._restore_render(cache_key, source_path, prefetch)
+            if restored is not None:
+                return restored
+
+        # 1. Scaled Layer (Cached independently of offset)
+        layer_key = self._generate_layer_cache_key(source_path, params)
+        img = self._get_cached_layer(layer_key)
+        if img is None:
+            img = self._peek_interaction_layer(layer_key)
+        if img is None:
+            if preprocessed_image:
+                # Read-only: resize() and alpha_composite() below never mutate the input,
+                # so share it instead of copying the largest buffer on every frame.
+                img = preprocessed_image
+            else:
+                if not source_path:
+                    return None
+                img = self.preprocess_image(source_path, params)
+                if not img: return None
+
+            # 2. Scaling
+            scale = params.get('scale', 1.0)
+            if scale != 1.0:
+                new_size = (int(img.width * scale), int(img.height * scale))
+                with Tracer.span("scale"):
+                    img = img.resize(new_size, Image.Resampling.LANCZOS)
+
+            if cache_result:
+                self._store_cached_layer(layer_key, img, evict=not prefetch)
+            else:
+                with self._layer_cache_lock:
+                    self._interaction_layer = (layer_key, img)
+        elif cache_result and not prefetch and self._peek_interaction_layer(layer_key) is img:
+            # The transform settled: promote the drag layer to the LRU
+            self._store_cached_layer(layer_key, img)
+            with self._layer_cache_lock:
+                self._interaction_layer = None
             
         # 3. Canvas Composition
-        canvas = Image.new("RGBA", target_size, (0, 0, 0, 0))
+        if cache_result:
+            # Escapes into the render cache, so it can never be reused
+            canvas = Image.new("RGBA", target_size, (0, 0, 0, 0))
+        else:
+            canvas = self.acquire_canvas(target_size)
         
         cx, cy = target_size[0] // 2, target_size[1] // 2
         ix, iy = img.width // 2, img.height // 2
@@ -177,22 +266,112 @@ class ImageProcessor:
         paste_x = cx - ix + offset_x
         paste_y = cy - iy + offset_y
         
-        canvas.alpha_composite(img, (int(paste_x), int(paste_y)))
-        
-
-        
-        canvas.alpha_composite(img, (int(paste_x), int(paste_y)))
+        with Tracer.span("composite"):
+            canvas.alpha_composite(img, (int(paste_x), int(paste_y)))
         
         # Save to Render Cache
+        if cache_result:
+            self._store_render(cache_key, canvas, source_path, prefetch)
+        
+        return canvas
+
+    def _store_render(self, cache_key, canvas: Image.Image, source_path: str, prefetch: bool = False):
+        evicted = None
         with self._render_cache_lock:
             if len(self._render_cache) >= self._render_cache_capacity:
-                # Remove oldest (first item)
+                # Remove oldest (first item); a prefetch replaces other prefetches if there are any
                 first_key = next(iter(self._render_cache))
-                del self._render_cache[first_key]
+                if prefetch:
+                    first_key = next((k for k in self._render_cache if k in self._prefetched_renders), first_key)
+                evicted = self._pop_render(first_key)
             self._render_cache[cache_key] = canvas
+            self._render_cache_sources[cache_key] = source_path
+            if prefetch:
+                self._prefetched_renders.add(cache_key)
+        if evicted is not None:
+            self._demote_renders([evicted])
+        if self._governed:
+            MemoryGovernor.notify()
+
+    def _pop_render(self, key):
+        """Removes a render for demotion. Call with _render_cache_lock held."""
+        source_path = self._render_cache_sources.pop(key, None)
+        self._prefetched_renders.discard(key)
+        return key, self._render_cache.pop(key), source_path, self._compressed_renders.token(source_path)
+
+    def _demote_renders(self, evicted):
+        """Queues entries from _pop_render for the compressed tier."""
+        def task():
+            for key, img, source_path, token in evicted:
+                self._compressed_renders.put(key, img, source_path, token)
+            if self._governed:
+                MemoryGovernor.notify()
+        self._compress_executor.submit(task)
+
+    def _restore_render(self, cache_key, source_path: str, prefetch: bool = False) -> Optional[Image.Image]:
+        """Tier-2 hit: decompresses the render and moves it back into the render cache."""
+        canvas = self._compressed_renders.pop(cache_key)
+        if canvas is not None:
+            self._store_render(cache_key, canvas, source_path, prefetch)
+        return canvas
+
+    def render_preview(self, source_path: str, params: Dict, max_size: int, target_size: Tuple[int, int] = (1920, 1080)) -> Optional[Image.Image]:
+        """
+        Low-resolution process_image(): same framing, but the canvas is scaled so its longer
+        side is max_size. The source is scaled once (scale * factor) and nothing is cached,
+        so it is cheap enough for grid tiles. Safe to call from a worker thread.
+        """
+        factor = max_size / max(target_size)
+        layer_key = self._generate_layer_cache_key(source_path, params)
+        layer = self._get_cached_layer(layer_key)
+        if layer is None:
+            layer = self._peek_interaction_layer(layer_key)
+        if layer is not None:
+            scale = factor # Already scaled by params['scale']
+        else:
+            layer = self.preprocess_image(source_path, params)
+            if layer is None: return None
+            scale = params.get('scale', 1.0) * factor
+
+        new_size = (max(1, int(layer.width * scale)), max(1, int(layer.height * scale)))
+        layer = layer.resize(new_size, Image.Resampling.BILINEAR)
+
+        canvas_size = (max(1, round(target_size[0] * factor)), max(1, round(target_size[1] * factor)))
+        canvas = Image.new("RGBA", canvas_size, (0, 0, 0, 0))
+        paste_x = canvas_size[0] // 2 - layer.width // 2 + params.get('offset_x', 0) * factor
+        paste_y = canvas_size[1] // 2 - layer.height // 2 + params.get('offset_y', 0) * factor
+        canvas.alpha_composite(layer, (int(paste_x), int(paste_y)))
+        return canvas
+
+    def acquire_canvas(self, size: Tuple[int, int]) -> Image.Image:
+        """Borrows a cleared (fully transparent) RGBA canvas of the given size from the pool."""
+        size = (int(size[0]), int(size[1]))
+        canvas = None
+        with self._canvas_pool_lock:
+            free = self._canvas_pool.get(size)
+            if free:
+                canvas = free.pop()
         
+        if canvas is None:
+            return Image.new("RGBA", size, (0, 0, 0, 0))
+        
+        # Clear in place (no allocation)
+        canvas.paste((0, 0, 0, 0), (0, 0, size[0], size[1]))
         return canvas
 
+    def release_canvas(self, canvas: Optional[Image.Image]):
+        """Returns a canvas obtained from acquire_canvas (or process_image with cache_result=False)."""
+        if canvas is None or canvas.mode != "RGBA":
+            return
+        with self._canvas_pool_lock:
+            free = self._canvas_pool.setdefault(canvas.size, [])
+            if len(free) < self._canvas_pool_capacity and not any(c is canvas for c in free):
+                free.append(canvas)
+            else:
+                return
+        if self._governed:
+            MemoryGovernor.notify()
+
     def get_cached_render(self, source_path: str, params: Dict, target_size: Tuple[int, int] = (1920, 1080), face_center: Optional[Tuple[int, int]] = None) -> Optional[Image.Image]:
         """Attempts to retrieve a fully rendered image from cache."""
         cache_key = self._generate_render_cache_key(source_path, params, target_size, face_center)
@@ -201,9 +380,190 @@ class ImageProcessor:
                 # Move to end (Recently Used)
                 img = self._render_cache.pop(cache_key)
                 self._render_cache[cache_key] = img
+                self._prefetched_renders.discard(cache_key)
                 return img
+        return self._restore_render(cache_key, source_path)
+
+    def has_cached_render(self, source_path: str, params: Dict, target_size: Tuple[int, int] = (1920, 1080), face_center: Optional[Tuple[int, int]] = None) -> bool:
+        """Like get_cached_render, but doesn't count as a use (LRU order and prefetch mark stay)."""
+        cache_key = self._generate_render_cache_key(source_path, params, target_size, face_center)
+        with self._render_cache_lock:
+            if cache_key in self._render_cache:
+                return True
+        return cache_key in self._compressed_renders
+
+    def clear_caches(self):
+        """Drops all in-memory renders, layers and pooled canvases (the rembg disk cache is kept)."""
+        with self._render_cache_lock:
+            self._render_cache.clear()
+            self._render_cache_sources.clear()
+            self._prefetched_renders.clear()
+        self._compressed_renders.clear()
+        with self._layer_cache_lock:
+            self._layer_cache.clear()
+            self._layer_cache_bytes = 0
+            self._interaction_layer = None
+        with self._canvas_pool_lock:
+            self._canvas_pool.clear()
+
+    def memory_usage(self) -> Dict[str, Tuple[int, int]]:
+        """(entries, bytes) of each cache, for MemoryReport."""
+        with self._render_cache_lock:
+            render = images_nbytes(list(self._render_cache.values()))
+        with self._layer_cache_lock:
+            slot = self._interaction_layer[1] if self._interaction_layer else None
+            layer = images_nbytes(list(self._layer_cache.values()) + [slot])
+        with self._canvas_pool_lock:
+            pool = images_nbytes([c for free in self._canvas_pool.values() for c in free])
+        usage = {"render_cache": render, "layer_cache": layer, "canvas_pool": pool}
+        usage.update(self._compressed_renders.memory_usage())
+        return usage
+
+    # --- Memory governor ---
+
+    def attach_governor(self, name: str = "image_processor"):
+        """Puts the render, layer and canvas caches under MemoryGovernor's budget."""
+        MemoryGovernor.register(f"{name}.canvas_pool", MemoryGovernor.PRIORITY_POOL, self._canvas_pool_bytes, self._evict_canvas_pool)
+        MemoryGovernor.register(f"{name}.prefetched_renders", MemoryGovernor.PRIORITY_PREFETCH,
+                                lambda: self._render_bytes(prefetched=True), lambda n: self._evict_renders(n, prefetched=True))
+        MemoryGovernor.register(f"{name}.compressed_renders", MemoryGovernor.PRIORITY_COMPRESSED,
+                                self._compressed_renders.nbytes, self._compressed_renders.evict)
+        MemoryGovernor.register(f"{name}.layer_cache", MemoryGovernor.PRIORITY_LAYER, self._layer_bytes, self._evict_layers)
+        MemoryGovernor.register(f"{name}.render_cache", MemoryGovernor.PRIORITY_RENDER,
+                                lambda: self._render_bytes(prefetched=False), lambda n: self._evict_renders(n, prefetched=False))
+        self._governed = True
+
+    def _render_bytes(self, prefetched: bool) -> int:
+        with self._render_cache_lock:
+            return sum(image_nbytes(img) for key, img in self._render_cache.items() if (key in self._prefetched_renders) == prefetched)
+
+    def _layer_bytes(self) -> int:
+        with self._layer_cache_lock:
+            slot = self._interaction_layer[1] if self._interaction_layer else None
+            return self._layer_cache_bytes + image_nbytes(slot)
+
+    def _canvas_pool_bytes(self) -> int:
+        with self._canvas_pool_lock:
+            return sum(image_nbytes(c) for free in self._canvas_pool.values() for c in free)
+
+    def _evict_renders(self, nbytes: int, prefetched: bool) -> int:
+        freed = 0
+        evicted = []
+        with self._render_cache_lock:
+            keys = [k for k in self._render_cache if (k in self._prefetched_renders) == prefetched]
+            if not prefetched:
+                keys = keys[:-1] # The most recent render is the one on screen
+            for key in keys: # Oldest first
+                if freed >= nbytes:
+                    break
+                evicted.append(self._pop_render(key))
+                freed += image_nbytes(evicted[-1][1])
+        # They go down to the compressed tier, which only costs a fraction of what was freed
+        if evicted:
+            self._demote_renders(evicted)
+        return freed
+
+    def _evict_layers(self, nbytes: int) -> int:
+        freed = 0
+        with self._layer_cache_lock:
+            for key in list(self._layer_cache)[:-1]: # Keep the layer being dragged
+                if freed >= nbytes:
+                    break
+                freed += self._drop_layer(key)
+        return freed
+
+    def _evict_canvas_pool(self, nbytes: int) -> int:
+        freed = 0
+        with self._canvas_pool_lock:
+            for free in self._canvas_pool.values():
+                while free and freed < nbytes:
+                    freed += image_nbytes(free.pop())
+        return freed
+
+    def invalidate_source(self, source_path: str):
+        """Drops every cached render and layer built from source_path (file changed on disk)."""
+        with self._render_cache_lock:
+            stale = [k for k, p in self._render_cache_sources.items() if p == source_path]
+            for key in stale:
+                self._render_cache.pop(key, None)
+                del self._render_cache_sources[key]
+                self._prefetched_renders.discard(key)
+        self._compressed_renders.invalidate_source(source_path)
+        with self._layer_cache_lock:
+            for key in [k for k in self._layer_cache if k[0] == str(source_path)]:
+                self._drop_layer(key)
+            if self._interaction_layer and self._interaction_layer[0][0] == str(source_path):
+                self._interaction_layer = None
+
+    def has_cached_layer(self, source_path: str, params: Dict) -> bool:
+        """True if the scaled source layer for params is cached (process_image needs no preprocessing)."""
+        layer_key = self._generate_layer_cache_key(source_path, params)
+        with self._layer_cache_lock:
+            return layer_key in self._layer_cache or bool(self._interaction_layer and self._interaction_layer[0] == layer_key)
+
+    def _get_cached_layer(self, layer_key) -> Optional[Image.Image]:
+        """Returns the cached scaled layer for the given key (LRU touch), or None."""
+        with self._layer_cache_lock:
+            if layer_key in self._layer_cache:
+                layer = self._layer_cache.pop(layer_key)
+                self._layer_cache[layer_key] = layer
+                return layer
+        return None
+
+    def _peek_interaction_layer(self, layer_key) -> Optional[Image.Image]:
+        with self._layer_cache_lock:
+            if self._interaction_layer and self._interaction_layer[0] == layer_key:
+                return self._interaction_layer[1]
         return None
 
+    def _store_cached_layer(self, layer_key, layer: Image.Image, evict: bool = True):
+        with self._layer_cache_lock:
+            if layer_key in self._layer_cache:
+                self._drop_layer(layer_key) # Replacing an entry is always allowed
+                evict = True
+            nbytes = image_nbytes(layer)
+            if self._layer_cache_full(nbytes) and not evict:
+                return
+            while self._layer_cache_full(nbytes):
+                self._drop_layer(next(iter(self._layer_cache)))
+            self._layer_cache[layer_key] = layer
+            self._layer_cache_bytes += nbytes
+        if self._governed:
+            MemoryGovernor.notify()
+
+    def _layer_cache_full(self, nbytes: int) -> bool:
+        """True if a new layer of nbytes doesn't fit. Call with _layer_cache_lock held."""
+        return bool(self._layer_cache) and (len(self._layer_cache) >= self._layer_cache_capacity
+                                            or self._layer_cache_bytes + nbytes > self._layer_cache_max_bytes)
+
+    def _drop_layer(self, layer_key) -> int:
+        """Removes a layer and returns its size. Call with _layer_cache_lock held."""
+        nbytes = image_nbytes(self._layer_cache.pop(layer_key))
+        self._layer_cache_bytes -= nbytes
+        return nbytes
+
+    def _generate_layer_cache_key(self, source_path, params):
+        """Key for the scaled layer: everything that affects pixels, but NOT the offset."""
+        key_items = [
+            source_path,
+            self._source_mtime(source_path), # A source replaced in place gets a new key
+            params.get('scale', 1.0),
+            params.get('use_rembg'),
+            params.get('alpha_matting'),
+            params.get('alpha_matting_foreground_threshold'),
+            params.get('alpha_matting_background_threshold'),
+            params.get('alpha_matting_erode_size')
+        ]
+        return tuple(str(item) for item in key_items)
+
+    @staticmethod
+    def _source_mtime(source_path) -> int:
+        """Like the rembg disk cache: the source's mtime is part of every cache key."""
+        try:
+            return os.stat(source_path).st_mtime_ns
+        except (OSError, TypeError, ValueError):
+            return 0
+
     def _generate_render_cache_key(self, source_path, params, target_size, face_center):
         """Generates a unique key for the render cache."""
         # We need to include ALL parameters that affect the final output
@@ -213,18 +573,7 @@ class ImageProcessor:
         # It seems it doesn't use face_center for the canvas composition in the current code.
         # But let's include it if it's passed, just in case.
         
-        key_items = [
-            source_path,
-            target_size,
-            params.get('scale'),
-            params.get('offset_x'),
-            params.get('offset_y'),
-            params.get('use_rembg'),
-            params.get('alpha_matting'),
-            params.get('alpha_matting_foreground_threshold'),
-            params.get('alpha_matting_background_threshold'),
-            params.get('alpha_matting_erode_size')
-        ]
+        key_items = [source_path, self._source_mtime(source_path), target_size] + [params.get(k) for k in self.RENDER_PARAMS]
         
         # Hash it
         hasher = hashlib.md5()
@@ -232,6 +581,7 @@ class ImageProcessor:
             hasher.update(str(item).encode('utf-8'))
         return hasher.hexdigest()
 
+    @traced("create_face_icon")
     def create_face_icon(self, image: Image.Image, size: Tuple[int, int], face_center: Optional[Dict] = None, icon_scale: float = 1.0) -> Image.Image:
         """Creates a face icon (face_a, face_b) from the processed image."""
         
@@ -0,0 +1,76 @@
+import os
+import shutil
+import threading
+import concurrent.futures
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from core.logger import Logger
+
+
+class IOPool:
+    """
+    Shared thread pool for batched filesystem work (stat, read, copy).
+
+    On high-latency storage (HDD, network shares) most of the time is spent waiting,
+    so overlapping many small operations is much faster than running them one by one.
+    Results always come back in input order.
+
+    Do not call map() from inside a task running on this pool (it could deadlock).
+    """
+    MAX_WORKERS = 8
+
+    _executor = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> concurrent.futures.ThreadPoolExecutor:
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = concurrent.futures.ThreadPoolExecutor(max_workers=cls.MAX_WORKERS, thread_name_prefix="IOPool")
+            return cls._executor
+
+    @classmethod
+    def map(cls, fn: Callable, items: Iterable, default: Any = None) -> List:
+        """Runs fn over items in parallel; returns results in item order (default where fn raised)."""
+        items = list(items)
+        if len(items) <= 1:
+            return [cls._call(fn, item, default) for item in items]
+        futures = [cls.executor().submit(cls._call, fn, item, default) for item in items]
+        return [f.result() for f in futures]
+
+    @staticmethod
+    def _call(fn: Callable, item: Any, default: Any):
+        try:
+            return fn(item)
+        except FileNotFoundError as e:
+            # Expected for lazy slots / missing sources: keep it out of the normal log
+            if Logger.is_enabled(Logger.DEBUG):
+                Logger.debug(f"IOPool: {getattr(fn, '__name__', fn)}({item!r}) failed: {e}")
+            return default
+        except Exception as e:
+            Logger.warning(f"IOPool: {getattr(fn, '__name__', fn)}({item!r}) failed: {e!r}")
+            return default
+
+    @classmethod
+    def stat_many(cls, paths: Iterable[str]) -> List[Optional[os.stat_result]]:
+        """os.stat for each path (None if missing), in order."""
+        return cls.map(os.stat, paths)
+
+    @classmethod
+    def copy_files(cls, pairs: Iterable[Tuple[str, str]]) -> List[bool]:
+        """Copies (src, dst) pairs with metadata in parallel. Returns success per pair."""
+        def copy(pair):
+            shutil.copy2(pair[0], pair[1])
+            return True
+        return cls.map(copy, pairs, default=False)
+
+    @classmethod
+    def copy_tree(cls, src: str, dst: str) -> bool:
+        """Like shutil.copytree, but copies the files in parallel. Returns True if every file copied."""
+        pairs = []
+        for root, dirs, files in os.walk(src):
+            rel = os.path.relpath(root, src)
+            target_root = dst if rel == "." else os.path.join(dst, rel)
+            os.makedirs(target_root, exist_ok=True)
+            for name in files:
+                pairs.append((os.path.join(root, name), os.path.join(target_root, name)))
+        return all(cls.copy_files(pairs))
@@ -1,8 +1,67 @@
+import os
+import sys
+import queue
+import atexit
 import datetime
+import threading
+import collections
+import logging
+import logging.handlers
+from typing import List, Optional
+
+
+class _SinkHandler(logging.Handler):
+    """Runs on the QueueListener thread: console and file output, off the caller's thread."""
+    def emit(self, record):
+        if getattr(record, "flush_only", False):
+            record.written.set() # Logger.flush() marker, everything before it is out
+            return
+        if getattr(record, "console", False):
+            print(record.msg)
+        handler = Logger._file_handler
+        if handler is not None:
+            handler.handle(record) # Flushed per record (StreamHandler)
+        done = getattr(record, "written", None)
+        if done is not None:
+            done.set()
+
+    def handleError(self, record):
+        done = getattr(record, "written", None)
+        if done is not None:
+            done.set()
+        super().handleError(record)
+
 
 class Logger:
+    """
+    Process-wide logger.
+
+    log() is safe from any thread and never touches the UI: a record below `level` is
+    dropped before any formatting, everything else is appended to
+    - a bounded ring buffer of recent lines (recent()),
+    - a pending queue that the UI drains on its own schedule (drain()),
+    - the console and, once configure() was called, a rotating log file.
+    deque appends/pops are atomic, so no lock is taken on the hot path. Console and file
+    output go through a SimpleQueue to a QueueListener thread, so a slow disk never stalls
+    the Tk thread; only ERROR waits (briefly) until its line is in the file.
+    """
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+    _LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN", ERROR: "ERROR"}
+
     _instance = None
-    _listeners = []
+    level = INFO
+    console = True
+    _recent = collections.deque(maxlen=2000) # Ring buffer of formatted lines
+    _pending = collections.deque(maxlen=5000) # Lines not yet shown by the UI (oldest dropped if nobody drains)
+    _file_handler: Optional[logging.Handler] = None
+    _queue = queue.SimpleQueue() # Records for the console / file sinks
+    _listener: Optional[logging.handlers.QueueListener] = None
+    _listener_lock = threading.Lock()
+    _listener_started = False
+    ERROR_WAIT = 2.0 # Seconds an ERROR waits for its line to be written
 
     def __new__(cls):
         if cls._instance is None:
@@ -10,27 +69,142 @@ class Logger:
         return cls._instance
 
     @classmethod
-    def add_listener(cls, callback):
-        """Adds a callback function that receives log messages."""
-        cls._listeners.append(callback)
+    def configure(cls, log_file: Optional[str] = None, level=None, max_bytes: int = 1024 * 1024, backup_count: int = 3):
+        """Sets the level (int or name) and the rotating file sink. Also logs uncaught exceptions."""
+        if level is not None:
+            cls.level = cls.parse_level(level)
+        if log_file:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                previous, cls._file_handler = cls._file_handler, handler
+                if previous is not None:
+                    cls.flush() # The listener may still be writing to it
+                    previous.close()
+            except OSError as e:
+                print(f"Log file unavailable ({log_file}): {e}")
+        cls._install_excepthooks()
+
+    @classmethod
+    def parse_level(cls, level) -> int:
+        if isinstance(level, int):
+            return level
+        for value, name in cls._LEVEL_NAMES.items():
+            if str(level).upper() in (name, logging.getLevelName(value)):
+                return value
+        return cls.INFO
+
+    @classmethod
+    def is_enabled(cls, level: int) -> bool:
+        """Cheap check for callers that build expensive messages."""
+        return level >= cls.level
 
     @classmethod
-    def log(cls, message: str):
+    def log(cls, message: str, level: int = INFO):
         """Logs a message with a timestamp."""
+        if level < cls.level:
+            return
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}"
-        print(formatted_message) # Also print to console
-        for listener in cls._listeners:
-            listener(formatted_message)
+        formatted_message = f"[{timestamp}] [{cls._LEVEL_NAMES.get(level, level)}] {message}"
+        cls._recent.append(formatted_message)
+        cls._pending.append(formatted_message)
+        if cls.console or cls._file_handler is not None:
+            record = logging.LogRecord("app", level, "", 0, formatted_message, None, None)
+            record.console = cls.console # Also print to console
+            if level >= cls.ERROR:
+                record.written = threading.Event() # Errors must survive a crash
+            listener = cls._start_listener()
+            cls._queue.put(record)
+            if level >= cls.ERROR and threading.current_thread() is not listener._thread:
+                record.written.wait(cls.ERROR_WAIT)
+
+    @classmethod
+    def _start_listener(cls) -> logging.handlers.QueueListener:
+        listener = cls._listener
+        if listener is not None:
+            return listener
+        with cls._listener_lock:
+            if cls._listener is None:
+                cls._listener = logging.handlers.QueueListener(cls._queue, _SinkHandler())
+                cls._listener.start()
+                if not cls._listener_started:
+                    atexit.register(cls.shutdown)
+                    cls._listener_started = True
+            return cls._listener
+
+    @classmethod
+    def flush(cls):
+        """Waits until everything logged so far has reached the console / file."""
+        listener = cls._listener
+        if listener is None or threading.current_thread() is listener._thread:
+            return
+        marker = logging.LogRecord("app", cls.DEBUG, "", 0, "", None, None)
+        marker.flush_only = True
+        marker.written = threading.Event()
+        cls._queue.put(marker)
+        marker.written.wait(cls.ERROR_WAIT)
+
+    @classmethod
+    def shutdown(cls):
+        """Drains the queue and stops the sink thread (registered with atexit)."""
+        with cls._listener_lock:
+            listener, cls._listener = cls._listener, None
+        if listener is not None:
+            listener.stop()
+
+    @classmethod
+    def debug(cls, message: str):
+        cls.log(message, cls.DEBUG)
 
     @classmethod
     def info(cls, message: str):
-        cls.log(f"[INFO] {message}")
+        cls.log(message, cls.INFO)
 
     @classmethod
     def error(cls, message: str):
-        cls.log(f"[ERROR] {message}")
+        cls.log(message, cls.ERROR)
 
     @classmethod
     def warning(cls, message: str):
-        cls.log(f"[WARN] {message}")
+        cls.log(message, cls.WARNING)
+
+    @classmethod
+    def drain(cls, max_lines: int = 1000) -> List[str]:
+        """Pops up to max_lines pending lines (oldest first). Call from the UI thread."""
+        lines = []
+        try:
+            while len(lines) < max_lines:
+                lines.append(cls._pending.popleft())
+        except IndexError:
+            pass
+        return lines
+
+    @classmethod
+    def recent(cls, count: Optional[int] = None) -> List[str]:
+        """Most recent lines from the ring buffer (all of it by default)."""
+        lines = list(cls._recent)
+        return lines[-count:] if count else lines
+
+    @classmethod
+    def _install_excepthooks(cls):
+        previous_hook = sys.excepthook
+
+        def excepthook(exc_type, exc, tb):
+            import traceback
+            cls.error("Uncaught exception:\n" + "".join(traceback.format_exception(exc_type, exc, tb)))
+            previous_hook(exc_type, exc, tb)
+
+        previous_thread_hook = threading.excepthook
+
+        def thread_excepthook(args):
+            import traceback
+            name = args.thread.name if args.thread else "?"
+            cls.error(f"Uncaught exception in thread {name}:\n" + "".join(traceback.format_exception(args.exc_type, args.exc_value, args.exc_traceback)))
+            previous_thread_hook(args)
+
+        if getattr(sys.excepthook, "_logger_hook", False):
+            return
+        excepthook._logger_hook = True
+        sys.excepthook = excepthook
+        threading.excepthook = thread_excepthook
@@ -0,0 +1,107 @@
+import threading
+from typing import Callable, Dict, List, Tuple
+from core.logger import Logger
+
+
+class MemoryGovernor:
+    """
+    One memory ceiling shared by all image caches.
+
+    Each cache keeps its own entry limit; the governor adds a global byte budget on top.
+    A cache registers with
+
+        MemoryGovernor.register(name, priority, usage, evict)
+
+    usage() returns the bytes it currently holds, evict(nbytes) drops least-recently-used
+    entries until about nbytes were freed (or nothing is left to drop) and returns the bytes
+    actually freed. After storing something a cache calls notify(); if the total is over
+    budget, caches are asked to evict in ascending priority order, so cheap-to-recreate data
+    (pooled canvases, prefetched renders) goes before what is on screen.
+
+    notify() must not be called while holding a cache lock, since evict() takes it.
+    """
+    # Lower is evicted first
+    PRIORITY_POOL = 0 # Free canvases, pure reuse
+    PRIORITY_PREFETCH = 10 # Renders nobody has looked at yet
+    PRIORITY_THUMBNAIL = 20 # Grid tiles (cheap low-res renders)
+    PRIORITY_COMPRESSED = 25 # Compressed renders (small, cheap to restore)
+    PRIORITY_LAYER = 30 # Scaled source layers (decode + rembg + resize to rebuild)
+    PRIORITY_RENDER = 40 # Renders that were shown
+
+    budget_bytes = 1024 * 1024 * 1024
+    evicted_bytes = 0 # Total since start (for the memory report)
+    _caches: Dict[str, Tuple[int, Callable[[], int], Callable[[int], int]]] = {}
+    _lock = threading.Lock()
+    _enforce_lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, budget_mb=None):
+        if budget_mb:
+            cls.budget_bytes = int(budget_mb) * 1024 * 1024
+
+    @classmethod
+    def register(cls, name: str, priority: int, usage: Callable[[], int], evict: Callable[[int], int]):
+        """Registering the same name again replaces the old cache (e.g. a re-created frame)."""
+        with cls._lock:
+            cls._caches[name] = (priority, usage, evict)
+
+    @classmethod
+    def unregister(cls, name: str):
+        with cls._lock:
+            cls._caches.pop(name, None)
+
+    @classmethod
+    def usage(cls) -> List[Tuple[str, int, int]]:
+        """[(name, priority, bytes)] in eviction order."""
+        with cls._lock:
+            caches = sorted(cls._caches.items(), key=lambda item: item[1][0])
+        result = []
+        for name, (priority, usage, _) in caches:
+            try:
+                result.append((name, priority, usage()))
+            except Exception as e:
+                Logger.debug(f"Memory usage of {name} failed: {e}")
+        return result
+
+    @classmethod
+    def total_bytes(cls) -> int:
+        return sum(size for _, _, size in cls.usage())
+
+    @classmethod
+    def notify(cls):
+        """Call after a cache grew. Evicts across caches if the budget is exceeded."""
+        if not cls._enforce_lock.acquire(blocking=False):
+            return # Another thread is already evicting
+        try:
+            cls._enforce()
+        finally:
+            cls._enforce_lock.release()
+
+    @classmethod
+    def _enforce(cls):
+        usage = cls.usage()
+        over = sum(size for _, _, size in usage) - cls.budget_bytes
+        if over <= 0:
+            return
+        with cls._lock:
+            evictors = {name: entry[2] for name, entry in cls._caches.items()}
+        for name, _, size in usage:
+            if over <= 0:
+                break
+            if size <= 0 or name not in evictors:
+                continue
+            try:
+                freed = evictors[name](over)
+            except Exception as e:
+                Logger.error(f"Eviction in {name} failed: {e}")
+                continue
+            over -= freed
+            cls.evicted_bytes += freed
+            if freed:
+                Logger.debug(f"Memory budget: evicted {freed / (1024 * 1024):.1f} MB from {name}")
+
+    @classmethod
+    def status(cls) -> str:
+        mb = 1024 * 1024
+        return (f"Memory budget: {cls.total_bytes() / mb:.1f} / {cls.budget_bytes / mb:.0f} MB used, "
+                f"{cls.evicted_bytes / mb:.1f} MB evicted so far")
@@ -0,0 +1,148 @@
+import threading
+import collections
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from PIL import Image
+
+Usage = Dict[str, Tuple[int, int]] # name -> (entries, bytes)
+
+
+def image_nbytes(img: Optional[Image.Image]) -> int:
+    """Approximate pixel memory of a PIL image (0 for None)."""
+    if img is None:
+        return 0
+    try:
+        return img.width * img.height * len(img.getbands())
+    except Exception:
+        return 0
+
+
+def images_nbytes(images: Iterable[Optional[Image.Image]]) -> Tuple[int, int]:
+    """(count, bytes) of distinct images (an image referenced twice is counted once)."""
+    seen = {}
+    for img in images:
+        if img is not None:
+            seen[id(img)] = img
+    return len(seen), sum(image_nbytes(img) for img in seen.values())
+
+
+def photo_nbytes(photos: Iterable) -> Tuple[int, int]:
+    """(count, bytes) of ImageTk.PhotoImage objects (Tk keeps 4 bytes per pixel)."""
+    count = size = 0
+    for photo in photos:
+        if photo is None:
+            continue
+        try:
+            size += photo.width() * photo.height() * 4
+            count += 1
+        except Exception:
+            pass # Already deleted
+    return count, size
+
+
+class MemoryReport:
+    """
+    Where the memory goes: caches register a usage callback, report() walks them.
+
+        MemoryReport.register("image_processor", image_processor.memory_usage)
+        Logger.info(MemoryReport.format(MemoryReport.report()))
+
+    A usage callback returns {name: (entries, bytes)}; it is called from whatever thread asks
+    for the report, so it must take the owner's lock if it has one. Registering the same
+    name again replaces the old callback (frames are re-created on language change).
+
+    Pixel buffers are allocated by PIL/Tk outside the Python allocator, so tracemalloc does
+    not see them; the snapshots are for the Python side (dicts, history, leaked objects).
+    """
+    _sources: Dict[str, Callable[[], Usage]] = {}
+    _lock = threading.Lock()
+    _last_snapshot: Optional[tracemalloc.Snapshot] = None
+    _tk_image_counts = collections.deque(maxlen=12)
+
+    @classmethod
+    def register(cls, name: str, usage: Callable[[], Usage]):
+        with cls._lock:
+            cls._sources[name] = usage
+
+    @classmethod
+    def unregister(cls, name: str):
+        with cls._lock:
+            cls._sources.pop(name, None)
+
+    @classmethod
+    def report(cls) -> List[Tuple[str, int, int]]:
+        """[(name, entries, bytes)] for every registered cache, largest first."""
+        with cls._lock:
+            sources = list(cls._sources.items())
+        rows = []
+        for prefix, usage in sources:
+            try:
+                for name, (entries, size) in usage().items():
+                    rows.append((f"{prefix}.{name}", entries, size))
+            except Exception as e:
+                rows.append((f"{prefix} (error: {e})", -1, 0))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows
+
+    @staticmethod
+    def format(rows: List[Tuple[str, int, int]]) -> str:
+        lines = ["Memory report:"]
+        for name, entries, size in rows:
+            lines.append(f"  {name:<40} {entries:>6} entries {size / (1024 * 1024):>9.1f} MB")
+        total = sum(size for _, _, size in rows)
+        lines.append(f"  {'total':<40} {'':>14} {total / (1024 * 1024):>9.1f} MB")
+        return "\n".join(lines)
+
+    # --- tracemalloc ---
+
+    @classmethod
+    def start_tracemalloc(cls, frames: int = 5):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        cls._last_snapshot = tracemalloc.take_snapshot()
+
+    @classmethod
+    def stop_tracemalloc(cls):
+        tracemalloc.stop()
+        cls._last_snapshot = None
+
+    @classmethod
+    def snapshot_diff(cls, limit: int = 15) -> List[str]:
+        """Takes a snapshot and returns the top allocation changes since the previous one."""
+        if not tracemalloc.is_tracing():
+            return ["tracemalloc is not running."]
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        previous, cls._last_snapshot = cls._last_snapshot, snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"Python heap: {current / (1024 * 1024):.1f} MB (peak {peak / (1024 * 1024):.1f} MB)"]
+        if previous is None:
+            return lines
+        for stat in snapshot.compare_to(previous, "lineno")[:limit]:
+            lines.append(f"  {stat.size_diff / 1024:+10.1f} KB {stat.count_diff:+7d} blocks  {stat.traceback[0]}")
+        return lines
+
+    # --- Tk images ---
+
+    @staticmethod
+    def tk_image_count(widget) -> int:
+        """Number of images (PhotoImage etc.) alive in the Tcl interpreter."""
+        return len(widget.tk.call("image", "names"))
+
+    @classmethod
+    def check_tk_images(cls, widget, window: int = 6, min_growth: int = 20) -> Optional[str]:
+        """
+        Records the current Tcl image count; call periodically. Returns a warning when the
+        count rose at every one of the last `window` checks by at least `min_growth` overall
+        (caches level off, leaks don't).
+        """
+        counts = cls._tk_image_counts
+        counts.append(cls.tk_image_count(widget))
+        if len(counts) < window:
+            return None
+        recent = list(counts)[-window:]
+        if all(b > a for a, b in zip(recent, recent[1:])) and recent[-1] - recent[0] >= min_growth:
+            return f"Tk image count keeps growing: {' -> '.join(str(c) for c in recent)}"
+        return None
@@ -0,0 +1,160 @@
+import os
+import json
+import shutil
+import threading
+import time
+from typing import Dict, Optional
+from core.logger import Logger
+
+
+class PersistenceService:
+    """
+    Single-writer, write-behind store for project_data.json files.
+
+    save() encodes the data on the calling thread (cheap, and a consistent snapshot) and
+    marks the face dirty. One background thread writes each dirty face once it has been
+    quiet for `debounce` seconds, so bursts of saves collapse into one write. Files are
+    written to a temp file and renamed into place, so a crash never leaves a torn JSON.
+    Only the writer thread touches the files; flush() just makes it skip the debounce.
+    A failed write is logged and remembered per face (last_error) until the next
+    successful one.
+    """
+    FILENAME = "project_data.json"
+
+    def __init__(self, debounce: float = 0.5):
+        self.debounce = debounce
+        self._pending: Dict[str, tuple] = {} # face_dir -> (json_text, last_change_time)
+        self._backed_up = set() # face_dirs whose .bak was refreshed this session
+        self._written_mtimes: Dict[str, int] = {} # face_dir -> mtime of our last write
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._writing = None # face_dir currently being written (for flush)
+        self._flushing = 0 # Number of flush() calls waiting; the writer ignores the debounce meanwhile
+        self._errors: Dict[str, str] = {} # face_dir -> error of the last failed write
+        self._stopped = False
+        self._thread = threading.Thread(target=self._writer, name="PersistenceService", daemon=True)
+        self._thread.start()
+
+    def save(self, face_dir: str, data: Dict):
+        """Queues data to be written to face_dir/project_data.json."""
+        # Remove internal keys before saving
+        save_data = {k: v for k, v in data.items() if not k.startswith('_')}
+        text = json.dumps(save_data, indent=4, ensure_ascii=False)
+        with self._lock:
+            self._pending[face_dir] = (text, time.monotonic())
+            self._wake.notify_all()
+
+    def pending_data(self, face_dir: str) -> Optional[Dict]:
+        """Returns not-yet-written data for face_dir (newer than what is on disk), or None."""
+        with self._lock:
+            item = self._pending.get(face_dir)
+        if item is None:
+            return None
+        return json.loads(item[0])
+
+    def is_own_write(self, face_dir: str) -> bool:
+        """True if project_data.json on disk is exactly the file we last wrote (not an external edit)."""
+        try:
+            mtime = os.stat(os.path.join(face_dir, self.FILENAME)).st_mtime_ns
+        except OSError:
+            return False
+        return self._written_mtimes.get(face_dir) == mtime
+
+    def last_error(self, face_dir: str) -> Optional[str]:
+        """Error of the last write to face_dir if it failed (None once a write succeeds)."""
+        with self._lock:
+            return self._errors.get(face_dir)
+
+    def discard(self, face_dir: str):
+        """Drops a pending write (e.g. the face folder was moved to trash)."""
+        with self._lock:
+            self._pending.pop(face_dir, None)
+
+    def flush(self, face_dir: Optional[str] = None) -> bool:
+        """
+        Has the writer thread write all pending data now and waits for it. Returns False if
+        a write failed (only face_dir's write counts if given).
+        """
+        with self._lock:
+            dirs = [face_dir] if face_dir else list(self._pending)
+            if self._writing is not None and not face_dir:
+                dirs.append(self._writing)
+            self._flushing += 1
+            self._wake.notify_all()
+            try:
+                while (self._pending or self._writing is not None) and self._thread.is_alive():
+                    self._wake.wait(0.1)
+            finally:
+                self._flushing -= 1
+            # Left over only if the writer has stopped, so nothing can race with us any more
+            items = list(self._pending.items())
+            self._pending.clear()
+        for item_dir, (text, _) in items:
+            self._write(item_dir, text)
+        with self._lock:
+            return not any(d in self._errors for d in dirs)
+
+    def stop(self):
+        self.flush()
+        with self._lock:
+            self._stopped = True
+            self._wake.notify()
+        self._thread.join(timeout=5)
+
+    def _writer(self):
+        while True:
+            with self._lock:
+                while True:
+                    if self._stopped:
+                        return
+                    now = time.monotonic()
+                    ready = [d for d, (_, t) in self._pending.items() if self._flushing or now - t >= self.debounce]
+                    if ready:
+                        face_dir = ready[0]
+                        text, _ = self._pending.pop(face_dir)
+                        self._writing = face_dir
+                        break
+                    if self._pending:
+                        oldest = min(t for _, t in self._pending.values())
+                        self._wake.wait(max(0.01, self.debounce - (now - oldest)))
+                    else:
+                        self._wake.wait()
+            try:
+                self._write(face_dir, text)
+            finally:
+                with self._lock:
+                    self._writing = None
+                    self._wake.notify_all()
+
+    def _write(self, face_dir: str, text: str) -> bool:
+        if not os.path.exists(face_dir):
+            Logger.warning(f"Save skipped: Directory not found: {face_dir}")
+            self._set_error(face_dir, "directory not found")
+            return False
+
+        json_path = os.path.join(face_dir, self.FILENAME)
+        bak_path = json_path + ".bak"
+        temp_path = json_path + ".tmp"
+        try:
+            # Backup once per session (the rename below is atomic, so per-write copies are not needed)
+            if face_dir not in self._backed_up and os.path.exists(json_path):
+                shutil.copy2(json_path, bak_path)
+            self._backed_up.add(face_dir)
+
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, json_path)
+            self._written_mtimes[face_dir] = os.stat(json_path).st_mtime_ns
+            self._set_error(face_dir, None)
+            return True
+        except Exception as e:
+            Logger.error(f"Error saving {json_path}: {e}")
+            self._set_error(face_dir, str(e))
+            return False
+
+    def _set_error(self, face_dir: str, error: Optional[str]):
+        with self._lock:
+            if error is None:
+                self._errors.pop(face_dir, None)
+            else:
+                self._errors[face_dir] = error
@@ -0,0 +1,79 @@
+import copy
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from core.logger import Logger
+
+
+class RenderPrefetcher:
+    """
+    Low-priority background renderer that warms the ImageProcessor caches.
+
+    The editor schedules the renders it expects to need next (other states of the open
+    character, the normal state of its neighbours in the list). One thread works through
+    them in order, but only once there has been no activity for `idle_delay` seconds and
+    is_busy() is False, so it never competes with an interactive render. Renders that are
+    already cached are skipped. schedule() replaces the queue, so stale jobs are dropped.
+    """
+
+    def __init__(self, image_processor, idle_delay: float = 0.4, is_busy: Optional[Callable[[], bool]] = None):
+        self.image_processor = image_processor
+        self.idle_delay = idle_delay
+        self.is_busy = is_busy
+        self.target_size = (1920, 1080)
+        self._jobs: List[Tuple[str, Dict]] = [] # (source_path, params), highest priority first
+        self._last_activity = 0.0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="RenderPrefetcher", daemon=True)
+        self._thread.start()
+
+    def schedule(self, jobs: List[Tuple[str, Dict]]):
+        """Replaces the queue. params are copied, so callers may keep editing them."""
+        jobs = [(path, copy.deepcopy(params)) for path, params in jobs if path and params]
+        with self._cond:
+            self._jobs = jobs
+            self._cond.notify()
+
+    def cancel(self):
+        with self._cond:
+            self._jobs = []
+
+    def notify_activity(self):
+        """Postpones prefetching (call on user interaction / interactive renders)."""
+        self._last_activity = time.monotonic()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._jobs = []
+            self._cond.notify()
+        self._thread.join(timeout=2)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped and not self._jobs:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+
+            # Pause while the user is active or an interactive render is pending
+            wait = self._last_activity + self.idle_delay - time.monotonic()
+            if wait > 0 or (self.is_busy and self.is_busy()):
+                time.sleep(max(wait, 0.05))
+                continue
+
+            with self._cond:
+                if not self._jobs:
+                    continue
+                source_path, params = self._jobs.pop(0)
+            self._prefetch(source_path, params)
+
+    def _prefetch(self, source_path: str, params: Dict):
+        if self.image_processor.has_cached_render(source_path, params, self.target_size):
+            return
+        try:
+            self.image_processor.process_image(source_path, params, self.target_size, prefetch=True)
+        except Exception as e:
+            Logger.warning(f"Prefetch failed for {source_path}: {e}")
@@ -0,0 +1,145 @@
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Optional, Tuple
+from PIL import Image
+from core.logger import Logger
+from core.memory_report import image_nbytes, images_nbytes
+from core.memory_governor import MemoryGovernor
+
+
+class ThumbnailCache:
+    """
+    Pre-scaled thumbnails keyed by (path, mtime, size), persisted in one file.
+
+    Thumbnails are kept in memory as small RGBA images. The cache file stores them as raw
+    zlib-compressed pixels, so a cold start only reads one file instead of opening and
+    decoding every face_a.png. An entry whose source mtime or size changed is reloaded.
+    Safe to use from worker threads.
+    """
+    MAGIC = b"FTC1"
+    SIZE = (48, 48)
+
+    def __init__(self, cache_path: str, size: Tuple[int, int] = SIZE):
+        self.path = cache_path
+        self.size = size
+        self._entries: Dict[str, Tuple[int, int, Image.Image]] = {} # path -> (mtime_ns, file size, thumb)
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._governed = False
+        self.load()
+
+    # --- Lookup ---
+
+    def get(self, path: str) -> Optional[Image.Image]:
+        """Returns the thumbnail for path (None if missing/unreadable). Decodes on a miss."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+
+        try:
+            with Image.open(path) as img:
+                thumb = img.convert("RGBA").resize(self.size, Image.Resampling.LANCZOS)
+        except Exception as e:
+            Logger.error(f"Failed to load thumbnail {path}: {e}")
+            return None
+
+        with self._lock:
+            self._entries[path] = (st.st_mtime_ns, st.st_size, thumb)
+            self._dirty = True
+        if self._governed:
+            MemoryGovernor.notify()
+        return thumb
+
+    def invalidate(self, path: str):
+        """Forgets path, so the next get() decodes it even if mtime and size look unchanged."""
+        with self._lock:
+            if self._entries.pop(path, None) is not None:
+                self._dirty = True
+
+    def memory_usage(self) -> Dict[str, Tuple[int, int]]:
+        with self._lock:
+            return {"thumbnails": images_nbytes([entry[2] for entry in self._entries.values()])}
+
+    def attach_governor(self, name: str = "card_thumbnails"):
+        MemoryGovernor.register(name, MemoryGovernor.PRIORITY_THUMBNAIL, self._bytes, self._evict)
+        self._governed = True
+
+    def _bytes(self) -> int:
+        with self._lock:
+            return sum(image_nbytes(entry[2]) for entry in self._entries.values())
+
+    def _evict(self, nbytes: int) -> int:
+        # Oldest first. Evicted thumbnails are decoded again on the next get() (and drop out
+        # of the cache file at the next save)
+        freed = 0
+        with self._lock:
+            for path in list(self._entries):
+                if freed >= nbytes:
+                    break
+                freed += image_nbytes(self._entries.pop(path)[2])
+        return freed
+
+    # --- Persistence ---
+    # Layout: MAGIC, then per entry:
+    #   path length (H), path utf-8, mtime_ns (q), file size (q), width (H), height (H),
+    #   data length (I), zlib(RGBA bytes)
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        entries = {}
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            if data[:4] != self.MAGIC:
+                raise ValueError("bad header")
+            pos = 4
+            while pos < len(data):
+                (path_len,) = struct.unpack_from("<H", data, pos)
+                pos += 2
+                path = data[pos:pos + path_len].decode("utf-8")
+                pos += path_len
+                mtime, file_size, w, h, data_len = struct.unpack_from("<qqHHI", data, pos)
+                pos += struct.calcsize("<qqHHI")
+                pixels = zlib.decompress(data[pos:pos + data_len])
+                pos += data_len
+                if (w, h) == self.size:
+                    entries[path] = (mtime, file_size, Image.frombytes("RGBA", (w, h), pixels))
+        except Exception as e:
+            Logger.warning(f"Ignoring unreadable thumbnail cache {self.path}: {e}")
+            entries = {}
+        with self._lock:
+            self._entries = entries
+
+    def save(self):
+        """Writes the cache file if anything changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            items = list(self._entries.items())
+            self._dirty = False
+
+        chunks = [self.MAGIC]
+        for path, (mtime, file_size, thumb) in items:
+            encoded = path.encode("utf-8")
+            # Level 1: the data is tiny and this runs on exit/refresh
+            pixels = zlib.compress(thumb.tobytes(), 1)
+            chunks.append(struct.pack("<H", len(encoded)))
+            chunks.append(encoded)
+            chunks.append(struct.pack("<qqHHI", mtime, file_size, thumb.width, thumb.height, len(pixels)))
+            chunks.append(pixels)
+
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(b"".join(chunks))
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            Logger.error(f"Error saving thumbnail cache {self.path}: {e}")
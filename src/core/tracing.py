@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import threading
+import collections
+import functools
+from typing import Dict, List, Optional
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: Optional[Dict]):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        Tracer._record(self.name, self.start, end, self.args)
+        return False
+
+
+class Tracer:
+    """
+    Lightweight span tracing, exported as Chrome / Perfetto trace JSON.
+
+        with Tracer.span("process_image", size="1920x1080"):
+            ...
+
+    Off by default: span() then returns a shared no-op context manager, so
+    instrumentation can stay in hot paths. start() begins collecting (into a bounded
+    buffer), stop() ends it, export_chrome_trace() writes the file that chrome://tracing
+    or ui.perfetto.dev can open.
+    """
+    enabled = False
+    _events = collections.deque(maxlen=200000) # (name, tid, start_ns, end_ns, args)
+    _thread_names: Dict[int, str] = {}
+    _origin_ns = time.perf_counter_ns()
+
+    @classmethod
+    def start(cls):
+        cls.clear()
+        cls.enabled = True
+
+    @classmethod
+    def stop(cls):
+        cls.enabled = False
+
+    @classmethod
+    def clear(cls):
+        cls._events.clear()
+        cls._thread_names.clear()
+        cls._origin_ns = time.perf_counter_ns()
+
+    @classmethod
+    def span(cls, name: str, **args):
+        if not cls.enabled:
+            return _NULL_SPAN
+        return _Span(name, args or None)
+
+    @classmethod
+    def _record(cls, name: str, start_ns: int, end_ns: int, args: Optional[Dict]):
+        if not cls.enabled:
+            return
+        tid = threading.get_ident()
+        if tid not in cls._thread_names:
+            cls._thread_names[tid] = threading.current_thread().name
+        cls._events.append((name, tid, start_ns, end_ns, args))
+
+    @classmethod
+    def events(cls) -> List[Dict]:
+        """Collected spans as Chrome trace events (complete 'X' events, microseconds)."""
+        pid = os.getpid()
+        result = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(cls._thread_names.items())
+        ]
+        for name, tid, start_ns, end_ns, args in list(cls._events):
+            event = {
+                "name": name,
+                "ph": "X",
+                "pid": pid,
+                "tid": tid,
+                "ts": (start_ns - cls._origin_ns) / 1000.0,
+                "dur": (end_ns - start_ns) / 1000.0,
+            }
+            if args:
+                event["args"] = {k: str(v) for k, v in args.items()}
+            result.append(event)
+        return result
+
+    @classmethod
+    def export_chrome_trace(cls, path: str) -> int:
+        """Writes the collected spans to path. Returns the number of spans."""
+        events = cls.events()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return sum(1 for e in events if e["ph"] == "X")
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of Tracer.span (span name defaults to the function's qualified name)."""
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not Tracer.enabled:
+                return fn(*args, **kwargs)
+            with Tracer.span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
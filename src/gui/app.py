@@ -1,8 +1,13 @@
 import customtkinter as ctk
 import os
 import tkinter as tk
+import tracemalloc
 from core.face_manager import FaceManager
 from core.image_processor import ImageProcessor
+from core.fs_watcher import LibraryWatcher
+from core.logger import Logger
+from core.memory_report import MemoryReport
+from core.memory_governor import MemoryGovernor
 from core.localization import loc
 
 try:
@@ -40,6 +45,17 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
         self.face_manager = FaceManager(base_path)
         self.face_manager.on_history_change = self.update_history_buttons
         self.image_processor = ImageProcessor()
+        self.image_processor.attach_governor()
+        self.face_manager.thumbnails.attach_governor()
+        MemoryReport.register("image_processor", self.image_processor.memory_usage)
+        MemoryReport.register("face_manager", self.face_manager.memory_usage)
+        
+        # Watch the library for external changes (game, artists, other tools)
+        # Callbacks arrive on the watcher thread -> marshal to Tk
+        self.library_watcher = LibraryWatcher(base_path)
+        self.library_watcher.on_slot_changed = lambda d: self.after(0, lambda: self._on_slot_changed(d))
+        self.library_watcher.on_source_changed = lambda f, p: self.after(0, lambda: self._on_source_changed(f, p))
+        self.library_watcher.start()
         
         # Grid Layout
         self.grid_columnconfigure(1, weight=1)
@@ -165,8 +181,12 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
         self.editor_panel = EditorPanelFrame(self, self.face_manager, self.image_processor)
         self.editor_panel.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
         
+        # Re-registering replaces the callbacks of the frames destroyed on language change
+        MemoryReport.register("editor", self.editor_panel.memory_usage)
+        MemoryReport.register("character_list", self.character_list.memory_usage)
+        
         # Bind events
-        self.character_list.set_on_select(self.editor_panel.load_character)
+        self.character_list.set_on_select(self._on_character_selected)
         self.editor_panel.set_on_update(self.character_list.update_card)
         
         from core.logger import Logger
@@ -200,8 +220,11 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
         self.log_textbox = ctk.CTkTextbox(self, height=100, state="disabled")
         self.log_textbox.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 10))
         
-        # Subscribe to Logger
-        Logger.add_listener(self.append_log)
+        # Logger is drained in batches on the Tk thread (log() itself never touches widgets)
+        # Lines logged before the UI existed are still pending and show up on the first flush
+        if getattr(self, '_log_flush_timer', None):
+            self.after_cancel(self._log_flush_timer)
+        self._flush_log()
         Logger.info("Application started.")
         
         # Bind Undo
@@ -209,6 +232,54 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
         self.bind("<Control-z>", self.undo_action)
         self.bind("<Control-y>", self.redo_action)
         self.bind("<Control-Shift-z>", self.redo_action) # Alternative Redo
+        
+        # Performance trace (start / stop + export)
+        self.bind("<Control-Shift-T>", self.toggle_trace)
+        
+        # Memory report (+ tracemalloc diff from the second press on) and Tk image leak watch
+        self.bind("<Control-Shift-M>", self.show_memory_report)
+        if getattr(self, '_memory_check_timer', None):
+            self.after_cancel(self._memory_check_timer)
+        self._memory_check_timer = self.after(self.MEMORY_CHECK_INTERVAL, self._check_memory)
+
+    MEMORY_CHECK_INTERVAL = 60000 # ms
+
+    def show_memory_report(self, event=None):
+        """Ctrl+Shift+M: logs cache sizes and the Tk image count. The first press also starts
+        tracemalloc; later presses log what grew on the Python heap since the previous press."""
+        Logger.info(MemoryReport.format(MemoryReport.report()))
+        Logger.info(f"Tk images: {MemoryReport.tk_image_count(self)}")
+        Logger.info(MemoryGovernor.status())
+        if tracemalloc.is_tracing():
+            Logger.info("\n".join(MemoryReport.snapshot_diff()))
+        else:
+            MemoryReport.start_tracemalloc()
+            Logger.info("tracemalloc started; press Ctrl+Shift+M again to see what grew.")
+
+    def _check_memory(self):
+        try:
+            warning = MemoryReport.check_tk_images(self)
+            if warning:
+                Logger.warning(warning)
+        except Exception as e:
+            Logger.debug(f"Memory check failed: {e}")
+        self._memory_check_timer = self.after(self.MEMORY_CHECK_INTERVAL, self._check_memory)
+
+    def toggle_trace(self, event=None):
+        """Ctrl+Shift+T: starts collecting spans; pressing again writes logs/trace_*.json (Chrome/Perfetto)."""
+        from core.tracing import Tracer
+        import datetime
+        if not Tracer.enabled:
+            Tracer.start()
+            Logger.info("Performance trace started (Ctrl+Shift+T to stop).")
+            return
+        Tracer.stop()
+        path = os.path.join("logs", datetime.datetime.now().strftime("trace_%Y%m%d_%H%M%S.json"))
+        try:
+            count = Tracer.export_chrome_trace(path)
+            Logger.info(f"Performance trace written: {os.path.abspath(path)} ({count} spans)")
+        except OSError as e:
+            Logger.error(f"Failed to write trace {path}: {e}")
 
     def undo_action(self, event=None):
         # Check if focus is on a text widget (Entry, Text)
@@ -241,8 +312,30 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
                 # Dictionary means face data restored
                 self.character_list.refresh() # Refresh list to show changes
                 # If the restored data matches the currently edited face, reload it
+                # (with the dict the rescan left in face_manager.faces)
                 if self.editor_panel.current_face and self.editor_panel.current_face.get('_path') == restored_data.get('_path'):
-                    self.editor_panel.load_character(restored_data)
+                    self.editor_panel.load_character(self.face_manager.find_face(restored_data.get('_path')) or restored_data)
+
+    def _on_character_selected(self, face_data):
+        # Sources of the open face are watched file-by-file
+        self.library_watcher.focus(face_data.get('_path') if face_data else None)
+        # Neighbours in the list are prefetched once the editor is idle
+        self.editor_panel.prefetch_neighbors = self.character_list.neighbors(face_data) if face_data else []
+        self.editor_panel.load_character(face_data)
+
+    def _on_slot_changed(self, dirname):
+        face = self.face_manager.reload_slot(dirname)
+        if not face:
+            return
+        self.character_list.update_card(face)
+        current = self.editor_panel.current_face
+        if current and current.get('_path') == face.get('_path'):
+            self.editor_panel.load_character(face)
+
+    def _on_source_changed(self, face_dir, source_path):
+        self.face_manager.invalidate_source_index(face_dir)
+        self.image_processor.invalidate_source(source_path)
+        self.editor_panel.on_source_changed(source_path)
 
     def update_history_buttons(self):
         if hasattr(self, 'btn_undo'):
@@ -250,12 +343,35 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
         if hasattr(self, 'btn_redo'):
             self.btn_redo.configure(state="normal" if self.face_manager.can_redo else "disabled")
 
+    LOG_FLUSH_INTERVAL = 150 # ms
+    LOG_MAX_LINES = 2000 # Lines kept in the log box
+
     def append_log(self, message):
+        self.append_log_lines([message])
+
+    def append_log_lines(self, lines):
+        """Inserts a batch of lines with a single insert (and trims old ones)."""
+        if not lines: return
         self.log_textbox.configure(state="normal")
-        self.log_textbox.insert("end", message + "\n")
+        self.log_textbox.insert("end", "\n".join(lines) + "\n")
+        line_count = int(self.log_textbox.index("end-1c").split(".")[0])
+        if line_count > self.LOG_MAX_LINES:
+            self.log_textbox.delete("1.0", f"{line_count - self.LOG_MAX_LINES}.0")
         self.log_textbox.see("end")
         self.log_textbox.configure(state="disabled")
 
+    def _flush_log(self):
+        try:
+            self.append_log_lines(Logger.drain())
+        except Exception:
+            pass # Log box destroyed (language change re-creates it)
+        self._log_flush_timer = self.after(self.LOG_FLUSH_INTERVAL, self._flush_log)
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        # Exceptions in Tk callbacks go to the log file too
+        import traceback
+        Logger.error("Exception in Tk callback:\n" + "".join(traceback.format_exception(exc_type, exc, tb)))
+
     def open_face_folder(self):
         from core.logger import Logger
         path = self.config.get("last_open_path")
@@ -286,7 +402,7 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
         if hasattr(self, 'character_list') and self.character_list:
             self.character_list.destroy()
         if hasattr(self, 'editor_panel') and self.editor_panel:
-            self.editor_panel.destroy()
+            self.editor_panel.destroy() # Also stops its prefetcher and grid tile thread
         if hasattr(self, 'footer_frame') and self.footer_frame:
             self.footer_frame.destroy()
             
@@ -304,6 +420,12 @@ class App(ctk.CTk, TkinterDnD.DnDWrapper):
 
     def on_closing(self):
         self.save_config()
+        if hasattr(self, 'library_watcher') and self.library_watcher:
+            self.library_watcher.stop()
+        if hasattr(self, 'editor_panel') and self.editor_panel:
+            self.editor_panel.prefetcher.stop()
+        if hasattr(self, 'face_manager') and self.face_manager:
+            self.face_manager.shutdown()
         self.destroy()
 
     def show_dimmer(self):
@@ -6,13 +6,29 @@ import tkinter
 from core.localization import loc
 from gui.fonts import get_ui_font_family
 from core.logger import Logger
+from core.io_pool import IOPool
+
+class CharacterListFrame(ctk.CTkFrame):
+    """
+    Virtualized list of face slots.
+
+    Only enough CharacterCard rows to fill the viewport are created. They live as
+    windows on a Canvas, and on scroll they are moved and re-filled with the faces that
+    came into view, so refresh() just swaps the data instead of rebuilding 100 widgets.
+    """
+    ROW_HEIGHT = 70 # card height (60) + vertical padding
+    ROW_PAD = 5
 
-class CharacterListFrame(ctk.CTkScrollableFrame):
     def __init__(self, master, face_manager: FaceManager, **kwargs):
-        super().__init__(master, label_text=loc.get("characters"), **kwargs)
+        super().__init__(master, **kwargs)
         self.face_manager = face_manager
         self.on_select_callback = None
-        self.cards = []
+        self.faces = [] # all slots, in list order
+        self.thumbs = {} # _dirname -> PIL thumbnail (None = no image)
+        self._thumb_generation = 0 # bumped on refresh so late results of an old scan are dropped
+        self._thumbs_outstanding = 0
+        self.cards = [] # recycled row widgets (viewport sized)
+        self._card_windows = [] # canvas window id per card
         self.selected_faces = []
         
         # Drag state
@@ -23,50 +39,179 @@ class CharacterListFrame(ctk.CTkScrollableFrame):
         # Clipboard
         self.clipboard_data = None
 
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.lbl_title = ctk.CTkLabel(self, text=loc.get("characters"))
+        self.lbl_title.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(5, 0))
+
+        bg = self._apply_appearance_mode(self._fg_color)
+        self.canvas = tkinter.Canvas(self, highlightthickness=0, bd=0, bg=bg, yscrollincrement=10)
+        self.canvas.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        self._bind_wheel(self.canvas)
+
+        # Register D&D (External files)
+        try:
+            from tkinterdnd2 import DND_FILES
+            for widget in (self, self.canvas):
+                widget.drop_target_register(DND_FILES)
+                widget.dnd_bind('<<Drop>>', self.on_drop)
+        except Exception as e:
+            Logger.error(f"D&D setup failed: {e}")
+
         self.refresh()
 
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        self.canvas.configure(bg=self._apply_appearance_mode(self._fg_color))
+
     def set_on_select(self, callback):
         self.on_select_callback = callback
 
     def refresh(self):
-        # Clear existing
-        for widget in self.winfo_children():
-            widget.destroy()
-        self.cards = []
         self.selected_faces = [] 
+        self.faces = self.face_manager.scan_faces()
         
-        faces = self.face_manager.scan_faces()
-        for face in faces:
-            card = CharacterCard(self, face)
-            card.pack(fill="x", pady=5, padx=5)
-            # Bind click and drag
-            self._bind_events(card, face)
-            self.cards.append(card)
-            
-        # Add "New" button at bottom -> Removed as per request (Slot management)
-        # add_btn = ctk.CTkButton(self, text=loc.get("new_character"), command=self.add_character)
-        # add_btn.pack(pady=10)
+        # Rows appear right away with placeholders; thumbnails arrive asynchronously
+        self._thumb_generation += 1
+        self.thumbs = {}
         
-        # Register D&D (External files)
+        # Add "New" button at bottom -> Removed as per request (Slot management)
+
+        self._update_scrollregion()
+        # scan_faces() updates the dicts in place (as do paste, merge and undo), so the rows
+        # may hold the same objects with new content: refill them all
+        self._update_rows(force=True)
+
+        # Viewport first, then the rest of the list
+        first = self._first_visible_index()
+        self._request_thumbnails(self.faces[first:] + self.faces[:first])
+
+    # --- Async thumbnails ---
+
+    def _request_thumbnails(self, faces, fresh_path=False):
+        """Decodes thumbnails on the I/O pool (in the given order) and attaches them via after()."""
+        cache = self.face_manager.thumbnails
+        generation = self._thumb_generation
+        self._thumbs_outstanding += len(faces)
+        for face in faces:
+            if fresh_path:
+                # face_a.png may have just been exported, so don't trust a cached path here
+                face = {k: v for k, v in face.items() if k != '_thumb_path'}
+            IOPool.executor().submit(self._load_thumbnail_worker, face, cache, generation, fresh_path)
+
+    def _load_thumbnail_worker(self, face, cache, generation, fresh=False):
         try:
-            from tkinterdnd2 import DND_FILES
-            self.drop_target_register(DND_FILES)
-            self.dnd_bind('<<Drop>>', self.on_drop)
-        except Exception as e:
-            Logger.error(f"D&D setup failed: {e}")
+            if fresh:
+                # A re-export can keep mtime and size (coarse timestamps), so decode again
+                cache.invalidate(find_thumbnail_path(face))
+            thumb = load_card_thumbnail(face, cache)
+        except Exception:
+            thumb = None
+        try:
+            self.after(0, self._on_thumbnail_loaded, face.get('_dirname'), thumb, generation)
+        except RuntimeError:
+            pass # Window closed
 
-    def _bind_events(self, widget, face):
+    def _on_thumbnail_loaded(self, dirname, thumb, generation):
+        self._thumbs_outstanding -= 1
+        if self._thumbs_outstanding == 0:
+            # Persist newly decoded thumbnails off the Tk thread
+            IOPool.executor().submit(self.face_manager.thumbnails.save)
+        if generation != self._thumb_generation:
+            return
+        self.thumbs[dirname] = thumb
+        for card in self.cards:
+            if card.face_data is not None and card.face_data.get('_dirname') == dirname:
+                card.set_thumbnail(thumb)
+
+    # --- Virtualization ---
+
+    def _on_canvas_configure(self, event):
+        # Keep rows as wide as the viewport and make sure there are enough of them
+        for window in self._card_windows:
+            self.canvas.itemconfigure(window, width=max(1, event.width - 2 * self.ROW_PAD))
+        self._ensure_rows(event.height)
+        self._update_scrollregion()
+        self._update_rows()
+
+    def _ensure_rows(self, height):
+        # One extra row for the partially visible one at the bottom
+        needed = height // self.ROW_HEIGHT + 2
+        width = max(1, self.canvas.winfo_width() - 2 * self.ROW_PAD)
+        while len(self.cards) < needed:
+            card = CharacterCard(self.canvas)
+            window = self.canvas.create_window(self.ROW_PAD, -self.ROW_HEIGHT, anchor="nw", window=card, width=width, height=self.ROW_HEIGHT - 2 * self.ROW_PAD)
+            self._bind_events(card, card)
+            self.cards.append(card)
+            self._card_windows.append(window)
+
+    def _update_scrollregion(self):
+        total = max(len(self.faces) * self.ROW_HEIGHT, self.canvas.winfo_height())
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), total))
+
+    def _first_visible_index(self):
+        return max(0, int(self.canvas.canvasy(0)) // self.ROW_HEIGHT)
+
+    def _update_rows(self, force=False):
+        """
+        Places the pooled rows on the visible slots and fills them with their faces.
+        Rows already showing their face are kept as they are unless force is set.
+        """
+        first = self._first_visible_index()
+        for i, (card, window) in enumerate(zip(self.cards, self._card_windows)):
+            index = first + i
+            if index < len(self.faces):
+                face = self.faces[index]
+                self.canvas.coords(window, self.ROW_PAD, index * self.ROW_HEIGHT + self.ROW_PAD)
+                self.canvas.itemconfigure(window, state="normal")
+                if force or card.face_data is not face:
+                    dirname = face.get('_dirname')
+                    card.set_face(face, self.thumbs.get(dirname), loading=dirname not in self.thumbs)
+                card.set_selected(face in self.selected_faces)
+            else:
+                self.canvas.itemconfigure(window, state="hidden")
+                card.face_data = None
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self._update_rows()
+
+    def _on_mousewheel(self, event):
+        if event.num == 4:
+            delta = -1
+        elif event.num == 5:
+            delta = 1
+        else:
+            delta = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(delta * 3, "units")
+        self._update_rows()
+        return "break"
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_mousewheel, add="+")
+        widget.bind("<Button-4>", self._on_mousewheel, add="+")
+        widget.bind("<Button-5>", self._on_mousewheel, add="+")
+
+    def _bind_events(self, widget, card):
+        # Rows are recycled, so handlers read the card's current face at event time
         # Click (Selection)
-        widget.bind("<Button-1>", lambda e, f=face: self.on_card_click(f, e))
+        widget.bind("<Button-1>", lambda e, c=card: c.face_data and self.on_card_click(c.face_data, e))
         # Context Menu
-        widget.bind("<Button-3>", lambda e, f=face: self.show_context_menu(e, f))
+        widget.bind("<Button-3>", lambda e, c=card: c.face_data and self.show_context_menu(e, c.face_data))
         # Drag Start
-        widget.bind("<ButtonPress-1>", lambda e, f=face: self.on_drag_start(e, f), add="+")
+        widget.bind("<ButtonPress-1>", lambda e, c=card: c.face_data and self.on_drag_start(e, c.face_data), add="+")
         # Drag End
         widget.bind("<ButtonRelease-1>", lambda e: self.on_drag_end(e), add="+")
+        self._bind_wheel(widget)
         
         for child in widget.winfo_children():
-            self._bind_events(child, face)
+            self._bind_events(child, card)
 
     def on_drop(self, event):
         files = self.tk.splitlist(event.data)
@@ -104,7 +249,7 @@ class CharacterListFrame(ctk.CTkScrollableFrame):
             else:
                 self.selected_faces.append(face)
         elif is_shift and self.selected_faces:
-            all_faces = [c.face_data for c in self.cards]
+            all_faces = self.faces
             try:
                 last_face = self.selected_faces[-1]
                 start_idx = all_faces.index(last_face)
@@ -122,7 +267,8 @@ class CharacterListFrame(ctk.CTkScrollableFrame):
 
         # Update Visuals
         for card in self.cards:
-            card.set_selected(card.face_data in self.selected_faces)
+            if card.face_data is not None:
+                card.set_selected(card.face_data in self.selected_faces)
             
         # Notify callback
         if self.on_select_callback:
@@ -182,7 +328,11 @@ class CharacterListFrame(ctk.CTkScrollableFrame):
                      merged_count += 1
             
             target['states'] = target_states
-            self.face_manager.save_project_data(target['_path'], target)
+            if not self.face_manager.save_project_data(target['_path'], target, wait=True):
+                # Keep the source: it is the only complete copy of the merged states
+                Logger.error(f"Merge aborted: could not save {target.get('display_name')}")
+                self.refresh()
+                return
             Logger.info(f"Merged {merged_count} states from {source.get('display_name')} to {target.get('display_name')}")
             
             # Delete source? Usually yes in merge.
@@ -257,128 +407,138 @@ class CharacterListFrame(ctk.CTkScrollableFrame):
         # Deprecated: We now initialize on edit
         pass
 
+    def memory_usage(self):
+        """(entries, bytes) of list images, for MemoryReport. Call on the Tk thread."""
+        # The thumbs are the ThumbnailCache's own images (counted under face_manager), so no bytes here
+        cards = sum(1 for c in self.cards if getattr(c, 'thumb_image', None) is not None)
+        return {"thumbs": (len(self.thumbs), 0), "card_images": (cards, cards * 48 * 48 * 4)}
+
+    def neighbors(self, face_data, count=1):
+        """Managed faces up to `count` rows above and below face_data (nearest first)."""
+        dirname = face_data.get('_dirname')
+        index = next((i for i, f in enumerate(self.faces) if f.get('_dirname') == dirname), None)
+        if index is None:
+            return []
+        result = []
+        for distance in range(1, count + 1):
+            for i in (index + distance, index - distance):
+                if 0 <= i < len(self.faces) and self.faces[i].get('_status') == 'managed':
+                    result.append(self.faces[i])
+        return result
+
     def update_card(self, face_data):
         if face_data is None:
             # Full Refresh (Deleted)
             self.refresh()
+            return
+
+        # Single update: swap the data and re-fill the row if it is on screen
+        dirname = face_data.get('_dirname')
+        for i, face in enumerate(self.faces):
+            if face.get('_dirname') == dirname:
+                break
         else:
-            # Optimised single update (Optimising Thumbnail Updates)
-            # Find the card for this face_data
-            for child in self.cards:
-                if child.face_data.get('_dirname') == face_data.get('_dirname'):
-                    child.update_data(face_data)
-                    self._bind_events(child, face_data) # Rebind to fix stale references
-                    return
-            
             # If not found (e.g. new), refresh all
             self.refresh()
+            return
+
+        self.faces[i] = face_data
+        self.selected_faces = [face_data if f.get('_dirname') == dirname else f for f in self.selected_faces]
+        for card in self.cards:
+            if card.face_data is not None and card.face_data.get('_dirname') == dirname:
+                # Keep showing the old thumbnail until the new one is decoded
+                card.set_face(face_data, self.thumbs.get(dirname), loading=dirname not in self.thumbs)
+                card.set_selected(face_data in self.selected_faces)
+        self._request_thumbnails([face_data], fresh_path=True)
+
+def find_thumbnail_path(face_data):
+    """Path of face_a.png (case-insensitive), using the catalog's value when available."""
+    thumb_path = face_data.get('_thumb_path')
+    if thumb_path:
+        return thumb_path
+        
+    face_dir = face_data.get('_path')
+    try:
+        if face_dir and os.path.exists(face_dir):
+            for f in os.listdir(face_dir):
+                if f.lower() == "face_a.png":
+                    return os.path.join(face_dir, f)
+    except OSError:
+        pass
+    
+    # Fallback to standard if not found (though listdir should catch it)
+    return os.path.join(face_dir, "face_a.png") if face_dir else None
+
+def load_card_thumbnail(face_data, cache=None):
+    """Loads the card thumbnail as a PIL image (or None). Safe to run on a worker thread."""
+    thumb_path = find_thumbnail_path(face_data)
+    if not thumb_path:
+        return None
+    if cache is not None:
+        return cache.get(thumb_path)
+    if not os.path.exists(thumb_path):
+        return None
+    try:
+        with Image.open(thumb_path) as img:
+            return img.copy()
+    except Exception as e:
+        Logger.error(f"Failed to load thumbnail {thumb_path}: {e}")
+        return None
 
 class CharacterCard(ctk.CTkFrame):
-    def __init__(self, master, face_data):
+    """One row of the character list. Rows are recycled, so all content is set in set_face()."""
+    def __init__(self, master):
         super().__init__(master, height=60)
         self.pack_propagate(False) # Fix height
-        self.face_data = face_data
+        self.face_data = None
         self.default_fg_color = self._fg_color
-        
-        face_dir = face_data.get('_path')
-        
-        # Find face_a.png case-insensitively
-        thumb_path = None
-        try:
-            if os.path.exists(face_dir):
-                for f in os.listdir(face_dir):
-                    if f.lower() == "face_a.png":
-                        thumb_path = os.path.join(face_dir, f)
-                        break
-        except:
-            pass
-            
-        # Fallback to standard if not found (though listdir should catch it)
-        if not thumb_path:
-            thumb_path = os.path.join(face_dir, "face_a.png")
-        
         self.thumb_image = None
-        if thumb_path and os.path.exists(thumb_path):
-            try:
-                with Image.open(thumb_path) as img:
-                    pil_img = img.copy()
-                self.thumb_image = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=(48, 48))
-            except Exception as e:
-                Logger.error(f"Failed to load thumbnail {thumb_path}: {e}")
-        else:
-            # Logger.debug(f"Thumbnail not found: {thumb_path}")
-            pass
+        self.selected = False
         
-        self.lbl_thumb = ctk.CTkLabel(self, text=loc.get("no_img", "No Img") if not self.thumb_image else "", image=self.thumb_image)
+        self.lbl_thumb = ctk.CTkLabel(self, text="", width=48, height=48)
         self.lbl_thumb.pack(side="left", padx=5, pady=5)
         
-        status = face_data.get('_status', 'managed')
-        
-        display_name = face_data.get('display_name', loc.get("unknown", "Unknown"))
-        if status == 'empty':
-            display_name = loc.get("empty", "(Empty)")
-        elif status == 'unmanaged':
-            display_name = f"{display_name} {loc.get('unmanaged', '(Unmanaged)')}"
-            
-        self.lbl_name = ctk.CTkLabel(self, text=display_name, font=(get_ui_font_family(), 12, "bold" if status == 'managed' else "normal"))
-        
-        if status == 'empty':
-            self.lbl_name.configure(text_color="gray")
-        elif status == 'unmanaged':
-            self.lbl_name.configure(text_color="orange")
-            
+        self.lbl_name = ctk.CTkLabel(self, text="", font=(get_ui_font_family(), 12, "bold"))
         self.lbl_name.pack(side="left", padx=10)
         
-        dirname = face_data.get('_dirname', '')
-        self.lbl_id = ctk.CTkLabel(self, text=dirname, font=(get_ui_font_family(), 10))
+        self.lbl_id = ctk.CTkLabel(self, text="", font=(get_ui_font_family(), 10))
         self.lbl_id.pack(side="right", padx=5)
 
-    def update_data(self, face_data):
-        """Refreshes the card with new data."""
+    def set_face(self, face_data, thumb, loading=False):
+        """Shows face_data with an already loaded PIL thumbnail (or None; a placeholder if loading)."""
         self.face_data = face_data
-        
-        # Refresh Thumbnail
-        face_dir = face_data.get('_path')
-        thumb_path = None
-        try:
-            if os.path.exists(face_dir):
-                for f in os.listdir(face_dir):
-                    if f.lower() == "face_a.png":
-                        thumb_path = os.path.join(face_dir, f)
-                        break
-        except:
-            pass
-        if not thumb_path: thumb_path = os.path.join(face_dir, "face_a.png")
-
-        if os.path.exists(thumb_path):
-            try:
-                img = Image.open(thumb_path)
-                # img.thumbnail((48, 48)) # Use full quality or match init
-                # init uses copy without thumbnail, letting CTkImage scale it.
-                # Let's do the same or just ensure size matches.
-                # CTkImage size argument controls display size.
-                self.thumb_image = ctk.CTkImage(light_image=img, dark_image=img, size=(48, 48))
-                self.lbl_thumb.configure(image=self.thumb_image, text="")
-            except Exception as e:
-                Logger.error(f"Error updating thumbnail: {e}")
-        else:
-            self.lbl_thumb.configure(image=None, text=loc.get("no_img", "No Img"))
+        self.set_thumbnail(thumb, loading)
 
-        # Refresh Name
-        display_name = face_data.get('display_name', 'Unknown')
         status = face_data.get('_status', 'managed')
+        display_name = face_data.get('display_name', loc.get("unknown", "Unknown"))
         if status == 'empty':
-            display_name = f"{display_name} {loc.get('empty', '(Empty)')}"
+            display_name = loc.get("empty", "(Empty)")
         elif status == 'unmanaged':
             display_name = f"{display_name} {loc.get('unmanaged', '(Unmanaged)')}"
             
         self.lbl_name.configure(text=display_name, font=(get_ui_font_family(), 12, "bold" if status == 'managed' else "normal"))
         if status == 'empty':
             self.lbl_name.configure(text_color="gray")
+        elif status == 'unmanaged':
+            self.lbl_name.configure(text_color="orange")
         else:
             self.lbl_name.configure(text_color=("black", "white"))
 
+        self.lbl_id.configure(text=face_data.get('_dirname', ''))
+
+    def set_thumbnail(self, thumb, loading=False):
+        if thumb is not None:
+            # CTkImage size argument controls display size.
+            self.thumb_image = ctk.CTkImage(light_image=thumb, dark_image=thumb, size=(48, 48))
+            self.lbl_thumb.configure(image=self.thumb_image, text="")
+        else:
+            self.thumb_image = None
+            self.lbl_thumb.configure(image=None, text="..." if loading else loc.get("no_img", "No Img"))
+
     def set_selected(self, selected: bool):
+        if selected == self.selected:
+            return
+        self.selected = selected
         if selected:
             self.configure(fg_color=("gray75", "gray25"), border_width=2, border_color="blue")
         else:
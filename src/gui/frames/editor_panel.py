@@ -4,6 +4,9 @@ from tkinter import filedialog
 from PIL import Image, ImageTk, ImageDraw
 from core.face_manager import FaceManager
 from core.image_processor import ImageProcessor
+from core.grid_thumbnail_cache import GridThumbnailCache
+from core.render_prefetcher import RenderPrefetcher
+from core.exporter import FaceExporter
 import os
 import json
 from gui.dialogs.progress_dialog import ProgressDialog
@@ -12,6 +15,8 @@ from core.localization import loc
 from core.rembg_downloader import RembgDownloader
 import threading
 from core.logger import Logger
+from core.tracing import traced
+from core.memory_report import images_nbytes, photo_nbytes
 import traceback
 from gui.fonts import get_ui_font_family
 
@@ -33,7 +38,7 @@ class LoadingOverlay(ctk.CTkFrame):
         self.lift() # Ensure on top
         
     def show(self):
-        Logger.info("LoadingOverlay.show called")
+        Logger.debug("LoadingOverlay.show called")
         self.place(relx=0, rely=0, relwidth=1, relheight=1)
         self.spinner.start()
         self.lift()
@@ -48,7 +53,7 @@ class LoadingOverlay(ctk.CTkFrame):
         self.update_idletasks() # Force render
         
     def hide(self):
-        Logger.info("LoadingOverlay.hide called")
+        Logger.debug("LoadingOverlay.hide called")
         self.place_forget()
         self.spinner.stop()
 
@@ -57,14 +62,19 @@ class EditorPanelFrame(ctk.CTkFrame):
         super().__init__(master, **kwargs)
         self.face_manager = face_manager
         self.image_processor = image_processor
+        self.exporter = FaceExporter(face_manager, image_processor)
         self.current_face = None
         self.current_state_key = "normal"
         self.on_update_callback = None
         self.on_update_callback = None
         self.view_mode = "Grid" # Default Grid
-        self.grid_images = [] # Keep references to grid images
-        self.grid_widgets = [] # Keep references to grid widgets for clearing
-        self.last_window_width = 0 # For resize debounce
+        # Grid tiles: low-res renders of each state (real pipeline), computed off-thread
+        self.grid_thumbs = GridThumbnailCache(renderer=self.image_processor.render_preview, render_params=ImageProcessor.RENDER_PARAMS)
+        self.grid_thumbs.attach_governor()
+        self.grid_tiles = {} # state_key -> tile (canvas item ids, source_path, params_key, photo, bbox)
+        self.grid_tiles_timer = None
+        self.grid_tile_size = 100
+        self.last_window_width = 0 # For resize re-layout
         self.ignore_slider_event = False # Flag to prevent loop
         
         # Caching for Performance
@@ -76,6 +86,7 @@ class EditorPanelFrame(ctk.CTkFrame):
         
         self.cached_composited_image = None # Deprecated/Removed in favor of clean cache + dynamic UI
         self.composited_cache_key = None
+        self.preview_backgrounds = {} # (path, resample) -> decoded 1920x1080 game UI layer (read-only)
         
         self.pin_mode = "Global" # Global or Local
         
@@ -86,6 +97,7 @@ class EditorPanelFrame(ctk.CTkFrame):
         self.drag_start_y = 0
         self.is_dragging = False
         self.drag_threshold = 5
+        self.slider_held = False
         
         # Layout
         self.grid_columnconfigure(0, weight=1) # Preview
@@ -144,9 +156,27 @@ class EditorPanelFrame(ctk.CTkFrame):
         self.lbl_preview.bind("<ButtonRelease-2>", self.on_pan_end)
         
         # Grid View Frame (Initially hidden)
-        self.grid_view_frame = ctk.CTkScrollableFrame(self.preview_container, label_text="State Overview")
-        self.grid_view_frame.bind("<Configure>", self._on_grid_configure)
+        # All tiles are items on one canvas; clicks and drops are hit-tested against tile bounds
+        self.grid_view_frame = ctk.CTkFrame(self.preview_container)
         # self.grid_view_frame.pack(expand=True, fill="both") # Packed when switched
+        self.lbl_grid_title = ctk.CTkLabel(self.grid_view_frame, text="State Overview")
+        self.lbl_grid_title.pack(fill="x")
+        self.grid_scrollbar = ctk.CTkScrollbar(self.grid_view_frame)
+        self.grid_scrollbar.pack(side="right", fill="y")
+        self.grid_canvas = tk.Canvas(self.grid_view_frame, bg="gray20", highlightthickness=0, bd=0)
+        self.grid_canvas.pack(side="left", expand=True, fill="both")
+        self.grid_canvas.configure(yscrollcommand=self.grid_scrollbar.set)
+        self.grid_scrollbar.configure(command=self.grid_canvas.yview)
+        self.grid_canvas.bind("<Configure>", self._on_grid_configure)
+        self.grid_canvas.bind("<Button-1>", self._on_grid_canvas_click)
+        self.grid_canvas.bind("<MouseWheel>", self._on_grid_scroll) # Windows
+        self.grid_canvas.bind("<Button-4>", self._on_grid_scroll) # Linux scroll up
+        self.grid_canvas.bind("<Button-5>", self._on_grid_scroll) # Linux scroll down
+        try:
+            self.grid_canvas.drop_target_register('DND_Files')
+            self.grid_canvas.dnd_bind('<<Drop>>', self._on_grid_drop)
+        except:
+            pass
         
         self.grid_resize_timer = None
         
@@ -181,6 +211,11 @@ class EditorPanelFrame(ctk.CTkFrame):
         self.is_loading = False
         
         self.preview_timer = None # For debounce
+        
+        # Warms the render cache for sibling states / neighbouring characters while idle
+        # Paused while a render is pending or the user drags (even if the mouse rests for a moment)
+        self.prefetcher = RenderPrefetcher(self.image_processor, is_busy=lambda: self.is_loading or self.is_dragging or self.slider_held)
+        self.prefetch_neighbors = [] # Faces next to the current one in the character list
 
         # Initially hide editor
         self.show_editor(False)
@@ -204,8 +239,6 @@ class EditorPanelFrame(ctk.CTkFrame):
         self.view_pan_y = 0
         self._update_preview_position()
         
-        self.grid_images.clear()
-        
         # Clear Preview Label
         try:
             self.lbl_preview.configure(image=None, text="")
@@ -215,9 +248,8 @@ class EditorPanelFrame(ctk.CTkFrame):
             pass
             
         # Clear Grid
-        for w in self.grid_widgets:
-            w.destroy()
-        self.grid_widgets.clear()
+        self.grid_canvas.delete("tile")
+        self.grid_tiles.clear()
             
         self.show_editor(False)
         self.entry_name.delete(0, "end")
@@ -383,7 +415,11 @@ class EditorPanelFrame(ctk.CTkFrame):
         slider.pack(side="right", fill="x", expand=True, padx=5)
         
         # Bind click to push undo state
-        slider.bind("<ButtonPress-1>", lambda e: self.face_manager.push_update_state(self.current_face) if self.current_face else None)
+        def on_press(event):
+            self.slider_held = True
+            if self.current_face:
+                self.face_manager.push_update_state(self.current_face)
+        slider.bind("<ButtonPress-1>", on_press)
         
         # Callbacks
         # Callbacks
@@ -402,6 +438,7 @@ class EditorPanelFrame(ctk.CTkFrame):
                 self.update_preview(fast_mode=True)
             
         def on_release(event):
+            self.slider_held = False
             # Full Update (Async, High Quality)
             self._perform_full_render()
             
@@ -496,6 +533,7 @@ class EditorPanelFrame(ctk.CTkFrame):
             self.state_buttons_frame.grid_columnconfigure(col, weight=1)
             self.state_buttons[key] = btn
 
+    @traced("ui.change_state")
     def change_state(self, state_key, save_before_switch=True):
         # Save previous state before switching
         if self.current_face and save_before_switch:
@@ -612,6 +650,53 @@ class EditorPanelFrame(ctk.CTkFrame):
         self._update_state_buttons()
         
         self.update_preview()
+        self.schedule_prefetch()
+
+    def schedule_prefetch(self, neighbor_faces=None):
+        """Queues preview renders of the other states, then the neighbours' normal state."""
+        if neighbor_faces is not None:
+            self.prefetch_neighbors = list(neighbor_faces)
+        if not self.current_face:
+            self.prefetcher.cancel()
+            return
+        
+        jobs = []
+        states = self.current_face.get('states', {})
+        for key in self.state_keys:
+            if key == self.current_state_key: continue
+            state_data = states.get(key)
+            if state_data and state_data.get('source_uuid'):
+                jobs.append((self.face_manager.get_source_path(self.current_face, state_data['source_uuid']), state_data))
+        for face in self.prefetch_neighbors:
+            state_data = face.get('states', {}).get('normal')
+            if state_data and state_data.get('source_uuid'):
+                jobs.append((self.face_manager.get_source_path(face, state_data['source_uuid']), state_data))
+        self.prefetcher.schedule(jobs)
+
+    def _has_cached_preview(self):
+        """True if the current state's full render is already cached (e.g. prefetched)."""
+        if not self.current_face: return False
+        state_data = self.current_face.get('states', {}).get(self.current_state_key)
+        if not state_data or not state_data.get('source_uuid'): return False
+        source_path = self.face_manager.get_source_path(self.current_face, state_data['source_uuid'])
+        return bool(source_path) and self.image_processor.has_cached_render(source_path, state_data)
+
+    def destroy(self):
+        # Re-created on language change: don't leave the background threads behind
+        self.prefetcher.stop()
+        self.grid_thumbs.shutdown()
+        super().destroy()
+
+    def memory_usage(self):
+        """(entries, bytes) of the editor's images, for MemoryReport. Call on the Tk thread."""
+        usage = {
+            "preview_images": images_nbytes([self.cached_processed_image, self.cached_clean_image, getattr(self, 'current_pil_image', None)]
+                                            + list(self.preview_backgrounds.values())),
+            "preview_photos": photo_nbytes([getattr(self, name, None) for name in ('current_image', 'current_icon_a', 'current_icon_b')]),
+            "grid_photos": photo_nbytes([tile.get('photo') for tile in self.grid_tiles.values()]),
+        }
+        usage.update(self.grid_thumbs.memory_usage())
+        return usage
 
     def update_name(self):
         if self.current_face:
@@ -644,14 +729,6 @@ class EditorPanelFrame(ctk.CTkFrame):
                 Logger.info(f"Dropped image on editor: {os.path.basename(file_path)}")
                 self._import_file(file_path)
 
-    def on_drop_grid_cell(self, event, state_key):
-        files = self.tk.splitlist(event.data)
-        if not files: return
-        
-        file_path = files[0]
-        if os.path.isfile(file_path):
-            self._import_file_to_state(file_path, state_key)
-
     def on_drop_batch(self, event):
         files = self.tk.splitlist(event.data)
         if not files: return
@@ -685,9 +762,13 @@ class EditorPanelFrame(ctk.CTkFrame):
         # Batch Import
         self.face_manager.push_update_state(self.current_face)
         
+        # Copy all files in one parallel batch
+        uuids = self.face_manager.import_source_images(self.current_face, [f for f, _ in valid_files])
+        
         count = 0
-        for f, key in valid_files:
-            self._import_file_to_state(f, key, save=False)
+        for (f, key), uuid in zip(valid_files, uuids):
+            if not uuid: continue
+            self._import_file_to_state(f, key, save=False, source_uuid=uuid)
             count += 1
             
         if count > 0:
@@ -696,9 +777,10 @@ class EditorPanelFrame(ctk.CTkFrame):
             from tkinter import messagebox
             messagebox.showinfo("Batch Import", f"Imported {count} files.")
 
-    def _import_file_to_state(self, file_path, state_key, save=True):
+    def _import_file_to_state(self, file_path, state_key, save=True, source_uuid=None):
         self.face_manager.push_update_state(self.current_face) # Undo snapshot
-        uuid = self.face_manager.import_source_image(self.current_face, file_path)
+        # source_uuid: file was already imported (batch)
+        uuid = source_uuid or self.face_manager.import_source_image(self.current_face, file_path)
         if uuid:
             if 'states' not in self.current_face:
                 self.current_face['states'] = {}
@@ -800,14 +882,18 @@ class EditorPanelFrame(ctk.CTkFrame):
             self._update_state_buttons()
             self.update_preview()
 
+    @traced("ui.update_preview")
     def update_preview(self, *args, fast_mode=False):
         # Logger.info(f"update_preview called. Fast: {fast_mode}. Stack: {''.join(traceback.format_stack()[-3:])}")
         # Main Thread Synchronous Update (Fast Mode or Sync Full)
         try:
             if not self.current_face: return
+            self.prefetcher.notify_activity()
 
             # Sync Sliders to Data
             self._commit_ui_to_data()
+            if self.view_mode == "Grid":
+                self._schedule_grid_tiles_update()
             
             # Check Cache for Instant Update (e.g. Undo/Redo)
             if not fast_mode and self.current_face:
@@ -833,7 +919,9 @@ class EditorPanelFrame(ctk.CTkFrame):
                     self.lbl_preview.configure(image=None)
                     photo_img = ImageTk.PhotoImage(display_img)
                     self.current_image = photo_img
-                    self.current_pil_image = processed_img
+                    if processed_img is not None:
+                        # None: the frame lived in a pooled canvas, keep the last settled image
+                        self.current_pil_image = processed_img
                     self.lbl_preview.configure(image=photo_img, text="")
                     self._update_preview_position()
 
@@ -889,117 +977,182 @@ class EditorPanelFrame(ctk.CTkFrame):
     
 
 
+
+    GRID_PADDING = 10
+    GRID_LABEL_HEIGHT = 20
 
     def _refresh_grid_view(self):
+        """Recreates the tile items for the current character (cheap: canvas items only)."""
         try:
-            # Clear existing
-            for w in self.grid_widgets:
-                w.destroy()
-            self.grid_widgets.clear()
-            self.grid_images.clear()
+            self.grid_canvas.delete("tile")
+            self.grid_tiles.clear()
             
-            if not self.current_face: return
+            if not self.current_face:
+                self._layout_grid()
+                return
             
             states = self.current_face.get('states', {})
             
-            # Calculate Grid Layout
-            # Width of container?
-            container_width = self.grid_view_frame.winfo_width()
-            if container_width < 100: container_width = 800 # Default
-            
-            # Thumb Size from Slider
-            try:
-                # Read slider value directly to avoid stale state
-                slider_val = self.slider_zoom.get()
-                # Map 0.5-3.0 -> 80-300px?
-                # Base size 100px * slider
-                thumb_size = int(100 * slider_val)
-                thumb_size = max(50, min(500, thumb_size))
-            except Exception as e:
-                Logger.error(f"Error reading slider in grid refresh: {e}")
-                thumb_size = 100
-            
-            padding = 10
-            # How many cols?
-            max_cols = max(1, (container_width - 20) // (thumb_size + padding))
-            
-            # Filter states to show? All defined states?
-            # Show all keys defined in self.state_keys
-            
-            row = 0
-            col = 0
+            # Thumb Size from Slider (read directly to avoid stale state)
+            thumb_size = self._grid_thumb_size()
+            self.grid_tile_size = thumb_size
             
+            canvas = self.grid_canvas
             for key in self.state_keys:
-                # Frame for Item
-                item_frame = ctk.CTkFrame(self.grid_view_frame, fg_color="transparent")
-                item_frame.grid(row=row, column=col, padx=5, pady=5)
-                self.grid_widgets.append(item_frame)
-                
-                # Label
-                lbl_name = ctk.CTkLabel(item_frame, text=loc.get(f"states.{key}"), font=(get_ui_font_family(), 10))
-                lbl_name.pack()
-                
-                # Image/Button
                 # If state has image, show it. Else show placeholder.
                 state_data = states.get(key)
-                img = None
+                source_path = None
                 
                 if state_data:
                     source_uuid = state_data.get('source_uuid')
                     if source_uuid:
                         source_path = self.face_manager.get_source_path(self.current_face, source_uuid)
-                        if source_path and os.path.exists(source_path):
-                            # Process small thumb
-                            # Use image processor to get a small version?
-                            # Just load and resize for speed?
-                            # Better to use processor to respect crop/rembg if possible, but slow for grid?
-                            # Let's just load raw for speed first?
-                            # Or use cache?
-                            try:
-                                # Simple load & resize
-                                pil_img = Image.open(source_path)
-                                pil_img.thumbnail((thumb_size, thumb_size))
-                                img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=pil_img.size)
-                                self.grid_images.append(img) # Keep ref
-                            except Exception as e:
-                                Logger.error(f"Error loading thumb for {key}: {e}")
-                
-                btn = ctk.CTkButton(
-                    item_frame, 
-                    text="+" if not img else "", 
-                    image=img,
-                    width=thumb_size, 
-                    height=thumb_size,
-                    fg_color="gray30",
-                    command=lambda k=key, has_img=bool(img): self._on_grid_click(k, has_img)
-                )
-                btn.pack()
+                        if source_path and not os.path.exists(source_path):
+                            source_path = None
                 
-                # D&D for this cell
-                try:
-                    btn.drop_target_register('DND_Files')
-                    btn.dnd_bind('<<Drop>>', lambda e, k=key: self.on_drop_grid_cell(e, k))
-                except:
-                    pass
+                tile = {
+                    'source_path': source_path,
+                    'params_key': self.grid_thumbs.params_key(state_data) if source_path else None,
+                    'photo': None,
+                    'bbox': (0, 0, 0, 0),
+                    'label': canvas.create_text(0, 0, text=loc.get(f"states.{key}"), fill="white", font=(get_ui_font_family(), 10), anchor="n", tags="tile"),
+                    'rect': canvas.create_rectangle(0, 0, 0, 0, fill="gray30", outline="", tags="tile"),
+                    'image': canvas.create_image(0, 0, anchor="center", tags="tile"),
+                    'text': canvas.create_text(0, 0, text="..." if source_path else "+", fill="white", font=(get_ui_font_family(), 16), tags="tile"),
+                }
+                self.grid_tiles[key] = tile
                 
-                col += 1
-                if col >= max_cols:
-                    col = 0
-                    row += 1
+                if source_path:
+                    # Served from the snapped cache (scaled/stale if not exact); render/refine off-thread
+                    self._set_grid_tile_image(tile, self._get_grid_thumbnail(source_path, thumb_size, state_data))
             
-            # Force update of scroll region
-            self.grid_view_frame.update_idletasks()
-            
-            # Register D&D for the background frame too
-            try:
-                self.grid_view_frame.drop_target_register('DND_Files')
-                self.grid_view_frame.dnd_bind('<<Drop>>', self.on_drop_batch)
-            except:
-                pass
+            self._layout_grid()
             
         except Exception as e:
             Logger.error(f"Critical error in _refresh_grid_view: {e}\n{traceback.format_exc()}")
 
+    def _resize_grid_tiles(self):
+        """Zoom change: moves the existing tile items to the new size and swaps their images."""
+        self.grid_resize_timer = None
+        if not self.grid_tiles:
+            self._refresh_grid_view()
+            return
+        thumb_size = self._grid_thumb_size()
+        if thumb_size == self.grid_tile_size: return
+        self.grid_tile_size = thumb_size
+        self._layout_grid()
+        
+        states = self.current_face.get('states', {}) if self.current_face else {}
+        for key, tile in self.grid_tiles.items():
+            if not tile['source_path']: continue
+            pil_img = self._get_grid_thumbnail(tile['source_path'], thumb_size, states.get(key))
+            if pil_img is None:
+                # Nothing cached near this size yet: placeholder rather than the old (wrong size) image
+                tile['photo'] = None
+                self.grid_canvas.itemconfigure(tile['image'], image="")
+                self.grid_canvas.itemconfigure(tile['text'], text="...")
+            else:
+                self._set_grid_tile_image(tile, pil_img)
+
+    def _layout_grid(self):
+        """Positions the tiles for the current canvas width. No items are created here."""
+        canvas = self.grid_canvas
+        container_width = canvas.winfo_width()
+        if container_width < 100: container_width = 800 # Default
+        
+        size = self.grid_tile_size
+        pad = self.GRID_PADDING
+        cell_w = size + pad
+        cell_h = size + self.GRID_LABEL_HEIGHT + pad
+        max_cols = max(1, (container_width - pad) // cell_w)
+        
+        rows = 0
+        for i, key in enumerate(self.state_keys):
+            tile = self.grid_tiles.get(key)
+            if not tile: continue
+            row, col = divmod(i, max_cols)
+            rows = max(rows, row + 1)
+            x0 = pad + col * cell_w
+            y0 = pad + row * cell_h
+            top = y0 + self.GRID_LABEL_HEIGHT
+            canvas.coords(tile['label'], x0 + size / 2, y0)
+            canvas.coords(tile['rect'], x0, top, x0 + size, top + size)
+            canvas.coords(tile['image'], x0 + size / 2, top + size / 2)
+            canvas.coords(tile['text'], x0 + size / 2, top + size / 2)
+            tile['bbox'] = (x0, y0, x0 + size, top + size)
+        
+        canvas.configure(scrollregion=(0, 0, container_width, rows * cell_h + pad))
+
+    def _grid_tile_at(self, x_root, y_root):
+        """State key of the tile under the screen position, or None."""
+        x = self.grid_canvas.canvasx(x_root - self.grid_canvas.winfo_rootx())
+        y = self.grid_canvas.canvasy(y_root - self.grid_canvas.winfo_rooty())
+        for key, tile in self.grid_tiles.items():
+            x0, y0, x1, y1 = tile['bbox']
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                return key
+        return None
+
+    def _on_grid_canvas_click(self, event):
+        key = self._grid_tile_at(event.x_root, event.y_root)
+        if key is not None:
+            self._on_grid_click(key, bool(self.grid_tiles[key]['source_path']))
+
+    def _on_grid_drop(self, event):
+        key = self._grid_tile_at(event.x_root, event.y_root)
+        if key is not None:
+            self.on_drop_grid_cell(event, key)
+        else:
+            self.on_drop_batch(event)
+
+    def _grid_thumb_size(self):
+        # Slider 0.5-3.0 -> 50-300px (base size 100px * slider)
+        try:
+            return max(50, min(500, int(100 * self.slider_zoom.get())))
+        except Exception:
+            return 100
+
+    def _get_grid_thumbnail(self, source_path, thumb_size, state_data):
+        """PIL tile image from the cache (None if nothing cached yet). Queues a render if not exact."""
+        pil_img, exact = self.grid_thumbs.get(source_path, thumb_size, state_data)
+        if not exact:
+            self.grid_thumbs.request(source_path, thumb_size, lambda path: self.after(0, self._on_grid_thumbnail_ready, path), params=state_data)
+        return pil_img
+
+    def _schedule_grid_tiles_update(self):
+        # Debounced: slider drags would otherwise queue a render per intermediate value
+        if self.grid_tiles_timer:
+            self.after_cancel(self.grid_tiles_timer)
+        self.grid_tiles_timer = self.after(150, self._update_grid_tiles)
+
+    def _update_grid_tiles(self):
+        """Re-renders only the tiles whose state parameters changed (e.g. linked states after a defaults edit)."""
+        self.grid_tiles_timer = None
+        if self.view_mode != "Grid" or not self.current_face: return
+        states = self.current_face.get('states', {})
+        for key, tile in self.grid_tiles.items():
+            if not tile['source_path']: continue
+            state_data = states.get(key)
+            params_key = self.grid_thumbs.params_key(state_data)
+            if params_key == tile['params_key']: continue
+            tile['params_key'] = params_key
+            self._set_grid_tile_image(tile, self._get_grid_thumbnail(tile['source_path'], self.grid_tile_size, state_data))
+
+    def _set_grid_tile_image(self, tile, pil_img):
+        if pil_img is None: return
+        tile['photo'] = ImageTk.PhotoImage(pil_img) # Keep ref
+        self.grid_canvas.itemconfigure(tile['image'], image=tile['photo'])
+        self.grid_canvas.itemconfigure(tile['text'], text="")
+
+    def _on_grid_thumbnail_ready(self, source_path):
+        # Swap the image into the tiles showing this source (no grid rebuild)
+        if self.view_mode != "Grid" or not self.current_face: return
+        states = self.current_face.get('states', {})
+        for key, tile in self.grid_tiles.items():
+            if tile['source_path'] != source_path: continue
+            pil_img, _ = self.grid_thumbs.get(source_path, self.grid_tile_size, states.get(key))
+            self._set_grid_tile_image(tile, pil_img)
+
     def _on_grid_click(self, key, has_img):
         if has_img:
             self.change_state(key)
@@ -1030,6 +1183,24 @@ class EditorPanelFrame(ctk.CTkFrame):
             self._import_file_to_state(file_path, state_key)
             self._refresh_grid_view()
 
+    def on_source_changed(self, source_path):
+        """Drops preview caches if a source of the open character changed on disk."""
+        if not self.current_face: return
+        face_dir = self.current_face.get('_path')
+        if not face_dir or os.path.dirname(os.path.dirname(source_path)) != face_dir:
+            return
+            
+        self.cached_processed_image = None
+        self.cache_key = None
+        self.cached_clean_image = None
+        self.clean_cache_key = None
+        self.grid_thumbs.invalidate(source_path)
+        
+        if self.view_mode == "Grid":
+            self._refresh_grid_view()
+        else:
+            self.update_preview()
+
     def _check_rembg_model(self):
         if RembgDownloader.is_model_installed():
             self.btn_download_model.pack_forget()
@@ -1198,23 +1369,20 @@ class EditorPanelFrame(ctk.CTkFrame):
         Logger.info(f"Applied settings to all states for {self.current_face.get('display_name')}")
 
     def _on_grid_configure(self, event):
-        new_width = self.grid_view_frame.winfo_width()
-        # Ignore small changes (e.g. scrollbar appearance) to prevent loops
-        if abs(new_width - self.last_window_width) < 20: 
+        # Resizing only moves tile coordinates, so no debounce is needed
+        if event.width == self.last_window_width:
             return
-            
-        self.last_window_width = new_width
-        
-        if self.grid_resize_timer:
-            self.after_cancel(self.grid_resize_timer)
-        self.grid_resize_timer = self.after(200, self._refresh_grid_view)
+        self.last_window_width = event.width
+        self._layout_grid()
 
     def _on_grid_scroll(self, event):
-        try:
-            # Scroll the canvas of the scrollable frame
-            self.grid_view_frame._parent_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        except:
-            pass
+        if event.num == 4:
+            delta = -1
+        elif event.num == 5:
+            delta = 1
+        else:
+            delta = int(-1*(event.delta/120))
+        self.grid_canvas.yview_scroll(delta, "units")
 
     def _on_zoom_slider_change(self, value):
         if self.ignore_slider_event: return
@@ -1229,8 +1397,8 @@ class EditorPanelFrame(ctk.CTkFrame):
             if self.grid_resize_timer:
                 self.after_cancel(self.grid_resize_timer)
             
-            # Delay refresh
-            self.grid_resize_timer = self.after(100, self._refresh_grid_view)
+            # Delay resize
+            self.grid_resize_timer = self.after(100, self._resize_grid_tiles)
             
         else:
             # Single View Zoom
@@ -1372,13 +1540,26 @@ class EditorPanelFrame(ctk.CTkFrame):
             self.is_loading = False
             # self.loading_overlay.hide()
             # Schedule update to allow UI to settle and prevent TclError
-            self.after(200, self.update_preview)
-
-    def _draw_marker(self, image, face_center):
+            # (a prefetched render is shown synchronously, so it needs no settling time)
+            self.after(10 if self._has_cached_preview() else 200, self.update_preview)
+
+    def _preview_background(self, path, resample):
+        """Game UI layer at 1920x1080, decoded once (None if the asset is missing). Read-only."""
+        key = (path, resample)
+        img = self.preview_backgrounds.get(key)
+        if img is None and os.path.exists(path):
+            img = Image.open(path).convert("RGBA")
+            if img.size != (1920, 1080):
+                img = img.resize((1920, 1080), resample)
+            self.preview_backgrounds[key] = img
+        return img
+
+    def _draw_marker(self, image, face_center, scale=1.0):
+        """Draws the face center pin; scale maps 1920x1080 coordinates onto a smaller image."""
         if face_center:
-            x, y = face_center.get('x'), face_center.get('y')
+            x, y = face_center.get('x') * scale, face_center.get('y') * scale
             draw = ImageDraw.Draw(image)
-            r = 20
+            r = 20 * scale
             # Color depends on whether this is a Global or Local setting
             # But we only know the current mode.
             # If we are in Local mode, we might be viewing a Local pin.
@@ -1387,9 +1568,9 @@ class EditorPanelFrame(ctk.CTkFrame):
             is_individual = bool(self.chk_individual_mode.get())
             color = "#3B8ED0" if is_individual else "red" # Blue for Local, Red for Global
             
-            draw.line((x-r, y, x+r, y), fill=color, width=3)
-            draw.line((x, y-r, x, y+r), fill=color, width=3)
-            draw.ellipse((x-r, y-r, x+r, y+r), outline=color, width=2)
+            draw.line((x-r, y, x+r, y), fill=color, width=max(1, round(3 * scale)))
+            draw.line((x, y-r, x, y+r), fill=color, width=max(1, round(3 * scale)))
+            draw.ellipse((x-r, y-r, x+r, y+r), outline=color, width=max(1, round(2 * scale)))
 
     def on_mouse_down(self, event):
         if self.current_face:
@@ -1650,14 +1831,15 @@ class EditorPanelFrame(ctk.CTkFrame):
         #     return
 
         # Show Loading Overlay
-        Logger.info("Showing loading overlay for save...")
+        Logger.debug("Showing loading overlay for save...")
         self.loading_overlay.label.configure(text=loc.get("saving", "Saving..."))
         self.loading_overlay.show()
         
         # Run in thread (Delay slightly to allow UI to update)
-        Logger.info("Starting save thread...")
+        Logger.debug("Starting save thread...")
         self.after(10, lambda: threading.Thread(target=self._save_character_thread, daemon=True).start())
         
+    @traced("export")
     def _save_character_thread(self):
         try:
             Logger.info(f"Starting save process for: {self.current_face.get('display_name')}")
@@ -1665,86 +1847,18 @@ class EditorPanelFrame(ctk.CTkFrame):
             # 1. Save JSON (Thread-safe enough for file I/O, but careful with shared state)
             # Ideally we should clone the data before passing to thread, but for now we assume no concurrent edits.
             self._save_json()
-            Logger.info("JSON saved.")
+            Logger.debug("JSON saved.")
             
             # 2. Export Images
             face_dir = self.current_face.get('_path')
-            Logger.info(f"Face directory: {face_dir}")
+            Logger.debug(f"Face directory: {face_dir}")
             
             if not face_dir:
                 Logger.error("Face directory is missing!")
                 self.after(0, self._on_save_complete)
                 return
 
-            states = self.current_face.get('states', {})
-            Logger.info(f"States found: {list(states.keys())}")
-            
-            suffix_map = {
-                "normal": "",
-                "poison": "_PO", "hp_75": "_75", "hp_50": "_50", "hp_25": "_25", "dead": "_DE",
-                "afraid": "_AF", "sleep": "_SL", "paralyzed": "_PA", "stoned": "_ST", "ashed": "_AS"
-            }
-            
-            count_saved = 0
-            
-            for key, suffix in suffix_map.items():
-                state_data = states.get(key)
-                if not state_data: 
-                    # Logger.debug(f"Skipping {key}: No state data")
-                    continue
-                
-                source_uuid = state_data.get('source_uuid')
-                if not source_uuid: 
-                    Logger.info(f"Skipping {key}: No source UUID")
-                    continue
-                
-                source_path = self.face_manager.get_source_path(self.current_face, source_uuid)
-                if not source_path: 
-                    Logger.warning(f"Skipping {key}: Source path not found for UUID {source_uuid}")
-                    continue
-                
-                frame_id = self.current_face.get('frame_id')
-                frame_path = self.face_manager.get_frame_path(frame_id)
-                
-                # Resolve Face Center for this state
-                face_center = state_data.get('face_center')
-                if not face_center:
-                    # Fallback to defaults/global
-                    face_center = self.current_face.get('defaults', {}).get('face_center')
-                    if not face_center:
-                        face_center = self.current_face.get('face_center')
-                
-                Logger.info(f"Processing {key}...")
-                
-                # Render 1920x1080 (face_c)
-                img_full = self.image_processor.process_image(source_path, state_data, (1920, 1080), frame_path=frame_path)
-                if img_full:
-                    # Save face_c
-                    filename = f"face_c{suffix}.png"
-                    save_path = os.path.join(face_dir, filename)
-                    img_full.save(save_path)
-                    Logger.info(f"Saved {filename}")
-                    
-                    # Save face_d (Copy of c)
-                    img_full.save(os.path.join(face_dir, f"face_d{suffix}.png"))
-                    
-                    # Save face_e (Copy of c)
-                    img_full.save(os.path.join(face_dir, f"face_e{suffix}.png"))
-                    
-                    # Save face_b (270x96) - For ALL states
-                    img_b = self.image_processor.create_face_icon(img_full, (270, 96), face_center)
-                    img_b.save(os.path.join(face_dir, f"face_b{suffix}.png"))
-                    
-                    # If normal state, generate face_a
-                    if key == "normal":
-                        # face_a (96x96)
-                        img_a = self.image_processor.create_face_icon(img_full, (96, 96), face_center)
-                        img_a.save(os.path.join(face_dir, "face_a.png"))
-                        Logger.info("Saved face_a.png")
-                        
-                    count_saved += 1
-                else:
-                    Logger.error(f"Failed to process image for {key}")
+            count_saved = self.exporter.export(self.current_face)
             
             Logger.info(f"Saved character to {face_dir}. Total states processed: {count_saved}")
             
@@ -1998,10 +2112,14 @@ class EditorPanelFrame(ctk.CTkFrame):
         )
         
         # Preprocess (Thread-safe if image_processor is)
+        # Lazily: a cached render/layer (e.g. prefetched) doesn't need the decoded source
         if self.cache_key != current_cache_key:
             # Logger.info(f"Cache Key Mismatch! Old: {self.cache_key}, New: {current_cache_key}")
-            self.cached_processed_image = self.image_processor.preprocess_image(source_path, state_data)
+            self.cached_processed_image = None
             self.cache_key = current_cache_key
+        cached_render = self.image_processor.get_cached_render(source_path, state_data)
+        if self.cached_processed_image is None and cached_render is None and not self.image_processor.has_cached_layer(source_path, state_data):
+            self.cached_processed_image = self.image_processor.preprocess_image(source_path, state_data)
             
         face_center = state_data.get('face_center')
         if not face_center:
@@ -2017,17 +2135,29 @@ class EditorPanelFrame(ctk.CTkFrame):
             face_center.get('y') if face_center else None
         )
         
+        # Canvases borrowed from the processor pool (fast mode only, released before returning)
+        pooled_buffers = []
+        
         clean_img = None
         if self.clean_cache_key == current_clean_key and self.cached_clean_image:
             clean_img = self.cached_clean_image
+        elif cached_render is not None:
+            # Shared cache entry (read-only, never pooled)
+            clean_img = cached_render
+            self.cached_clean_image = clean_img
+            self.clean_cache_key = current_clean_key
         else:
+            # Fast mode frames (drags) are throwaway: don't flood the render cache with them
             clean_img = self.image_processor.process_image(
                 source_path, 
                 state_data, 
                 target_size=(1920, 1080),
                 preprocessed_image=self.cached_processed_image,
-                face_center=face_center
+                face_center=face_center,
+                cache_result=not fast_mode
             )
+            if fast_mode and clean_img:
+                pooled_buffers.append(clean_img)
             if not fast_mode:
                 self.cached_clean_image = clean_img
                 self.clean_cache_key = current_clean_key
@@ -2035,6 +2165,7 @@ class EditorPanelFrame(ctk.CTkFrame):
         icon_a = None
         icon_b = None
         processed_img = None
+        marker_on_display = False
         
         if clean_img:
             # Icons
@@ -2049,7 +2180,9 @@ class EditorPanelFrame(ctk.CTkFrame):
             icon_b = self.image_processor.create_face_icon(clean_img, (270, 96), fc_dict, icon_scale_b)
 
             # Game UI Background
-            processed_img = clean_img.copy()
+            # clean_img is a shared cache entry (read-only). Only copy it when we are
+            # about to draw on it (marker without game UI); the UI path composites onto a new base.
+            processed_img = clean_img
             
             # Safe access to switch_game_ui
             show_ui = False
@@ -2066,27 +2199,42 @@ class EditorPanelFrame(ctk.CTkFrame):
                     bg01_path = os.path.join(assets_dir, "preview_bg_01.png")
                     bg02_path = os.path.join(assets_dir, "preview_bg_02.png")
                     
-                    if os.path.exists(bg01_path):
-                        base_img = Image.open(bg01_path).convert("RGBA")
-                        if base_img.size != (1920, 1080):
-                            base_img = base_img.resize((1920, 1080), resample_filter)
-                    else:
+                    base_img = None
+                    if fast_mode:
+                        base_img = self.image_processor.acquire_canvas((1920, 1080))
+                        pooled_buffers.append(base_img)
+                    
+                    bg_img = self._preview_background(bg01_path, resample_filter)
+                    if bg_img is not None:
+                        if base_img:
+                            base_img.paste(bg_img)
+                        else:
+                            base_img = bg_img.copy() # Cached, and we draw on the base
+                    elif not base_img:
                         base_img = Image.new("RGBA", (1920, 1080), (0, 0, 0, 0))
 
                     base_img.alpha_composite(clean_img)
                     
-                    if os.path.exists(bg02_path):
-                        fg_img = Image.open(bg02_path).convert("RGBA")
-                        if fg_img.size != (1920, 1080):
-                            fg_img = fg_img.resize((1920, 1080), resample_filter)
+                    fg_img = self._preview_background(bg02_path, resample_filter)
+                    if fg_img is not None:
                         base_img.alpha_composite(fg_img)
                         
                     processed_img = base_img
                 except Exception as e:
                     Logger.error(f"Error loading game UI background: {e}")
 
-            # Draw Marker
-            self._draw_marker(processed_img, face_center)
+            # Draw Marker (Copy-on-write)
+            # Pooled canvases are ours to draw on. A shared cache entry would need an 8 MB
+            # copy, so drag frames put the marker on the (small) preview image instead.
+            if face_center:
+                borrowed = any(processed_img is buf for buf in pooled_buffers)
+                if processed_img is clean_img and not borrowed:
+                    if fast_mode:
+                        marker_on_display = True
+                    else:
+                        processed_img = clean_img.copy()
+                if not marker_on_display:
+                    self._draw_marker(processed_img, face_center)
         
         # Resize for preview
         display_img = None
@@ -2109,5 +2257,15 @@ class EditorPanelFrame(ctk.CTkFrame):
                 zw = int(new_w * self.view_zoom)
                 zh = int(new_h * self.view_zoom)
                 display_img = display_img.resize((zw, zh), Image.Resampling.NEAREST)
+
+            if marker_on_display:
+                self._draw_marker(display_img, face_center, display_img.width / processed_img.width)
+        
+        # Return pooled buffers. Nothing may keep a reference to them past this point,
+        # so processed_img comes back as None if it was one (callers keep their previous image).
+        for buf in pooled_buffers:
+            if buf is processed_img:
+                processed_img = None
+            self.image_processor.release_canvas(buf)
                 
         return (display_img, processed_img, icon_a, icon_b)
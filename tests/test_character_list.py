@@ -0,0 +1,53 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.logger import Logger
+from core.face_manager import FaceManager
+
+try:
+    import customtkinter as ctk
+    from gui.frames.character_list import CharacterListFrame
+    _root = ctk.CTk()
+    _root.withdraw()
+except Exception: # No customtkinter or no display
+    _root = None
+
+
+@unittest.skipIf(_root is None, "needs customtkinter and a display")
+class RefreshAfterInPlaceChangeTest(unittest.TestCase):
+    def setUp(self):
+        Logger.console = False
+        self.base = tempfile.mkdtemp(prefix="face_list_")
+        self.fm = FaceManager(self.base)
+        self.source = self.fm.initialize_face(self.fm.faces[0])
+        self.source['display_name'] = "Alice"
+        self.fm.save_project_data(self.source['_path'], self.source)
+        self.list = CharacterListFrame(_root, self.fm)
+        self.list._ensure_rows(400)
+        self.list._update_rows()
+
+    def tearDown(self):
+        self.list.destroy()
+        self.fm.shutdown()
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def card_for(self, dirname):
+        return next(c for c in self.list.cards if c.face_data and c.face_data.get('_dirname') == dirname)
+
+    def test_pasted_slot_is_redrawn(self):
+        target = self.fm.faces[1]
+        self.assertNotEqual(self.card_for("face2").lbl_name.cget("text"), "Alice")
+        self.assertTrue(self.fm.copy_face_data(self.source, target)) # Mutates target in place
+        self.list.refresh()
+        card = self.card_for("face2")
+        self.assertIs(card.face_data, target)
+        self.assertEqual(card.lbl_name.cget("text"), "Alice")
+
+
+if __name__ == "__main__":
+    unittest.main()
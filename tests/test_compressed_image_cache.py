@@ -0,0 +1,95 @@
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from PIL import Image, ImageChops
+from core.compressed_image_cache import CompressedImageCache
+from core.image_processor import ImageProcessor
+
+
+def portrait(noise=False):
+    canvas = Image.new("RGBA", (320, 180), (0, 0, 0, 0))
+    if noise:
+        figure = Image.effect_noise((60, 120), 80).convert("RGBA")
+    else:
+        figure = Image.new("RGBA", (60, 120), (200, 150, 120, 255))
+    canvas.paste(figure, (130, 40))
+    return canvas
+
+
+def same(a, b):
+    return a.size == b.size and ImageChops.difference(a, b).getbbox() is None
+
+
+class CompressedImageCacheTest(unittest.TestCase):
+    def test_round_trip(self):
+        cache = CompressedImageCache()
+        for noise in (False, True): # Flat pixels are compressed, noise is kept raw
+            img = portrait(noise)
+            cache.put("k", img, "src")
+            self.assertEqual(cache._entries["k"][3], not noise)
+            restored = cache.pop("k")
+            self.assertTrue(same(restored, img))
+            self.assertNotIn("k", cache)
+        self.assertEqual(cache.nbytes(), 0)
+
+    def test_fully_transparent(self):
+        cache = CompressedImageCache()
+        img = Image.new("RGBA", (64, 32), (0, 0, 0, 0))
+        cache.put("k", img)
+        self.assertTrue(same(cache.pop("k"), img))
+
+    def test_stale_token_is_dropped(self):
+        cache = CompressedImageCache()
+        token = cache.token("a")
+        other = cache.token("b")
+        cache.invalidate_source("a")
+        cache.put("ka", portrait(), "a", token)
+        cache.put("kb", portrait(), "b", other) # Other sources are unaffected
+        self.assertNotIn("ka", cache)
+        self.assertIn("kb", cache)
+
+        token = cache.token("b")
+        cache.clear()
+        cache.put("kb", portrait(), "b", token)
+        self.assertNotIn("kb", cache)
+
+
+class DemotionTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="face_tier_")
+        self.src = os.path.join(self.tmp, "source.png")
+        Image.new("RGBA", (64, 64), (255, 0, 0, 255)).save(self.src)
+        self.ip = ImageProcessor()
+        self.ip._render_cache_capacity = 1
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_evicted_render_is_restored(self):
+        params = {"scale": 1.0, "offset_x": 0}
+        first = self.ip.process_image(self.src, params, (320, 180)).copy()
+        self.ip.process_image(self.src, dict(params, offset_x=20), (320, 180)) # Demotes the first
+        self.ip._compress_executor.submit(lambda: None).result()
+        self.assertTrue(self.ip.has_cached_render(self.src, params, (320, 180)))
+        self.assertTrue(same(self.ip.get_cached_render(self.src, params, (320, 180)), first))
+
+    def test_invalidation_while_compression_is_queued(self):
+        gate = threading.Event()
+        self.ip._compress_executor.submit(gate.wait) # Hold the compress thread
+        params = {"scale": 1.0, "offset_x": 0}
+        self.ip.process_image(self.src, params, (320, 180))
+        self.ip.process_image(self.src, dict(params, offset_x=20), (320, 180)) # Queues the demotion
+        self.ip.invalidate_source(self.src)
+        gate.set()
+        self.ip._compress_executor.submit(lambda: None).result()
+        self.assertFalse(self.ip.has_cached_render(self.src, params, (320, 180)))
+
+
+if __name__ == "__main__":
+    unittest.main()
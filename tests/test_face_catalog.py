@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.logger import Logger
+from core.face_catalog import FaceCatalog
+from core.face_manager import FaceManager
+
+
+class FaceCatalogTest(unittest.TestCase):
+    def setUp(self):
+        Logger.console = False
+        self.base = tempfile.mkdtemp(prefix="face_catalog_")
+
+    def tearDown(self):
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def test_lookup_is_keyed_by_mtimes(self):
+        catalog = FaceCatalog(self.base)
+        catalog.update("face1", {"dir_mtime": 10, "json_state": [20, 5], "status": "managed"})
+        self.assertEqual(catalog.lookup("face1", 10, [20, 5])["status"], "managed")
+        self.assertIsNone(catalog.lookup("face1", 11, [20, 5])) # Folder changed
+        self.assertIsNone(catalog.lookup("face1", 10, [21, 5])) # JSON edited in place
+        self.assertIsNone(catalog.lookup("face1", 10, None)) # JSON removed
+
+        catalog.invalidate("face1")
+        self.assertIsNone(catalog.lookup("face1", 10, [20, 5]))
+
+    def test_saved_and_reloaded(self):
+        catalog = FaceCatalog(self.base)
+        catalog.update("face2", {"dir_mtime": 1, "json_state": None, "status": "empty"})
+        catalog.save()
+        self.assertEqual(FaceCatalog(self.base).lookup("face2", 1, None)["status"], "empty")
+
+        with open(catalog.path, "w", encoding="utf-8") as f:
+            f.write("{broken")
+        self.assertIsNone(FaceCatalog(self.base).lookup("face2", 1, None))
+
+
+class CatalogScanTest(unittest.TestCase):
+    def setUp(self):
+        Logger.console = False
+        self.base = tempfile.mkdtemp(prefix="face_catalog_scan_")
+        self.fm = FaceManager(self.base)
+        self.face = self.fm.initialize_face(self.fm.faces[0])
+        self.fm.persistence.flush()
+        self.fm.scan_faces()
+
+        self.reads = []
+        read_slot = self.fm._read_slot
+        self.fm._read_slot = lambda face_dir, *args: self.reads.append(face_dir) or read_slot(face_dir, *args)
+
+    def tearDown(self):
+        self.fm.shutdown()
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def test_unchanged_slots_are_not_read(self):
+        self.fm.scan_faces()
+        self.assertEqual(self.reads, [])
+
+    def test_in_place_json_edit_is_picked_up(self):
+        json_path = os.path.join(self.face['_path'], "project_data.json")
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data['display_name'] = "Edited elsewhere"
+        st = os.stat(json_path)
+        dir_st = os.stat(self.face['_path'])
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        # Same folder mtime, newer file (coarse timestamps would otherwise hide it)
+        os.utime(json_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        os.utime(self.face['_path'], ns=(dir_st.st_atime_ns, dir_st.st_mtime_ns))
+
+        self.fm.scan_faces()
+        self.assertEqual(self.reads, [self.face['_path']])
+        self.assertEqual(self.fm.find_face(self.face['_path'])['display_name'], "Edited elsewhere")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.fs_watcher import LibraryWatcher
+
+
+def touch(path, data=b"x", bump=1_000_000):
+    """Writes path and moves its mtime (and its folder's) forward, for coarse-timestamp filesystems."""
+    existed = os.path.exists(path)
+    old = os.stat(path).st_mtime_ns if existed else None
+    with open(path, "wb") as f:
+        f.write(data)
+    if old is not None:
+        os.utime(path, ns=(old, old + bump))
+    bump_dir(os.path.dirname(path), bump)
+
+
+def bump_dir(path, bump=1_000_000):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump))
+
+
+class LibraryWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp(prefix="face_watch_")
+        self.face_dir = os.path.join(self.base, "face1")
+        self.sources = os.path.join(self.face_dir, "sources")
+        os.makedirs(self.sources)
+        touch(os.path.join(self.face_dir, "project_data.json"), b"{}")
+        self.source = os.path.join(self.sources, "a.png")
+        touch(self.source)
+
+        self.watcher = LibraryWatcher(self.base, slot_count=3)
+        self.slots = []
+        self.sources_changed = []
+        self.watcher.on_slot_changed = self.slots.append
+        self.watcher.on_source_changed = lambda face_dir, path: self.sources_changed.append(path)
+        self.watcher.poll(emit=False) # Baseline
+
+    def tearDown(self):
+        self.watcher.stop()
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def test_baseline_is_quiet(self):
+        self.watcher.poll()
+        self.assertEqual((self.slots, self.sources_changed), ([], []))
+
+    def test_slot_created_and_json_edited(self):
+        os.makedirs(os.path.join(self.base, "face2"))
+        touch(os.path.join(self.face_dir, "project_data.json"), b'{"a": 1}')
+        self.watcher.poll()
+        self.assertEqual(sorted(self.slots), ["face1", "face2"])
+
+    def test_source_added_and_removed(self):
+        added = os.path.join(self.sources, "b.jpg")
+        touch(added)
+        touch(os.path.join(self.sources, "notes.txt")) # Not an image
+        self.watcher.poll()
+        self.assertEqual(self.sources_changed, [added])
+
+        os.remove(self.source)
+        bump_dir(self.sources)
+        self.watcher.poll()
+        self.assertEqual(self.sources_changed, [added, self.source])
+
+    def test_in_place_overwrite_needs_focus(self):
+        st = os.stat(self.sources)
+        touch(self.source, b"xy")
+        os.utime(self.sources, ns=(st.st_atime_ns, st.st_mtime_ns)) # Folder mtime unchanged
+        self.watcher.poll()
+        self.assertEqual(self.sources_changed, [])
+
+        self.watcher.focus(self.face_dir)
+        self.watcher.poll()
+        self.assertEqual(self.sources_changed, [self.source])
+
+    def test_rembg_cache_is_ignored(self):
+        cache = os.path.join(self.sources, "_cache")
+        os.makedirs(cache)
+        touch(os.path.join(cache, "a_nobg.png"))
+        self.watcher.poll()
+        self.assertEqual(self.sources_changed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.logger import Logger
+from core.face_manager import FaceManager
+from core.history import MISSING, diff_state, apply_patch, encode_patch, decode_patch
+
+
+class DiffStateTest(unittest.TestCase):
+    def test_reverse_patch_round_trip(self):
+        old = {'name': 'A', 'states': {'normal': {'offset_x': 0, 'scale': 1.0}}, 'tags': [1]}
+        new = {'name': 'A', 'states': {'normal': {'offset_x': 5, 'scale': 1.0}, 'sad': {}}, 'tags': [1, 2]}
+        patch = diff_state(old, new)
+        self.assertEqual(patch, {('states', 'normal', 'offset_x'): 0, ('states', 'sad'): MISSING, ('tags',): [1]})
+
+        data = {'name': 'A', 'states': {'normal': {'offset_x': 5, 'scale': 1.0}, 'sad': {}}, 'tags': [1, 2]}
+        redo = apply_patch(data, decode_patch(encode_patch(patch)))
+        self.assertEqual(data, old)
+        apply_patch(data, redo)
+        self.assertEqual(data, new)
+
+    def test_internal_keys_are_ignored(self):
+        old = {'_status': 'done', '_thumb_path': 'a.png', 'name': 'A'}
+        new = {'_status': 'empty', '_path': '/x', 'name': 'A'}
+        self.assertEqual(diff_state(old, new), {})
+
+
+class UndoAfterRescanTest(unittest.TestCase):
+    def setUp(self):
+        Logger.console = False
+        self.base = tempfile.mkdtemp(prefix="face_history_")
+        self.fm = FaceManager(self.base)
+        self.fm.history_coalesce_seconds = 0 # Every edit is its own entry
+        self.face = self.fm.initialize_face(self.fm.faces[0])
+
+    def tearDown(self):
+        self.fm.shutdown()
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def edit(self, face, value):
+        self.fm.push_update_state(face)
+        face['states']['normal']['offset_x'] = value
+
+    def test_undo_rescan_edit_undo(self):
+        self.edit(self.face, 10)
+        self.edit(self.face, 20)
+        restored = self.fm.undo()
+        self.assertEqual(restored['states']['normal']['offset_x'], 10)
+
+        # The app refreshes the list after an undo; the editor keeps its dict
+        self.fm.scan_faces()
+        editor_face = self.face
+        self.assertIs(self.fm.find_face(editor_face['_path']), editor_face)
+
+        self.edit(editor_face, 30)
+        self.edit(editor_face, 40)
+        self.assertEqual(len(self.fm.undo_stack), 3) # 0 -> 10, 10 -> 30, 30 -> 40 (pending)
+
+        restored = self.fm.undo()
+        self.assertEqual(restored['states']['normal']['offset_x'], 30)
+        self.assertIs(restored, editor_face)
+        restored = self.fm.undo()
+        self.assertEqual(restored['states']['normal']['offset_x'], 10)
+
+    def test_edit_on_replaced_dict_is_recorded(self):
+        # A caller may still hold a dict that self.faces no longer contains
+        import copy
+        stale = self.face
+        self.fm.faces = [copy.deepcopy(f) for f in self.fm.faces]
+        self.edit(stale, 50)
+        self.edit(stale, 60)
+        self.fm._finalize_pending_updates()
+        patches = [e['patch'] for e in self.fm.undo_stack]
+        self.assertEqual(patches, [{('states', 'normal', 'offset_x'): 0}, {('states', 'normal', 'offset_x'): 50}])
+
+    def test_status_change_is_not_an_edit(self):
+        self.fm.push_update_state(self.face)
+        self.face['_status'] = 'changed'
+        self.fm._finalize_pending_updates()
+        self.assertEqual(self.fm.undo_stack, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
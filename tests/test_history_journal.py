@@ -0,0 +1,88 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.logger import Logger
+from core.history import MISSING
+from core.history_journal import HistoryJournal
+
+
+def update(path, value):
+    return {'type': 'update', 'path': path, 'patch': {('states', 'normal', 'offset_x'): value}}
+
+
+class HistoryJournalTest(unittest.TestCase):
+    def setUp(self):
+        Logger.console = False
+        self.tmp = tempfile.mkdtemp(prefix="face_journal_")
+        self.path = os.path.join(self.tmp, "history", "journal.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def reopen(self):
+        journal = HistoryJournal(self.path)
+        return journal.load()
+
+    def patches(self, stack):
+        return [e['patch'] for e in stack]
+
+    def test_replay(self):
+        journal = HistoryJournal(self.path)
+        journal.record("push", "undo", update("a", 1))
+        journal.record("push", "undo", update("a", 2))
+        journal.record("insert", "undo", update("b", MISSING), index=0)
+        journal.record("pop", "undo")
+        journal.record("push", "redo", update("a", 3))
+        journal.record("remove", "undo", index=0)
+        journal.close()
+
+        undo, redo = self.reopen()
+        self.assertEqual(self.patches(undo), [{('states', 'normal', 'offset_x'): 1}])
+        self.assertEqual(self.patches(redo), [{('states', 'normal', 'offset_x'): 3}])
+        self.assertEqual(undo[0]['time'], 0) # Never coalesces with the new session
+
+    def test_missing_marker_survives(self):
+        journal = HistoryJournal(self.path)
+        journal.record("push", "undo", update("b", MISSING))
+        journal.close()
+        undo, _ = self.reopen()
+        self.assertIs(undo[0]['patch'][('states', 'normal', 'offset_x')], MISSING)
+
+    def test_compaction(self):
+        journal = HistoryJournal(self.path, compact_threshold=3)
+        undo = [update("a", i) for i in range(3)]
+        for entry in undo:
+            journal.record("push", "undo", entry)
+        journal.record("clear", "redo")
+        self.assertTrue(journal.needs_compaction())
+
+        journal.compact(undo[1:], [])
+        self.assertFalse(journal.needs_compaction())
+        journal.record("push", "redo", update("a", 9)) # Appends after the snapshot
+        journal.close()
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.assertEqual(len(f.read().splitlines()), 2)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+        undo, redo = self.reopen()
+        self.assertEqual([p[('states', 'normal', 'offset_x')] for p in self.patches(undo)], [1, 2])
+        self.assertEqual(self.patches(redo), [{('states', 'normal', 'offset_x'): 9}])
+
+    def test_torn_last_line(self):
+        journal = HistoryJournal(self.path)
+        journal.record("push", "undo", update("a", 1))
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"op": "push", "stack": "undo", "ent')
+        undo, redo = self.reopen()
+        self.assertEqual(len(undo), 1)
+        self.assertEqual(redo, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
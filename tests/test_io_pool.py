@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.logger import Logger
+from core.io_pool import IOPool
+
+
+class IOPoolTest(unittest.TestCase):
+    def setUp(self):
+        Logger.console = False
+        self.tmp = tempfile.mkdtemp(prefix="face_io_")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_results_keep_input_order_with_failures(self):
+        def work(i):
+            time.sleep((20 - i) * 0.001) # Later items finish first
+            if i % 5 == 0:
+                raise ValueError(i)
+            return i * 2
+        results = IOPool.map(work, range(20), default="failed")
+        self.assertEqual(results, ["failed" if i % 5 == 0 else i * 2 for i in range(20)])
+
+    def test_single_item_failure(self):
+        self.assertEqual(IOPool.map(lambda _: 1 / 0, [1], default=-1), [-1])
+        self.assertEqual(IOPool.map(str, []), [])
+
+    def test_stat_many(self):
+        present = os.path.join(self.tmp, "a")
+        open(present, "wb").close()
+        stats = IOPool.stat_many([present, os.path.join(self.tmp, "missing"), self.tmp])
+        self.assertIsNotNone(stats[0])
+        self.assertIsNone(stats[1])
+        self.assertIsNotNone(stats[2])
+
+    def test_copy_tree(self):
+        src = os.path.join(self.tmp, "src")
+        os.makedirs(os.path.join(src, "sources", "_cache"))
+        for rel in ("project_data.json", os.path.join("sources", "a.png"), os.path.join("sources", "_cache", "b.png")):
+            with open(os.path.join(src, rel), "w") as f:
+                f.write(rel)
+        dst = os.path.join(self.tmp, "dst")
+        self.assertTrue(IOPool.copy_tree(src, dst))
+        with open(os.path.join(dst, "sources", "_cache", "b.png")) as f:
+            self.assertEqual(f.read(), os.path.join("sources", "_cache", "b.png"))
+
+        results = IOPool.copy_files([(os.path.join(src, "project_data.json"), os.path.join(dst, "copy.json")),
+                                     (os.path.join(src, "missing"), os.path.join(dst, "x"))])
+        self.assertEqual(results, [True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from PIL import Image
+from core.image_processor import ImageProcessor
+
+
+class LayerCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="face_layers_")
+        self.src = os.path.join(self.tmp, "source.png")
+        Image.new("RGBA", (100, 100), (255, 0, 0, 255)).save(self.src)
+        self.ip = ImageProcessor()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def render(self, scale, **kwargs):
+        return self.ip.process_image(self.src, {"scale": scale}, (200, 200), **kwargs)
+
+    def test_byte_bound(self):
+        layer_bytes = 150 * 150 * 4 # scale 1.5
+        self.ip._layer_cache_max_bytes = layer_bytes * 3
+        for i in range(6):
+            self.render(1.5 + i * 0.001)
+        self.assertEqual(len(self.ip._layer_cache), 3)
+        self.assertLessEqual(self.ip._layer_bytes(), layer_bytes * 3)
+
+        # A layer larger than the budget is still kept on its own
+        self.ip._layer_cache_max_bytes = 1
+        self.render(2.0)
+        self.assertEqual(len(self.ip._layer_cache), 1)
+        self.assertEqual(self.ip._layer_bytes(), 200 * 200 * 4)
+
+    def test_drag_frames_keep_settled_layers(self):
+        for scale in (0.5, 0.6, 0.7):
+            self.render(scale)
+        settled = list(self.ip._layer_cache)
+        for i in range(20):
+            self.ip.release_canvas(self.render(1.0 + i * 0.01, cache_result=False))
+        self.assertEqual(list(self.ip._layer_cache), settled)
+
+    def test_prefetch_does_not_evict(self):
+        self.ip._layer_cache_capacity = 2
+        self.render(0.5)
+        self.render(0.6)
+        self.render(0.7, prefetch=True)
+        self.assertEqual(len(self.ip._layer_cache), 2)
+        self.assertFalse(self.ip.has_cached_layer(self.src, {"scale": 0.7}))
+
+    def test_source_replaced_in_place(self):
+        self.assertEqual(self.render(1.0).getpixel((100, 100)), (255, 0, 0, 255))
+        st = os.stat(self.src)
+        Image.new("RGBA", (100, 100), (0, 0, 255, 255)).save(self.src)
+        os.utime(self.src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.render(1.0).getpixel((100, 100)), (0, 0, 255, 255))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.logger import Logger
+
+
+class LoggerSinkTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="face_log_")
+        self.path = os.path.join(self.tmp, "app.log")
+        self.saved = (Logger.console, Logger.level, sys.excepthook, threading.excepthook)
+        Logger.console = False
+        Logger.configure(log_file=self.path, level="DEBUG")
+
+    def tearDown(self):
+        Logger.flush()
+        handler, Logger._file_handler = Logger._file_handler, None
+        handler.close()
+        Logger.console, Logger.level, sys.excepthook, threading.excepthook = self.saved
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def read(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_lines_reach_the_file_in_order(self):
+        for i in range(200):
+            Logger.info(f"line {i}")
+        Logger.flush()
+        lines = [line for line in self.read().splitlines() if "line " in line]
+        self.assertEqual([line.rsplit(" ", 1)[1] for line in lines], [str(i) for i in range(200)])
+
+    def test_error_is_written_before_returning(self):
+        Logger.error("boom")
+        self.assertIn("boom", self.read())
+
+    def test_thread_excepthook_chains_to_the_previous_one(self):
+        seen = []
+        threading.excepthook = lambda args: seen.append(args.exc_type)
+        sys.excepthook = sys.__excepthook__ # Let configure() install its hooks again
+        Logger.configure()
+        thread = threading.Thread(target=lambda: 1 / 0)
+        thread.start()
+        thread.join()
+        self.assertEqual(seen, [ZeroDivisionError])
+        self.assertIn("ZeroDivisionError", self.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
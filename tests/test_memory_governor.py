@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.logger import Logger
+from core.memory_governor import MemoryGovernor
+
+
+class FakeCache:
+    """Byte counter with LRU-style eviction in fixed-size entries."""
+
+    def __init__(self, entries, entry_bytes=100):
+        self.entries = entries
+        self.entry_bytes = entry_bytes
+
+    def usage(self):
+        return self.entries * self.entry_bytes
+
+    def evict(self, nbytes):
+        freed = 0
+        while self.entries and freed < nbytes:
+            self.entries -= 1
+            freed += self.entry_bytes
+        return freed
+
+
+class MemoryGovernorTest(unittest.TestCase):
+    def setUp(self):
+        Logger.console = False
+        # The governor is process-wide; isolate this test from caches other tests created
+        self.saved = (MemoryGovernor._caches, MemoryGovernor.budget_bytes, MemoryGovernor.evicted_bytes)
+        MemoryGovernor._caches = {}
+        MemoryGovernor.budget_bytes = 1000
+
+    def tearDown(self):
+        MemoryGovernor._caches, MemoryGovernor.budget_bytes, MemoryGovernor.evicted_bytes = self.saved
+
+    def register(self, name, priority, cache):
+        MemoryGovernor.register(name, priority, cache.usage, cache.evict)
+        return cache
+
+    def test_under_budget_evicts_nothing(self):
+        cache = self.register("renders", MemoryGovernor.PRIORITY_RENDER, FakeCache(10))
+        MemoryGovernor.notify()
+        self.assertEqual(cache.entries, 10)
+
+    def test_lowest_priority_goes_first(self):
+        renders = self.register("renders", MemoryGovernor.PRIORITY_RENDER, FakeCache(6))
+        pool = self.register("pool", MemoryGovernor.PRIORITY_POOL, FakeCache(3))
+        prefetch = self.register("prefetch", MemoryGovernor.PRIORITY_PREFETCH, FakeCache(4))
+        MemoryGovernor.notify() # 1300 bytes, 300 over
+        self.assertEqual((pool.entries, prefetch.entries, renders.entries), (0, 4, 6))
+
+        renders.entries = 12 # 1600 bytes, 600 over
+        MemoryGovernor.notify()
+        self.assertEqual((pool.entries, prefetch.entries, renders.entries), (0, 0, 10))
+        self.assertEqual(MemoryGovernor.total_bytes(), 1000)
+        self.assertEqual(MemoryGovernor.evicted_bytes, self.saved[2] + 900)
+
+    def test_failing_cache_is_skipped(self):
+        def broken(nbytes):
+            raise RuntimeError("boom")
+        MemoryGovernor.register("broken", MemoryGovernor.PRIORITY_POOL, lambda: 800, broken)
+        renders = self.register("renders", MemoryGovernor.PRIORITY_RENDER, FakeCache(5))
+        MemoryGovernor.notify()
+        self.assertEqual(renders.entries, 2)
+
+    def test_register_replaces_by_name(self):
+        self.register("tiles", MemoryGovernor.PRIORITY_THUMBNAIL, FakeCache(1))
+        self.register("tiles", MemoryGovernor.PRIORITY_THUMBNAIL, FakeCache(2))
+        self.assertEqual(MemoryGovernor.usage(), [("tiles", MemoryGovernor.PRIORITY_THUMBNAIL, 200)])
+        MemoryGovernor.unregister("tiles")
+        self.assertEqual(MemoryGovernor.usage(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.logger import Logger
+from core.persistence import PersistenceService
+from core.face_manager import FaceManager
+
+
+def read_json(face_dir):
+    with open(os.path.join(face_dir, PersistenceService.FILENAME), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class PersistenceServiceTest(unittest.TestCase):
+    def setUp(self):
+        Logger.console = False
+        self.base = tempfile.mkdtemp(prefix="face_persist_")
+        self.service = PersistenceService(debounce=60) # Never written by the timer in these tests
+
+    def tearDown(self):
+        self.service.stop()
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def test_debounced_save_then_flush(self):
+        self.service.save(self.base, {"display_name": "a", "_path": self.base})
+        self.service.save(self.base, {"display_name": "b", "_path": self.base})
+        self.assertFalse(os.path.exists(os.path.join(self.base, PersistenceService.FILENAME)))
+        self.assertEqual(self.service.pending_data(self.base), {"display_name": "b"})
+
+        self.assertTrue(self.service.flush(self.base))
+        self.assertEqual(read_json(self.base), {"display_name": "b"}) # Internal keys stripped
+        self.assertIsNone(self.service.pending_data(self.base))
+        self.assertTrue(self.service.is_own_write(self.base))
+
+    def test_flush_reports_failed_write(self):
+        missing = os.path.join(self.base, "gone")
+        self.service.save(missing, {"display_name": "x"})
+        self.assertFalse(self.service.flush(missing))
+        self.assertIsNotNone(self.service.last_error(missing))
+
+        os.makedirs(missing)
+        self.service.save(missing, {"display_name": "x"})
+        self.assertTrue(self.service.flush(missing))
+        self.assertIsNone(self.service.last_error(missing))
+
+    def test_concurrent_flushes_keep_the_last_save(self):
+        threads = []
+        for i in range(20):
+            self.service.save(self.base, {"n": i})
+            t = threading.Thread(target=self.service.flush)
+            t.start()
+            threads.append(t)
+        for t in threads:
+            t.join()
+        self.service.flush()
+        self.assertEqual(read_json(self.base), {"n": 19})
+        self.assertFalse(os.path.exists(os.path.join(self.base, PersistenceService.FILENAME + ".tmp")))
+
+
+class SaveProjectDataTest(unittest.TestCase):
+    def setUp(self):
+        Logger.console = False
+        self.base = tempfile.mkdtemp(prefix="face_persist_")
+        self.fm = FaceManager(self.base)
+
+    def tearDown(self):
+        self.fm.shutdown()
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def test_initialize_face_waits_for_the_write(self):
+        face = self.fm.initialize_face(self.fm.faces[0])
+        self.assertIsNotNone(face)
+        self.assertEqual(read_json(face['_path'])['display_name'], face['display_name'])
+
+        # The slot folder disappears before the write
+        face['display_name'] = "Renamed"
+        self.fm.persistence.save(face['_path'], face)
+        shutil.rmtree(face['_path'])
+        self.assertFalse(self.fm.persistence.flush(face['_path']))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.logger import Logger
+from core.face_manager import FaceManager
+
+
+class SourceIndexTest(unittest.TestCase):
+    def setUp(self):
+        Logger.console = False
+        self.base = tempfile.mkdtemp(prefix="face_sources_")
+        self.fm = FaceManager(self.base)
+        self.face = self.fm.initialize_face(self.fm.faces[0])
+        self.sources = os.path.join(self.face['_path'], "sources")
+
+    def tearDown(self):
+        self.fm.shutdown()
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def add_source(self, name, mtime_offset=0):
+        path = os.path.join(self.sources, name)
+        with open(path, "wb") as f:
+            f.write(b"x")
+        # Make sure the folder mtime moves even on filesystems with coarse timestamps
+        st = os.stat(self.sources)
+        os.utime(self.sources, ns=(st.st_atime_ns, st.st_mtime_ns + mtime_offset))
+        return path
+
+    def test_source_added_after_a_miss_is_found(self):
+        self.assertIsNone(self.fm.get_source_path(self.face, "later"))
+        path = self.add_source("later.png", mtime_offset=1_000_000)
+        self.assertEqual(self.fm.get_source_path(self.face, "later"), path)
+
+    def test_missing_file_is_not_returned(self):
+        path = self.add_source("gone.png")
+        self.assertEqual(self.fm.get_source_path(self.face, "gone"), path)
+        os.remove(path)
+        self.assertIsNone(self.fm.get_source_path(self.face, "gone"))
+
+    def test_replaced_extension_is_found(self):
+        old = self.add_source("pic.png")
+        self.assertEqual(self.fm.get_source_path(self.face, "pic"), old)
+        os.remove(old)
+        new = self.add_source("pic.jpg", mtime_offset=1_000_000)
+        self.assertEqual(self.fm.get_source_path(self.face, "pic"), new)
+
+    def test_unchanged_folder_is_not_listed_again(self):
+        self.assertIsNone(self.fm.get_source_path(self.face, "nothing"))
+        index = self.fm._source_index[self.face['_path']][1]
+        self.assertIsNone(self.fm.get_source_path(self.face, "nothing"))
+        self.assertIs(self.fm._source_index[self.face['_path']][1], index)
+
+
+if __name__ == "__main__":
+    unittest.main()